@@ -7,6 +7,14 @@ IT IS ALSO OKAY TO AVOID THEM IN THIS MANNER BECAUSE THIS IS A
 HIGHLY MODULAR PROGRAM.
 """
 
+# External imports
+from PyQt5.QtCore import QThread
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtWidgets import QShortcut
+
+from src.main.config import DATA_DIR_POLL_INTERVAL_MS
+
 
 class Controller(object):
     """
@@ -16,6 +24,10 @@ class Controller(object):
     __instance = None
 
     delegator = None
+    refresh_shortcut = None
+    data_dir_poll_timer = None
+    data_load_thread = None
+    data_load_worker = None
 
     def __init__(self, delegator):
         if Controller.__instance is not None:
@@ -27,8 +39,6 @@ class Controller(object):
         self.connect_buttons_to_functions()
         self.setup_static_selection_menus()
         self.load_data()
-        self.load_stimuli_menu()
-        self.load_participants()
 
     @staticmethod
     def get_instance():
@@ -54,6 +64,9 @@ class Controller(object):
         ViewStimulusSelection.get_instance().menu.currentIndexChanged.connect(
             lambda: ViewParticipantSelection.get_instance().update_selection_checkboxes()
         )
+        ViewStimulusSelection.get_instance().menu.currentIndexChanged.connect(
+            lambda: ViewPlot.get_instance().update_time_window_range()
+        )
         ViewParticipantSelection.get_instance().select_all_button.clicked.connect(
             lambda: ViewParticipantSelection.get_instance().select_all()
         )
@@ -90,6 +103,36 @@ class Controller(object):
         ViewPlot.get_instance().run_monte_carlo_button.clicked.connect(
             lambda: ControllerPlot.get_instance().process_run_monte_carlo_button_clicked()
         )
+        ViewPlot.get_instance().time_window_checkbox.toggled.connect(
+            lambda: ControllerPlot.get_instance().process_time_window_checkbox_toggled()
+        )
+        ViewPlot.get_instance().time_window_relative_checkbox.toggled.connect(
+            lambda: ViewPlot.get_instance().update_time_window_range()
+        )
+        ViewPlot.get_instance().time_window_start_input.valueChanged.connect(
+            lambda: ControllerPlot.get_instance().process_time_window_start_input_entered()
+        )
+        ViewPlot.get_instance().time_window_end_input.valueChanged.connect(
+            lambda: ControllerPlot.get_instance().process_time_window_end_input_entered()
+        )
+        ViewPlot.get_instance().time_window_start_slider.valueChanged.connect(
+            lambda: ControllerPlot.get_instance().process_time_window_start_slider_moved()
+        )
+        ViewPlot.get_instance().time_window_end_slider.valueChanged.connect(
+            lambda: ControllerPlot.get_instance().process_time_window_end_slider_moved()
+        )
+        ViewPlot.get_instance().time_window_start_slider.sliderReleased.connect(
+            lambda: ControllerPlot.get_instance().process_time_window_slider_released()
+        )
+        ViewPlot.get_instance().time_window_end_slider.sliderReleased.connect(
+            lambda: ControllerPlot.get_instance().process_time_window_slider_released()
+        )
+        ViewMetrics.get_instance().metrics_button.clicked.connect(
+            lambda: ControllerPlot.get_instance().process_metrics_button_clicked()
+        )
+        ViewMetrics.get_instance().export_button.clicked.connect(
+            lambda: ControllerPlot.get_instance().process_export_metrics_button_clicked()
+        )
 
     @staticmethod
     def setup_static_selection_menus() -> None:
@@ -99,15 +142,95 @@ class Controller(object):
         ViewDataTypeSelection.get_instance().setup()
         ViewAnalysisTypeSelection.get_instance().setup()
 
+    def load_data(self) -> None:
+        """
+        Loads the data on a background thread so that the
+        window stays responsive, showing the progress of the
+        load; the selection menus are set up once it is loaded
+        """
+        ViewStimulusSelection.get_instance().disable()
+        ViewParticipantSelection.get_instance().disable()
+        ViewPlot.get_instance().plot_button.setEnabled(False)
+        ViewMetrics.get_instance().metrics_button.setEnabled(False)
+        ViewDataLoad.get_instance().start()
+
+        self.data_load_thread = QThread(self.delegator)
+        self.data_load_worker = DataLoadWorker()
+        self.data_load_worker.moveToThread(self.data_load_thread)
+        self.data_load_thread.started.connect(self.data_load_worker.run)
+        self.data_load_worker.progress.connect(ViewDataLoad.get_instance().update_progress)
+        self.data_load_worker.finished.connect(self.process_data_loaded)
+        self.data_load_worker.failed.connect(self.process_data_load_failed)
+        self.data_load_worker.finished.connect(self.data_load_thread.quit)
+        self.data_load_worker.failed.connect(self.data_load_thread.quit)
+        self.data_load_thread.start()
+
+    def process_data_loaded(self) -> None:
+        """
+        Sets up the selection menus with the loaded data
+        """
+        ViewDataLoad.get_instance().finish()
+        self.load_stimuli_menu()
+        self.load_participants()
+        ViewStimulusSelection.get_instance().enable()
+        ViewParticipantSelection.get_instance().enable()
+        ViewPlot.get_instance().plot_button.setEnabled(True)
+        ViewMetrics.get_instance().metrics_button.setEnabled(True)
+        self.setup_data_refresh()
+
     @staticmethod
-    def load_data() -> None:
-        ModelData.get_instance().load_df()
+    def process_data_load_failed(message: str) -> None:
+        """
+        Displays why the data could not be loaded
+
+        :param message: error message
+        :type message: str
+        """
+        ViewDataLoad.get_instance().finish()
+        ViewError.get_instance().get_message().setText(message)
 
     @staticmethod
     def load_stimuli_menu() -> None:
         ModelStimulusSelection.get_instance().update_stimuli_from_data_and_dir()
         ViewStimulusSelection.get_instance().setup()
 
+    def setup_data_refresh(self) -> None:
+        """
+        Refreshes the data on the refresh shortcut and, if
+        configured, whenever the data directory is polled
+        """
+        self.refresh_shortcut = QShortcut(QKeySequence.Refresh, self.delegator)
+        self.refresh_shortcut.activated.connect(
+            lambda: Controller.refresh_data()
+        )
+        if DATA_DIR_POLL_INTERVAL_MS > 0:
+            self.data_dir_poll_timer = QTimer(self.delegator)
+            self.data_dir_poll_timer.timeout.connect(
+                lambda: Controller.refresh_data()
+            )
+            self.data_dir_poll_timer.start(DATA_DIR_POLL_INTERVAL_MS)
+
+    @staticmethod
+    def refresh_data() -> None:
+        """
+        Imports data files that were added to or modified in the
+        data directory, drops those that were removed, and updates
+        the stimulus and participant menus in place; if a data
+        file cannot be imported (e.g., it is still being
+        exported), the error is displayed and the imported
+        data is left as it was, to be refreshed again
+        """
+        try:
+            if not ModelData.get_instance().refresh_df():
+                return
+        except Exception as exception:
+            ViewError.get_instance().get_message().setText("Data could not be refreshed: " + str(exception))
+            return
+        ModelStimulusRegistry.get_instance().build()
+        ViewStimulusSelection.get_instance().refresh()
+        ViewParticipantSelection.get_instance().refresh_selection_checkboxes()
+        ViewPlot.get_instance().clear_saved_plot_selections()
+
     @staticmethod
     def load_participants() -> None:
         ModelParticipantSelection.get_instance().import_stimuli_filtered_participant_selection()
@@ -116,11 +239,16 @@ class Controller(object):
 
 from src.controller.controller_participant_selection import ControllerParticipantSelection
 from src.controller.controller_plot import ControllerPlot
+from src.controller.utils.data_load_worker import DataLoadWorker
 from src.model.model_data import ModelData
 from src.model.model_participant_selection import ModelParticipantSelection
+from src.model.model_stimulus_registry import ModelStimulusRegistry
 from src.model.model_stimulus_selection import ModelStimulusSelection
 from src.view.view_analysis_type_selection import ViewAnalysisTypeSelection
+from src.view.view_data_load import ViewDataLoad
 from src.view.view_data_type_selection import ViewDataTypeSelection
+from src.view.view_error import ViewError
+from src.view.view_metrics import ViewMetrics
 from src.view.view_participant_selection import ViewParticipantSelection
 from src.view.view_plot import ViewPlot
 from src.view.view_stimulus_selection import ViewStimulusSelection
@@ -42,11 +42,13 @@ class ControllerPlot(object):
         Processes when the user clicks the plot button,
         updating the internal model of the plot based upon
         user selections and then displaying the updated
-        plot
+        plot (and the reachability plot of an OPTICS cluster plot)
         """
         ControllerParticipantSelection.get_instance().update_model_selected_participants_from_view()
         # ModelPlot.get_instance().update_fig() # already updated in ViewPlot.get_instance().plot()
         ViewPlot.get_instance().plot()
+        if ViewAnalysisTypeSelection.get_instance().get_selected() == "OPTICS Cluster":
+            ViewReachabilityPlot.get_instance().show()
 
     @staticmethod
     def process_eps_input_min_entered() -> None:
@@ -116,21 +118,100 @@ class ControllerPlot(object):
 
     @staticmethod
     def process_eps_slider_moved() -> None:
+        """
+        Processes when the user releases the eps slider,
+        re-clustering the current plot with the new eps
+        (from the neighbor graph or the OPTICS reachability
+        ordering of its points)
+        """
         ViewPlot.get_instance().eps_curr_input.setValue(
             ViewPlot.get_instance().eps_slider.value()
         )
+        if ViewPlot.get_instance().browser is not None:
+            ControllerPlot.process_plot_button_click()
 
     @staticmethod
     def process_min_samples_slider_moved() -> None:
+        """
+        Processes when the user releases the min_samples slider,
+        re-clustering the current plot with the new min_samples
+        (from the neighbor graph of its points)
+        """
         ViewPlot.get_instance().min_samples_curr_input.setValue(
             ViewPlot.get_instance().min_samples_slider.value()
         )
+        if ViewPlot.get_instance().browser is not None:
+            ControllerPlot.process_plot_button_click()
 
     @staticmethod
     def process_run_monte_carlo_button_clicked() -> None:
         ModelPlot.get_instance().run_monte_carlo_stimulation()
         ViewMonteCarloClusterPValues.get_instance().show()
 
+    @staticmethod
+    def process_time_window_checkbox_toggled() -> None:
+        ViewPlot.get_instance().enable_time_window(ViewPlot.get_instance().time_window_checkbox.isChecked())
+        ViewPlot.get_instance().update_time_window_range()
+
+    @staticmethod
+    def process_time_window_start_input_entered() -> None:
+        time_window_start_val = ViewPlot.get_instance().time_window_start_input.value()
+        if ViewPlot.get_instance().time_window_end_input.value() < time_window_start_val:
+            ViewPlot.get_instance().time_window_end_input.setValue(time_window_start_val)
+        ViewPlot.get_instance().time_window_start_slider.setValue(time_window_start_val)
+
+    @staticmethod
+    def process_time_window_end_input_entered() -> None:
+        time_window_end_val = ViewPlot.get_instance().time_window_end_input.value()
+        if ViewPlot.get_instance().time_window_start_input.value() > time_window_end_val:
+            ViewPlot.get_instance().time_window_start_input.setValue(time_window_end_val)
+        ViewPlot.get_instance().time_window_end_slider.setValue(time_window_end_val)
+
+    @staticmethod
+    def process_time_window_start_slider_moved() -> None:
+        ViewPlot.get_instance().time_window_start_input.setValue(
+            ViewPlot.get_instance().time_window_start_slider.value()
+        )
+
+    @staticmethod
+    def process_time_window_end_slider_moved() -> None:
+        ViewPlot.get_instance().time_window_end_input.setValue(
+            ViewPlot.get_instance().time_window_end_slider.value()
+        )
+
+    @staticmethod
+    def process_time_window_slider_released() -> None:
+        """
+        Processes when the user releases a time window slider,
+        re-slicing the current plot to the new time window
+        """
+        if ViewPlot.get_instance().browser is not None:
+            ControllerPlot.process_plot_button_click()
+
+    @staticmethod
+    def process_metrics_button_clicked() -> None:
+        """
+        Processes when the user clicks the metrics button,
+        showing the eye-movement metrics of each participant
+        on each stimulus and on each area of interest
+        """
+        ViewMetrics.get_instance().show()
+
+    @staticmethod
+    def process_export_metrics_button_clicked() -> None:
+        """
+        Processes when the user clicks the export button of
+        the metrics window, writing the metrics table shown
+        in the selected tab to the CSV file the user chooses
+        """
+        file_path = ViewMetrics.get_instance().get_export_file_path()
+        if file_path:
+            ModelMetrics.get_instance().export_csv(file_path, ViewMetrics.get_instance().is_aoi_table_selected())
+
 from src.controller.controller_participant_selection import ControllerParticipantSelection
+from src.model.model_metrics import ModelMetrics
 from src.model.model_plot import ModelPlot
+from src.view.view_analysis_type_selection import ViewAnalysisTypeSelection
+from src.view.view_metrics import ViewMetrics
 from src.view.view_plot import ViewPlot
+from src.view.view_reachability_plot import ViewReachabilityPlot
@@ -36,6 +36,9 @@ class Delegator(QMainWindow):
     scroll_area_widget_contents = None
     error_message = None
 
+    # ViewDataLoad components
+    data_load_progress_bar = None
+
     # ViewStimulusSelection components
     stimulus_hbox = None
     stimulus_label = None
@@ -77,6 +80,15 @@ class Delegator(QMainWindow):
     run_monte_carlo_button = None
     monte_carlo_progress_bar = None
     time_left_monte_carlo = None
+    time_window_checkbox = None
+    time_window_relative_checkbox = None
+    time_window_start_input = None
+    time_window_end_input = None
+    time_window_start_slider = None
+    time_window_end_slider = None
+
+    # ViewMetrics components
+    metrics_button = None
 
     def __init__(self):
         super(Delegator, self).__init__()
@@ -130,6 +142,10 @@ class Delegator(QMainWindow):
         ViewError(
             message=self.error_message
         )
+        # Encapsulating the data load progress UI section
+        ViewDataLoad(
+            progress_bar=self.data_load_progress_bar
+        )
         # Encapsulating the stimulus selected UI functionality
         ViewStimulusSelection(
             menu=self.stimulus_menu
@@ -168,15 +184,27 @@ class Delegator(QMainWindow):
             num_trials_monte_carlo_input=self.num_trials_monte_carlo_input,
             run_monte_carlo_button=self.run_monte_carlo_button,
             monte_carlo_progress_bar=self.monte_carlo_progress_bar,
-            time_left_monte_carlo=self.time_left_monte_carlo
+            time_left_monte_carlo=self.time_left_monte_carlo,
+            time_window_checkbox=self.time_window_checkbox,
+            time_window_relative_checkbox=self.time_window_relative_checkbox,
+            time_window_start_input=self.time_window_start_input,
+            time_window_end_input=self.time_window_end_input,
+            time_window_start_slider=self.time_window_start_slider,
+            time_window_end_slider=self.time_window_end_slider
+        )
+        # Encapsulating the window showing the eye-movement metrics
+        ViewMetrics(
+            metrics_button=self.metrics_button
         )
 
 
 from src.controller.controller import Controller
 from src.view.view_analysis_type_selection import ViewAnalysisTypeSelection
+from src.view.view_data_load import ViewDataLoad
 from src.view.view_data_type_selection import ViewDataTypeSelection
 from src.view.view_error import ViewError
 from src.view.view_main import ViewMain
+from src.view.view_metrics import ViewMetrics
 from src.view.view_participant_selection import ViewParticipantSelection
 from src.view.view_plot import ViewPlot
 from src.view.view_stimulus_selection import ViewStimulusSelection
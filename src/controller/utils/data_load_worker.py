@@ -0,0 +1,52 @@
+"""
+Contains the class DataLoadWorker
+
+MODULAR INTERNAL IMPORTS ARE AT THE BOTTOM OF THE FILE. THIS IS AN
+INTENTIONAL DESIGN CHOICE. IT HELPS AVOID CIRCULAR IMPORT ISSUES.
+IT IS ALSO OKAY TO AVOID THEM IN THIS MANNER BECAUSE THIS IS A
+HIGHLY MODULAR PROGRAM.
+"""
+import warnings
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class DataLoadWorker(QObject):
+    """
+    Loads the eye-tracking data on a background
+    thread, reporting its progress via signals
+    """
+    # number of data files loaded, number of data files to load
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal()
+    # error message
+    failed = pyqtSignal(str)
+
+    def run(self) -> None:
+        """
+        Loads the eye-tracking data and registers its stimuli,
+        emitting finished once it is loaded or failed if it
+        cannot be loaded; the compiled kernels of the cluster
+        analysis are then loaded (from the on-disk cache once
+        they have been compiled) so that the first cluster plot
+        does not wait for them, and if they cannot be, they are
+        loaded on first use instead
+        """
+        try:
+            ModelData.get_instance().load_df(
+                progress_callback=lambda num_loaded, num_total: self.progress.emit(num_loaded, num_total)
+            )
+            ModelStimulusRegistry.get_instance().build()
+        except Exception as exception:
+            self.failed.emit("Data could not be loaded: " + str(exception))
+            return
+        self.finished.emit()
+        try:
+            kernel_utils.load_kernels()
+        except Exception as exception:
+            warnings.warn("Kernels could not be loaded in advance: " + str(exception))
+
+
+from src.model.model_data import ModelData
+from src.model.model_stimulus_registry import ModelStimulusRegistry
+from src.model.utils import kernel_utils
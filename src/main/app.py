@@ -3,15 +3,18 @@ Launches the eye-tracking visualizer application
 """
 
 # External imports
+from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QApplication
 import sys
 
 # Internal imports
 from src.controller.delegator import Delegator
-from src.model.model_data import ModelData
 
 if __name__ == '__main__':
-    ModelData.get_instance().load_df()
+    # the data is loaded once, on a background thread, by the Controller
+    # QtWebEngine is loaded on the first plot, after the QApplication
+    # exists, which it only allows if OpenGL contexts are shared
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
     delegator = Delegator()
     sys.exit(app.exec_())
\ No newline at end of file
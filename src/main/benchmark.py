@@ -0,0 +1,866 @@
+"""
+Benchmarks the stages of the application that scale with
+the size of the eye-tracking data and prints their timings
+"""
+import multiprocessing
+import os
+import pickle
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import DBSCAN
+from sklearn.metrics import adjusted_rand_score
+
+from src.model.model_data import ModelData
+from src.model.model_participant_selection import ModelParticipantSelection
+from src.model.utils import analysis_cache_utils
+from src.model.utils import aoi_utils
+from src.model.utils import cache_utils
+from src.model.utils import cluster_utils
+from src.model.utils import fixation_detection_utils
+from src.model.utils import fixation_utils
+from src.model.utils import ingest_utils
+from src.model.utils import kernel_utils
+from src.model.utils import metrics_utils
+from src.model.utils import model_utils
+from src.main.config import FIXATION_DURATION_COL_TITLE
+from src.main.config import PARTICIPANT_FILENAME_COL_TITLE
+from src.main.config import STIMULUS_COL_TITLE
+from src.main.config import TIMESTAMP_COL_TITLE
+from src.main.config import VALIDITY_COL_TITLE
+from src.main.config import X_FIXATION_COL_TITLE
+from src.main.config import X_GAZE_COL_TITLE
+from src.main.config import Y_FIXATION_COL_TITLE
+from src.main.config import Y_GAZE_COL_TITLE
+from src.model.utils import partition_store_utils
+from src.model.utils import shared_memory_utils
+
+
+def time_call(func, *args, **kwargs) -> float:
+    """
+    Returns the number of seconds the specified
+    function takes to run with the specified arguments
+
+    :param func: function to time
+    :type func: callable
+    :return: number of seconds elapsed
+    :rtype: float
+    """
+    start_time = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start_time
+
+
+def peak_memory_call(func, *args, **kwargs) -> float:
+    """
+    Returns the peak number of MB that the specified function
+    allocates in this process while running with the specified
+    arguments
+
+    :param func: function to measure
+    :type func: callable
+    :return: peak number of MB allocated
+    :rtype: float
+    """
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1] / (1 << 20)
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_ingest() -> None:
+    """
+    Prints the timings of parsing every data file serially,
+    parsing them in parallel and reloading them from the cache
+    """
+    participant_filenames = ModelParticipantSelection.get_instance().import_all_participants()
+    print("Ingest of {} data files".format(len(participant_filenames)))
+
+    serial_time = time_call(
+        lambda: ingest_utils.concat_participant_dfs(
+            ModelData.import_participant_dfs(participant_filenames, use_parallel_ingest=False)[0].values()
+        )
+    )
+    print("  serial parse:   {:8.3f} s".format(serial_time))
+
+    parallel_time = time_call(
+        lambda: ingest_utils.concat_participant_dfs(
+            ModelData.import_participant_dfs(participant_filenames, use_parallel_ingest=True)[0].values()
+        )
+    )
+    print("  parallel parse: {:8.3f} s ({:.2f}x)".format(parallel_time, serial_time / parallel_time))
+
+    ModelData.get_instance().load_df()  # populates the cache
+    manifest = cache_utils.load_manifest()
+    cached_time = time_call(
+        lambda: ingest_utils.concat_participant_dfs(
+            ModelData.import_participant_dfs(participant_filenames, manifest=manifest)[0].values()
+        )
+    )
+    print("  cached reload:  {:8.3f} s ({:.2f}x)".format(cached_time, serial_time / cached_time))
+
+
+def benchmark_ingest_memory() -> None:
+    """
+    Prints the peak memory of parsing every data file into
+    memory and of streaming them into the partition store
+    """
+    participant_filenames = ModelParticipantSelection.get_instance().import_all_participants()
+    print("Ingest peak memory of {} data files".format(len(participant_filenames)))
+
+    in_memory_peak = peak_memory_call(
+        lambda: ingest_utils.concat_participant_dfs(
+            ModelData.import_participant_dfs(participant_filenames, use_parallel_ingest=False)[0].values()
+        )
+    )
+    print("  in memory:  {:8.1f} MB".format(in_memory_peak))
+
+    out_of_core_peak = peak_memory_call(
+        lambda: partition_store_utils.spill_participant_files(participant_filenames, use_parallel_ingest=False)
+    )
+    print("  out of core: {:7.1f} MB".format(out_of_core_peak))
+
+
+def select_and_filter_gaze(model_data: ModelData) -> None:
+    """
+    Selects the gaze points of every stimulus by every
+    participant by selecting every observation and then
+    removing the observations missing a value, column by column
+
+    :param model_data: model of the data
+    :type model_data: ModelData
+    """
+    for stimulus in model_data.get_stimuli():
+        model_utils.remove_incomplete_observations(
+            model_data.select(stimulus, model_data.get_stimulus_participants(stimulus)),
+            [TIMESTAMP_COL_TITLE, X_GAZE_COL_TITLE, Y_GAZE_COL_TITLE, PARTICIPANT_FILENAME_COL_TITLE]
+        )
+
+
+def select_valid_gaze(model_data: ModelData) -> None:
+    """
+    Selects the gaze points of every stimulus by every
+    participant in a single gather using the validity flags
+
+    :param model_data: model of the data
+    :type model_data: ModelData
+    """
+    for stimulus in model_data.get_stimuli():
+        model_data.select(stimulus, model_data.get_stimulus_participants(stimulus),
+                          model_utils.GAZE_VALIDITY_FLAG)
+
+
+def benchmark_selection() -> None:
+    """
+    Prints the timings and peak memory of selecting the gaze
+    points of every stimulus by every participant by filtering
+    the selected observations column by column versus by
+    gathering them with the validity flags
+    """
+    model_data = ModelData.get_instance()
+    if model_data.df is None:
+        model_data.load_df()
+    print("Gaze selection of {} stimuli".format(len(model_data.get_stimuli())))
+    filter_time = time_call(select_and_filter_gaze, model_data)
+    filter_peak = peak_memory_call(select_and_filter_gaze, model_data)
+    print("  filtered column by column: {:8.3f} s, {:6.1f} MB".format(filter_time, filter_peak))
+    flags_time = time_call(select_valid_gaze, model_data)
+    flags_peak = peak_memory_call(select_valid_gaze, model_data)
+    print("  gathered with flags:       {:8.3f} s, {:6.1f} MB ({:.2f}x)".format(
+        flags_time, flags_peak, filter_time / flags_time))
+
+
+def select_time_window_with_mask(model_data: ModelData, time_window: tuple) -> list:
+    """
+    Selects the gaze points of every stimulus by every participant
+    within the specified time window by masking the timestamps
+    of every observation, relative to the first observation
+    of each participant on the stimulus
+
+    :param model_data: model of the data
+    :type model_data: ModelData
+    :param time_window: start and end (in milliseconds) relative to the onset
+    :type time_window: tuple
+    :return: number of gaze points selected of each stimulus
+    :rtype: list
+    """
+    timestamps = model_data.df[TIMESTAMP_COL_TITLE].to_numpy(dtype=np.float64)
+    stimulus_codes, stimuli = pd.factorize(model_data.df[STIMULUS_COL_TITLE])
+    participant_codes, participant_filenames = pd.factorize(model_data.df[PARTICIPANT_FILENAME_COL_TITLE])
+    stimuli, participant_filenames = list(stimuli), list(participant_filenames)
+    is_valid_gaze = (model_data.df[VALIDITY_COL_TITLE].to_numpy() & model_utils.GAZE_VALIDITY_FLAG) != 0
+    num_selected = []
+    for stimulus in model_data.get_stimuli():
+        is_selected = np.zeros(timestamps.size, dtype=bool)
+        is_stimulus = stimulus_codes == stimuli.index(stimulus)
+        for participant_filename in model_data.get_stimulus_participants(stimulus):
+            is_partition = is_stimulus & (participant_codes == participant_filenames.index(participant_filename))
+            onset = np.nanmin(timestamps[is_partition])
+            is_selected |= is_partition & (timestamps >= onset + time_window[0]) & \
+                (timestamps <= onset + time_window[1])
+        num_selected.append(len(model_data.df.index[is_selected & is_valid_gaze]))
+    return num_selected
+
+
+def select_time_window(model_data: ModelData, time_window: tuple) -> list:
+    """
+    Selects the gaze points of every stimulus by every participant
+    within the specified time window, whose bounds are found by
+    binary search of the sorted timestamps of each partition
+
+    :param model_data: model of the data
+    :type model_data: ModelData
+    :param time_window: start and end (in milliseconds) relative to the onset
+    :type time_window: tuple
+    :return: number of gaze points selected of each stimulus
+    :rtype: list
+    """
+    return [
+        len(model_data.select(stimulus, model_data.get_stimulus_participants(stimulus),
+                              model_utils.GAZE_VALIDITY_FLAG, time_window + (True,)).index)
+        for stimulus in model_data.get_stimuli()
+    ]
+
+
+def benchmark_time_window_selection(time_window: tuple = (0, 2000)) -> None:
+    """
+    Prints the timings of selecting the gaze points of every
+    stimulus by every participant within a time window relative
+    to each participant's first observation of the stimulus by
+    masking the timestamps versus by binary search, and whether
+    both select the same number of gaze points
+
+    :param time_window: start and end (in milliseconds) relative to the onset
+    :type time_window: tuple
+    """
+    model_data = ModelData.get_instance()
+    if model_data.df is None:
+        model_data.load_df()
+    print("Time window selection ({} ms to {} ms from onset) of {} stimuli".format(
+        time_window[0], time_window[1], len(model_data.get_stimuli())))
+    mask_time = time_call(select_time_window_with_mask, model_data, time_window)
+    print("  masked timestamps: {:8.3f} s".format(mask_time))
+    search_time = time_call(select_time_window, model_data, time_window)
+    print("  binary search:     {:8.3f} s ({:.1f}x)".format(search_time, mask_time / search_time))
+    print("  same selection: {}".format(
+        select_time_window_with_mask(model_data, time_window) == select_time_window(model_data, time_window)))
+
+
+def benchmark_fixation_extraction() -> None:
+    """
+    Prints the timing of grouping the observations of every
+    stimulus by every participant into fixations, and that of
+    selecting the fixations precomputed at load time instead
+    """
+    model_data = ModelData.get_instance()
+    if model_data.df is None:
+        model_data.load_df()
+    stimulus_dfs = [
+        model_data.select(stimulus, model_data.get_stimulus_participants(stimulus),
+                          model_utils.FIXATION_VALIDITY_FLAG)
+        for stimulus in model_data.get_stimuli()
+    ]
+    num_rows = sum(len(stimulus_df.index) for stimulus_df in stimulus_dfs)
+    num_fixations = 0
+    start_time = time.perf_counter()
+    for stimulus_df in stimulus_dfs:
+        fixation_starts = fixation_utils.get_fixation_starts(
+            stimulus_df[X_FIXATION_COL_TITLE].to_numpy(),
+            stimulus_df[Y_FIXATION_COL_TITLE].to_numpy(),
+            pd.factorize(stimulus_df[PARTICIPANT_FILENAME_COL_TITLE])[0]
+        )
+        fixation_utils.get_fixation_durations(stimulus_df[TIMESTAMP_COL_TITLE].to_numpy(), fixation_starts)
+        num_fixations += fixation_starts.size
+    extraction_time = time.perf_counter() - start_time
+    print("Fixation extraction of {} observations of {} stimuli".format(num_rows, len(stimulus_dfs)))
+    print("  {} fixations: {:8.3f} s".format(num_fixations, extraction_time))
+
+    start_time = time.perf_counter()
+    num_fixations = sum(
+        len(model_data.select_fixations(stimulus, model_data.get_stimulus_participants(stimulus)).index)
+        for stimulus in model_data.get_stimuli()
+    )
+    selection_time = time.perf_counter() - start_time
+    print("  {} precomputed fixations selected: {:8.3f} s".format(num_fixations, selection_time))
+
+
+def benchmark_fixation_detection() -> None:
+    """
+    Prints the timings of detecting the fixations of every
+    participant from their gaze points with each algorithm,
+    along with the number of fixations detected
+    """
+    model_data = ModelData.get_instance()
+    if model_data.df is None:
+        model_data.load_df()
+    num_gaze_points = int(model_data.df[X_GAZE_COL_TITLE].notnull().sum())
+    print("Fixation detection from {} gaze points ({} fixations in the data files)".format(
+        num_gaze_points, len(model_data.fixation_df.index)))
+    # the I-DT kernel is compiled before timing
+    fixation_detection_utils.get_idt_kernel()
+    for algorithm in [fixation_detection_utils.IVT_ALGORITHM, fixation_detection_utils.IDT_ALGORITHM]:
+        detection_time = time_call(model_data.detect_fixations, algorithm)
+        print("  {}: {} fixations: {:8.3f} s ({:.1f}M gaze points/s)".format(
+            algorithm, len(model_data.fixation_df.index), detection_time,
+            num_gaze_points / detection_time / 1e6))
+    model_data.detect_fixations(None)
+
+
+def build_metrics_df_per_participant(fixation_df: pd.DataFrame, gaze_df: pd.DataFrame,
+                                     participant_row_ranges: dict) -> pd.DataFrame:
+    """
+    Builds the metrics table one (participant, stimulus) at
+    a time, as a reference for the vectorized computation
+
+    :param fixation_df: fixation table
+    :type fixation_df: pd.DataFrame
+    :param gaze_df: data the fixations are of
+    :type gaze_df: pd.DataFrame
+    :param participant_row_ranges: range of positions of the observations of each participant within the data
+    :type participant_row_ranges: dict
+    :return: metrics table
+    :rtype: pd.DataFrame
+    """
+    group_metrics_dfs = [
+        metrics_utils.build_metrics_df(group_fixation_df, gaze_df.iloc[slice(*participant_row_ranges[group_key[0]])])
+        for group_key, group_fixation_df in fixation_df.groupby(
+            [PARTICIPANT_FILENAME_COL_TITLE, STIMULUS_COL_TITLE], observed=True, sort=False
+        )
+    ]
+    return pd.concat(group_metrics_dfs, ignore_index=True)
+
+
+def benchmark_metrics() -> None:
+    """
+    Prints the timings of deriving the saccades and computing the
+    eye-movement metrics of every participant on every stimulus at
+    once and one (participant, stimulus) at a time, and whether
+    both give the same metrics
+    """
+    model_data = ModelData.get_instance()
+    if model_data.df is None:
+        model_data.load_df()
+    fixation_df = model_data.fixation_df
+    metrics_df = metrics_utils.build_metrics_df(fixation_df, model_data.df)
+    print("Eye-movement metrics of {} (participant, stimulus) from {} fixations ({} saccades)".format(
+        len(metrics_df.index), len(fixation_df.index),
+        len(metrics_utils.build_saccade_df(fixation_df, model_data.df).index)))
+    print("  saccades (vectorized):         {:8.3f} s".format(
+        time_call(metrics_utils.build_saccade_df, fixation_df, model_data.df)))
+    print("  metrics (vectorized):          {:8.3f} s".format(
+        time_call(metrics_utils.build_metrics_df, fixation_df, model_data.df)))
+    print("  metrics (per participant):     {:8.3f} s".format(
+        time_call(build_metrics_df_per_participant, fixation_df, model_data.df, model_data.participant_row_ranges)))
+    print("  same metrics: {}".format(
+        build_metrics_df_per_participant(fixation_df, model_data.df, model_data.participant_row_ranges).equals(
+            metrics_df)))
+
+
+def get_benchmark_aois() -> list:
+    """
+    Returns AOIs laid out over a 1024 x 768 stimulus: a row of
+    rectangles and a row of polygons, as defined in an AOI file
+
+    :return: AOIs (see aoi_utils.build_aois)
+    :rtype: list
+    """
+    aoi_definitions = [{'name': 'Rect {}'.format(num), 'rect': [num * 256 + 16, 64, 224, 256]} for num in range(4)]
+    aoi_definitions += [
+        {'name': 'Polygon {}'.format(num),
+         'polygon': [[num * 256 + 128, 384], [num * 256 + 240, 512], [num * 256 + 128, 704], [num * 256 + 16, 512]]}
+        for num in range(4)
+    ]
+    return aoi_utils.build_aois(aoi_definitions)
+
+
+def get_aoi_labels_per_point(x_coords: np.ndarray, y_coords: np.ndarray, aois: list) -> np.ndarray:
+    """
+    Finds the AOI of each point one point at a time,
+    as a reference for the vectorized hit testing
+
+    :param x_coords: X coordinates of the points
+    :type x_coords: np.ndarray
+    :param y_coords: Y coordinates of the points
+    :type y_coords: np.ndarray
+    :param aois: AOIs (see aoi_utils.read_aoi_file)
+    :type aois: list
+    :return: AOI label of each point
+    :rtype: np.ndarray
+    """
+    from matplotlib.path import Path
+
+    paths = [Path(aoi['vertices']) for aoi in aois]
+    labels = np.full(len(x_coords), -1, dtype=np.int64)
+    for position, point in enumerate(zip(x_coords, y_coords)):
+        for label, (aoi, path) in enumerate(zip(aois, paths)):
+            min_x, min_y, max_x, max_y = aoi['bounds']
+            if aoi['is_rect']:
+                is_hit = min_x <= point[0] <= max_x and min_y <= point[1] <= max_y
+            else:
+                is_hit = path.contains_point(point)
+            if is_hit:
+                labels[position] = label
+                break
+    return labels
+
+
+def benchmark_aoi(num_reference_points: int = 20000) -> None:
+    """
+    Prints the timings of hit-testing every gaze point of the data
+    against AOIs at once and (for some of them) one point at a time,
+    and of computing the AOI metrics of every participant at once
+    and one (participant, stimulus) at a time, and whether
+    both give the same results
+
+    :param num_reference_points: number of gaze points hit-tested
+        one point at a time
+    :type num_reference_points: int
+    """
+    model_data = ModelData.get_instance()
+    if model_data.df is None:
+        model_data.load_df()
+    aois = get_benchmark_aois()
+    x_coords = model_data.df[X_GAZE_COL_TITLE].to_numpy(dtype=np.float64)
+    y_coords = model_data.df[Y_GAZE_COL_TITLE].to_numpy(dtype=np.float64)
+    print("AOI hit testing of {} gaze points against {} AOIs".format(x_coords.size, len(aois)))
+    hit_testing_time = time_call(aoi_utils.get_aoi_labels, x_coords, y_coords, aois)
+    print("  vectorized:     {:8.3f} s ({:.1f}M points/s)".format(
+        hit_testing_time, x_coords.size / hit_testing_time / 1e6))
+    labels = aoi_utils.get_aoi_labels(x_coords[:num_reference_points], y_coords[:num_reference_points], aois)
+    start_time = time.perf_counter()
+    reference_labels = get_aoi_labels_per_point(x_coords[:num_reference_points],
+                                                y_coords[:num_reference_points], aois)
+    reference_time = (time.perf_counter() - start_time) * x_coords.size / num_reference_points
+    print("  per point:      {:8.3f} s (extrapolated from {} points), same labels: {}".format(
+        reference_time, num_reference_points, np.array_equal(labels, reference_labels)))
+
+    fixation_df = model_data.fixation_df
+    stimulus_aois = {stimulus: aois for stimulus in model_data.get_stimuli()}
+    onsets = {key: time_range[0] for key, time_range in model_data.partition_time_ranges.items()}
+    aoi_metrics_df = aoi_utils.build_aoi_metrics_df(fixation_df, stimulus_aois, onsets)
+    print("AOI metrics of {} (participant, stimulus, AOI) from {} fixations".format(
+        len(aoi_metrics_df.index), len(fixation_df.index)))
+    print("  vectorized:     {:8.3f} s".format(
+        time_call(aoi_utils.build_aoi_metrics_df, fixation_df, stimulus_aois, onsets)))
+    start_time = time.perf_counter()
+    reference_aoi_metrics_df = pd.concat([
+        aoi_utils.build_aoi_metrics_df(group_fixation_df, stimulus_aois, onsets)
+        for _, group_fixation_df in fixation_df.groupby(
+            [PARTICIPANT_FILENAME_COL_TITLE, STIMULUS_COL_TITLE], observed=True, sort=False
+        )
+    ], ignore_index=True)
+    print("  per participant: {:7.3f} s".format(time.perf_counter() - start_time))
+    sort_col_titles = aoi_utils.AOI_METRIC_COL_TITLES[1:4]
+    print("  same metrics: {}".format(
+        aoi_metrics_df.sort_values(sort_col_titles, kind='stable').reset_index(drop=True).equals(
+            reference_aoi_metrics_df.sort_values(sort_col_titles, kind='stable').reset_index(drop=True))))
+
+
+def count_ordered_pairs_per_sequence(labels: np.ndarray, sequence_starts: np.ndarray, num_labels: int) -> tuple:
+    """
+    Counts the ordered pairs of labels of each sequence
+    one pair of positions at a time, as a reference for
+    the compiled kernel
+
+    :param labels: labels of the sequences, concatenated
+    :type labels: np.ndarray
+    :param sequence_starts: ascending positions of the first label of each sequence
+    :type sequence_starts: np.ndarray
+    :param num_labels: number of labels
+    :type num_labels: int
+    :return: count of each pair and of each label
+    :rtype: tuple
+    """
+    pair_counts = np.zeros((num_labels, num_labels), dtype=np.int64)
+    label_counts = np.zeros(num_labels, dtype=np.int64)
+    for sequence in np.split(labels, sequence_starts[1:]):
+        sequence = [label for label in sequence.tolist() if label >= 0]
+        pairs = {(sequence[index_first], sequence[index_last])
+                 for index_first in range(len(sequence))
+                 for index_last in range(index_first + 1, len(sequence))}
+        for pair in pairs:
+            pair_counts[pair] += 1
+        for label in set(sequence):
+            label_counts[label] += 1
+    return pair_counts, label_counts
+
+
+def benchmark_kernels(num_sequences: int = 50, sequence_length: int = 400, num_labels: int = 20,
+                      num_trials: int = 1000) -> None:
+    """
+    Prints the time taken to load the compiled kernels of the cluster
+    analysis and the timings of each kernel compiled and in NumPy
+    on random cluster sequences, and whether both (and the pair
+    counting of each sequence one pair at a time) agree
+
+    :param num_sequences: number of sequences (participants)
+    :type num_sequences: int
+    :param sequence_length: number of labels of each sequence
+    :type sequence_length: int
+    :param num_labels: number of labels (clusters)
+    :type num_labels: int
+    :param num_trials: number of Monte Carlo trials
+    :type num_trials: int
+    """
+    print("Kernels loaded (compiled or from the on-disk cache): {:8.3f} s".format(
+        time_call(kernel_utils.load_kernels)))
+    rng = np.random.default_rng(0)
+    labels = rng.integers(-1, num_labels, num_sequences * sequence_length, dtype=np.int64)
+    group_codes = np.repeat(np.arange(num_sequences, dtype=np.int64), sequence_length)
+    sequence_starts = np.arange(0, labels.size, sequence_length, dtype=np.int64)
+    trial_labels = rng.integers(-1, num_labels, (num_trials, labels.size), dtype=np.int64)
+    print("{} sequences of {} labels, {} Monte Carlo trials".format(num_sequences, sequence_length, num_trials))
+
+    for name, args in [(kernel_utils.COLLAPSE_KERNEL, (labels, group_codes)),
+                       (kernel_utils.PAIR_COUNT_KERNEL, (labels, sequence_starts, num_labels))]:
+        kernel, fallback = kernel_utils.get_kernel(name), kernel_utils.KERNEL_FALLBACKS[name]
+        print("  {:24s} compiled: {:8.3f} s, NumPy: {:8.3f} s, same results: {}".format(
+            name, time_call(kernel, *args), time_call(fallback, *args),
+            all(np.array_equal(result, fallback_result)
+                for result, fallback_result in zip(kernel(*args), fallback(*args)))))
+    pair_counts, label_counts = kernel_utils.get_kernel(kernel_utils.PAIR_COUNT_KERNEL)(
+        labels, sequence_starts, num_labels)
+    print("  {:24s} per sequence: {:8.3f} s, same results: {}".format(
+        kernel_utils.PAIR_COUNT_KERNEL,
+        time_call(count_ordered_pairs_per_sequence, labels, sequence_starts, num_labels),
+        all(np.array_equal(result, reference_result) for result, reference_result in zip(
+            (pair_counts, label_counts),
+            count_ordered_pairs_per_sequence(labels, sequence_starts, num_labels)))))
+
+    args = (trial_labels, sequence_starts, pair_counts)
+    kernel = kernel_utils.get_kernel(kernel_utils.EXCEEDANCE_KERNEL)
+    fallback = kernel_utils.KERNEL_FALLBACKS[kernel_utils.EXCEEDANCE_KERNEL]
+    print("  {:24s} compiled: {:8.3f} s, NumPy: {:8.3f} s, same results: {}".format(
+        kernel_utils.EXCEEDANCE_KERNEL, time_call(kernel, *args), time_call(fallback, *args),
+        np.array_equal(kernel(*args), fallback(*args))))
+
+
+def benchmark_dbscan(eps_values: tuple = (10, 20, 30, 40, 50), min_samples_values: tuple = (5, 10, 20)) -> None:
+    """
+    Prints the timings of clustering the gaze points of a stimulus with
+    sklearn's DBSCAN for each eps and min_samples of a sweep versus
+    building the neighbor graph once at the maximum eps and clustering
+    from it for each of them, and whether both give the same labels
+
+    :param eps_values: eps of the sweep
+    :type eps_values: tuple
+    :param min_samples_values: min_samples of the sweep
+    :type min_samples_values: tuple
+    """
+    model_data = ModelData.get_instance()
+    if model_data.df is None:
+        model_data.load_df()
+    stimulus = model_data.get_stimuli()[0]
+    stimulus_df = model_data.df[model_data.df[STIMULUS_COL_TITLE] == stimulus]
+    xy = stimulus_df[[X_GAZE_COL_TITLE, Y_GAZE_COL_TITLE]].dropna().to_numpy(dtype=np.float64)
+    settings = [(eps, min_samples) for eps in eps_values for min_samples in min_samples_values]
+    print("DBSCAN sweep of {} settings over {} gaze points".format(len(settings), xy.shape[0]))
+    kernel_utils.load_kernels()
+
+    start_time = time.perf_counter()
+    reference_labels = [DBSCAN(eps=eps, min_samples=min_samples).fit(xy).labels_ for eps, min_samples in settings]
+    print("  sklearn per setting: {:8.3f} s".format(time.perf_counter() - start_time))
+    start_time = time.perf_counter()
+    neighbor_graph = cluster_utils.build_neighbor_graph(xy, max(eps_values))
+    graph_time = time.perf_counter() - start_time
+    labels = [cluster_utils.get_dbscan_labels(neighbor_graph, eps, min_samples) for eps, min_samples in settings]
+    sweep_time = time.perf_counter() - start_time - graph_time
+    print("  neighbor graph:      {:8.3f} s (built in {:.3f} s, {:.3f} s per setting), same labels: {}".format(
+        graph_time + sweep_time, graph_time, sweep_time / len(settings),
+        all(np.array_equal(setting_labels, setting_reference_labels)
+            for setting_labels, setting_reference_labels in zip(labels, reference_labels))))
+
+
+def benchmark_optics(num_points: int = 10000, min_samples: int = 10, eps_values: tuple = (10, 15, 20, 25, 30)) -> None:
+    """
+    Prints the timings of clustering gaze points of a stimulus with
+    sklearn's DBSCAN for each eps of a sweep versus running OPTICS
+    once and extracting the clusters from its reachability ordering
+    for each of them, and how much both agree (adjusted Rand index)
+
+    :param num_points: number of gaze points clustered
+    :type num_points: int
+    :param min_samples: min_samples of the sweep
+    :type min_samples: int
+    :param eps_values: eps of the sweep
+    :type eps_values: tuple
+    """
+    model_data = ModelData.get_instance()
+    if model_data.df is None:
+        model_data.load_df()
+    stimulus = model_data.get_stimuli()[0]
+    stimulus_df = model_data.df[model_data.df[STIMULUS_COL_TITLE] == stimulus]
+    xy = stimulus_df[[X_GAZE_COL_TITLE, Y_GAZE_COL_TITLE]].dropna().to_numpy(dtype=np.float64)[:num_points]
+    print("OPTICS sweep of {} eps over {} gaze points (min_samples = {})".format(
+        len(eps_values), xy.shape[0], min_samples))
+
+    start_time = time.perf_counter()
+    reference_labels = [DBSCAN(eps=eps, min_samples=min_samples).fit(xy).labels_ for eps in eps_values]
+    print("  DBSCAN per eps:      {:8.3f} s".format(time.perf_counter() - start_time))
+    start_time = time.perf_counter()
+    optics_ordering = cluster_utils.build_optics_ordering(xy, min_samples, max(eps_values))
+    ordering_time = time.perf_counter() - start_time
+    labels = [cluster_utils.get_optics_dbscan_labels(optics_ordering, eps) for eps in eps_values]
+    extraction_time = time.perf_counter() - start_time - ordering_time
+    print("  OPTICS ordering:     {:8.3f} s (built in {:.3f} s, {:.5f} s per eps)".format(
+        ordering_time + extraction_time, ordering_time, extraction_time / len(eps_values)))
+    print("  adjusted Rand index per eps: {}".format(", ".join(
+        "{}: {:.4f}".format(eps, adjusted_rand_score(eps_reference_labels, eps_labels))
+        for eps, eps_labels, eps_reference_labels in zip(eps_values, labels, reference_labels))))
+
+
+def benchmark_analysis_cache(num_points: int = 10000, eps: int = 22, min_samples: int = 10) -> None:
+    """
+    Prints the timings of clustering gaze points of a stimulus with
+    DBSCAN and with OPTICS versus loading their results from the
+    analysis cache (including hashing the points into the key),
+    and whether the loaded results are the same
+
+    :param num_points: number of gaze points clustered
+    :type num_points: int
+    :param eps: eps of the clustering
+    :type eps: int
+    :param min_samples: min_samples of the clustering
+    :type min_samples: int
+    """
+    model_data = ModelData.get_instance()
+    if model_data.df is None:
+        model_data.load_df()
+    stimulus = model_data.get_stimuli()[0]
+    stimulus_df = model_data.df[model_data.df[STIMULUS_COL_TITLE] == stimulus]
+    xy = stimulus_df[[X_GAZE_COL_TITLE, Y_GAZE_COL_TITLE]].dropna().to_numpy(dtype=np.float64)[:num_points]
+    print("Analysis cache of the clustering of {} gaze points".format(xy.shape[0]))
+
+    with tempfile.TemporaryDirectory() as cache_relative_dir:
+        for name, cluster in [
+            ('DBSCAN labels', lambda: {'labels': cluster_utils.get_dbscan_labels(
+                cluster_utils.build_neighbor_graph(xy, eps), eps, min_samples)}),
+            ('OPTICS ordering', lambda: {name: value for name, value in cluster_utils.build_optics_ordering(
+                xy, min_samples, eps).items() if name != 'xy'})
+        ]:
+            start_time = time.perf_counter()
+            result = cluster()
+            compute_time = time.perf_counter() - start_time
+            key = analysis_cache_utils.get_analysis_key([xy], {'name': name, 'eps': eps, 'min_samples': min_samples})
+            analysis_cache_utils.store_analysis_result(key, result, cache_relative_dir)
+            start_time = time.perf_counter()
+            cached_result = analysis_cache_utils.load_analysis_result(
+                analysis_cache_utils.get_analysis_key([xy], {'name': name, 'eps': eps, 'min_samples': min_samples}),
+                cache_relative_dir
+            )
+            load_time = time.perf_counter() - start_time
+            print("  {:16s} computed: {:8.3f} s, loaded: {:8.4f} s, same result: {}".format(
+                name, compute_time, load_time,
+                cached_result is not None and all(np.array_equal(cached_result[result_name], value)
+                                                  for result_name, value in result.items())))
+
+
+def benchmark_grid_dbscan(data_relative_dir: str = 'data/tsv_files_sample', eps_values: tuple = (5, 10, 22, 40),
+                          min_samples_values: tuple = (2, 5, 10, 20), num_points: int = 2000000) -> None:
+    """
+    Prints the agreement of grid DBSCAN with sklearn's DBSCAN on the
+    gaze points of each stimulus of the data files in the specified
+    directory, for each eps and min_samples of a sweep (the fraction
+    of points given the same label, and of the clusterings that are
+    the same), and the timings of both on gaze points tiled
+    (with jitter) to the specified number of points
+
+    :param data_relative_dir: directory containing the data files compared on
+    :type data_relative_dir: str
+    :param eps_values: eps of the sweep
+    :type eps_values: tuple
+    :param min_samples_values: min_samples of the sweep
+    :type min_samples_values: tuple
+    :param num_points: number of gaze points timed
+    :type num_points: int
+    """
+    kernel_utils.load_kernels()
+    sample_df = ingest_utils.concat_participant_dfs([
+        ingest_utils.read_participant_file(participant_filename, data_relative_dir)
+        for participant_filename in sorted(os.listdir(data_relative_dir)) if participant_filename.endswith('.tsv')
+    ])
+    num_same_points, num_points_compared, num_same_clusterings, num_clusterings = 0, 0, 0, 0
+    for _, stimulus_df in sample_df.groupby(STIMULUS_COL_TITLE, observed=True):
+        xy = stimulus_df[[X_GAZE_COL_TITLE, Y_GAZE_COL_TITLE]].dropna().to_numpy(dtype=np.float64)
+        for eps in eps_values:
+            for min_samples in min_samples_values:
+                labels = cluster_utils.get_grid_dbscan_labels(xy, eps, min_samples)
+                reference_labels = DBSCAN(eps=eps, min_samples=min_samples).fit(xy).labels_
+                num_same_points += np.count_nonzero(labels == reference_labels)
+                num_points_compared += labels.size
+                num_same_clusterings += np.array_equal(labels, reference_labels)
+                num_clusterings += 1
+    print("Grid DBSCAN agreement with DBSCAN on {}: {:.4%} of {} points, {} of {} clusterings the same".format(
+        data_relative_dir, num_same_points / num_points_compared, num_points_compared,
+        num_same_clusterings, num_clusterings))
+
+    model_data = ModelData.get_instance()
+    if model_data.df is None:
+        model_data.load_df()
+    gaze_xy = model_data.df[[X_GAZE_COL_TITLE, Y_GAZE_COL_TITLE]].dropna().to_numpy(dtype=np.float64)
+    rng = np.random.default_rng(0)
+    xy = np.tile(gaze_xy, (num_points // gaze_xy.shape[0] + 1, 1))[:num_points]
+    xy += rng.normal(0, 2, xy.shape)
+    for timed_num_points in [num_points // 100, num_points // 10, num_points]:
+        grid_time = time_call(cluster_utils.get_grid_dbscan_labels, xy[:timed_num_points], 22, 10)
+        if timed_num_points <= num_points // 10:
+            print("  {:8d} gaze points: grid {:8.3f} s, DBSCAN {:8.3f} s".format(
+                timed_num_points, grid_time, time_call(DBSCAN(eps=22, min_samples=10).fit, xy[:timed_num_points])))
+        else:
+            print("  {:8d} gaze points: grid {:8.3f} s".format(timed_num_points, grid_time))
+
+
+def benchmark_duplicate_collapsing(eps: int = 22, min_samples: int = 10) -> None:
+    """
+    Prints the number of unique points among the fixations and the gaze
+    points of a stimulus, the timings of clustering all of the points
+    versus their unique points (weighted by their number of duplicates)
+    from the neighbor graph and on the grid, whether both give the same
+    labels as sklearn's DBSCAN, and whether the fixations weighted by
+    their duration are clustered as sklearn's DBSCAN does with the
+    durations as sample weights
+
+    :param eps: maximum distance between neighbors
+    :type eps: int
+    :param min_samples: minimum weight of the neighbors of a core point
+    :type min_samples: int
+    """
+    model_data = ModelData.get_instance()
+    if model_data.df is None:
+        model_data.load_df()
+    stimulus = model_data.get_stimuli()[0]
+    stimulus_fixation_df = model_data.fixation_df[model_data.fixation_df[STIMULUS_COL_TITLE] == stimulus]
+    stimulus_df = model_data.df[model_data.df[STIMULUS_COL_TITLE] == stimulus]
+    kernel_utils.load_kernels()
+
+    def cluster_from_neighbor_graph(xy: np.ndarray, weights: np.ndarray = None) -> np.ndarray:
+        return cluster_utils.get_dbscan_labels(cluster_utils.build_neighbor_graph(xy, eps), eps, min_samples, weights)
+
+    def cluster_collapsed(cluster_func, xy: np.ndarray) -> np.ndarray:
+        unique_xy, unique_weights, point_codes = cluster_utils.collapse_duplicate_points(xy)
+        return cluster_func(unique_xy, unique_weights)[point_codes]
+
+    def cluster_on_grid(xy: np.ndarray, weights: np.ndarray = None) -> np.ndarray:
+        return cluster_utils.get_grid_dbscan_labels(xy, eps, min_samples, weights)
+
+    print("Duplicate collapsing for eps {} and min_samples {}".format(eps, min_samples))
+    for data_name, data_df, x_col_title, y_col_title in [
+        ('fixations', stimulus_fixation_df, X_FIXATION_COL_TITLE, Y_FIXATION_COL_TITLE),
+        ('gaze points', stimulus_df, X_GAZE_COL_TITLE, Y_GAZE_COL_TITLE)
+    ]:
+        xy = data_df[[x_col_title, y_col_title]].dropna().to_numpy(dtype=np.float64)
+        reference_labels = DBSCAN(eps=eps, min_samples=min_samples).fit(xy).labels_
+        print("  {} {} ({} unique):".format(
+            xy.shape[0], data_name, cluster_utils.collapse_duplicate_points(xy)[0].shape[0]))
+        for cluster_name, cluster_func in [('neighbor graph', cluster_from_neighbor_graph), ('grid', cluster_on_grid)]:
+            print("    {:14s} all {:7.3f} s, collapsed {:7.3f} s, same labels: {}".format(
+                cluster_name, time_call(cluster_func, xy), time_call(cluster_collapsed, cluster_func, xy),
+                np.array_equal(cluster_collapsed(cluster_func, xy), reference_labels)))
+
+    xy = stimulus_fixation_df[[X_FIXATION_COL_TITLE, Y_FIXATION_COL_TITLE]].to_numpy(dtype=np.float64)
+    durations = stimulus_fixation_df[FIXATION_DURATION_COL_TITLE].to_numpy(dtype=np.float64)
+    weights = durations / durations.mean()
+    reference_labels = DBSCAN(eps=eps, min_samples=min_samples).fit(xy, sample_weight=weights).labels_
+    unique_xy, unique_weights, point_codes = cluster_utils.collapse_duplicate_points(xy, weights)
+    print("  duration-weighted fixations, same labels as weighted DBSCAN: neighbor graph {}, grid {}".format(
+        np.array_equal(cluster_from_neighbor_graph(unique_xy, unique_weights)[point_codes], reference_labels),
+        np.array_equal(cluster_on_grid(unique_xy, unique_weights)[point_codes], reference_labels)))
+
+
+def mean_gaze_x_of_df(participant_df) -> float:
+    """
+    Returns the mean X coordinate of the gaze points of the
+    specified participant data, received pickled by a worker
+
+    :param participant_df: data of the participant
+    :type participant_df: pd.DataFrame
+    :return: mean X coordinate of the gaze points
+    :rtype: float
+    """
+    return float(np.nanmean(participant_df[X_GAZE_COL_TITLE].to_numpy(dtype=np.float64)))
+
+
+def mean_gaze_x_of_shared_arrays(descriptor: dict, start: int, stop: int) -> float:
+    """
+    Returns the mean X coordinate of the gaze points within the
+    specified range of positions of the data published in shared
+    memory, read by a worker without copying the data
+
+    :param descriptor: descriptor of the arrays published in shared memory
+    :type descriptor: dict
+    :param start: first position of the range
+    :type start: int
+    :param stop: position after the last position of the range
+    :type stop: int
+    :return: mean X coordinate of the gaze points
+    :rtype: float
+    """
+    arrays, shared_memory_blocks = shared_memory_utils.attach_arrays(
+        {X_GAZE_COL_TITLE: descriptor['arrays'][X_GAZE_COL_TITLE]}
+    )
+    mean_gaze_x = float(np.nanmean(arrays[X_GAZE_COL_TITLE][start:stop].astype(np.float64)))
+    del arrays
+    shared_memory_utils.release_arrays(shared_memory_blocks)
+    return mean_gaze_x
+
+
+def benchmark_shared_memory() -> None:
+    """
+    Prints the timings and the number of bytes sent to
+    worker processes of a per-participant task that
+    receives pickled slices of the data versus one that
+    attaches to the data published in shared memory
+    """
+    model_data = ModelData.get_instance()
+    if model_data.df is None:
+        model_data.load_df()
+    row_ranges = list(model_data.participant_row_ranges.values())
+    print("Per-participant task over {} participants".format(len(row_ranges)))
+
+    with ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn')) as executor:
+        executor.submit(int).result()  # the workers are started before timing
+
+        participant_dfs = [model_data.df.iloc[start:stop] for start, stop in row_ranges]
+        pickled_num_bytes = sum(len(pickle.dumps(participant_df)) for participant_df in participant_dfs)
+        start_time = time.perf_counter()
+        pickled_results = list(executor.map(mean_gaze_x_of_df, participant_dfs))
+        pickled_time = time.perf_counter() - start_time
+        print("  pickled slices: {:8.3f} s, {:10d} bytes sent".format(pickled_time, pickled_num_bytes))
+
+        descriptor = model_data.publish_shared_arrays()
+        shared_num_bytes = len(row_ranges) * len(pickle.dumps((descriptor, 0, 0)))
+        start_time = time.perf_counter()
+        shared_results = list(executor.map(mean_gaze_x_of_shared_arrays,
+                                           [descriptor] * len(row_ranges),
+                                           [start for start, _ in row_ranges],
+                                           [stop for _, stop in row_ranges]))
+        shared_time = time.perf_counter() - start_time
+        print("  shared memory:  {:8.3f} s, {:10d} bytes sent ({:.2f}x)".format(
+            shared_time, shared_num_bytes, pickled_time / shared_time))
+    assert np.allclose(pickled_results, shared_results, equal_nan=True)
+
+
+# Worker processes re-import this module,
+# so the benchmarks only run in the main process
+if __name__ == '__main__':
+    benchmark_ingest()
+    benchmark_ingest_memory()
+    benchmark_shared_memory()
+    benchmark_selection()
+    benchmark_time_window_selection()
+    benchmark_fixation_extraction()
+    benchmark_fixation_detection()
+    benchmark_metrics()
+    benchmark_aoi()
+    benchmark_kernels()
+    benchmark_dbscan()
+    benchmark_optics()
+    benchmark_analysis_cache()
+    benchmark_grid_dbscan()
+    benchmark_duplicate_collapsing()
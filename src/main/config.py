@@ -42,6 +42,115 @@ PARTICIPANT_NAME_COL_TITLE = 'ParticipantName'
 # (generated by this application)
 PARTICIPANT_FILENAME_COL_TITLE = 'participant_filename'
 
+# Name of the column with the ordinal of each fixation
+# of a participant in the fixation table
+# (generated by this application)
+FIXATION_ID_COL_TITLE = 'fixation_id'
+
+# Name of the column with the duration of each fixation
+# in the fixation table (generated by this application)
+FIXATION_DURATION_COL_TITLE = 'fixation_duration'
+
+# Name of the column with the validity flags of each
+# observation, i.e., whether it has the values needed
+# to be plotted as gaze data and as fixation data
+# (generated by this application)
+VALIDITY_COL_TITLE = 'validity'
+
+########################
+# Cache Configurations #
+########################
+
+# Relative directory location of the cache of parsed
+# data files (created by this application)
+RELATIVE_CACHE_DIR = "data/.cache"
+
+# Whether parsed data files are cached on disk in a
+# binary columnar format (Feather) and reloaded from
+# there on subsequent launches; only data files whose
+# size or modification time has changed are re-parsed
+USE_DATA_CACHE = True
+
+# Relative directory location of the cache of analysis
+# results, e.g., cluster labels and Monte Carlo trial
+# counts (created by this application)
+RELATIVE_ANALYSIS_CACHE_DIR = "data/.cache/analysis"
+
+# Whether analysis results are cached on disk, keyed by a
+# hash of the analyzed points and the analysis parameters,
+# and reloaded from there when the same analysis is repeated,
+# in this or a later session
+USE_ANALYSIS_CACHE = True
+
+# Maximum total size (in bytes) of the cached analysis
+# results, beyond which the least recently used are evicted
+MAX_ANALYSIS_CACHE_BYTES = 256 * 1024 * 1024
+
+#########################
+# Ingest Configurations #
+#########################
+
+# Whether data files that have to be parsed are parsed
+# concurrently by a pool of worker processes; if False,
+# they are parsed one after another in this process
+USE_PARALLEL_INGEST = True
+
+# Number of worker processes that parse data files
+# concurrently; None uses one per available CPU
+NUM_INGEST_WORKERS = None
+
+# Interval (in milliseconds) at which the data directory is
+# polled for added, modified or removed data files, which
+# are then imported (or dropped) without reloading the
+# unchanged data files; 0 turns polling off (the data can
+# still be refreshed on demand with the refresh shortcut)
+DATA_DIR_POLL_INTERVAL_MS = 0
+
+# Whether data files are streamed in chunks into an on-disk
+# store of (stimulus, participant) partitions instead of
+# being held in memory; partitions are then read on demand
+# for each plot, so recordings larger than memory can be
+# visualized
+USE_OUT_OF_CORE_INGEST = False
+
+# Approximate memory (in MB) that streaming the data files
+# into the partition store may use at once; the number of
+# rows read per chunk is derived from it
+INGEST_MEMORY_BUDGET_MB = 256
+
+# Relative directory location of the partition store
+# (created by this application)
+RELATIVE_PARTITION_STORE_DIR = "data/.partitions"
+
+#####################################
+# Fixation Detection Configurations #
+#####################################
+
+# Algorithm that groups the gaze points into fixations:
+# None uses the fixation points of the .tsv files,
+# 'I-VT' uses a velocity threshold and 'I-DT' uses
+# a dispersion threshold on the gaze points
+FIXATION_DETECTION_ALGORITHM = None
+
+# Maximum velocity (in pixels per millisecond) of
+# the gaze between two consecutive gaze points
+# of a fixation (I-VT)
+IVT_VELOCITY_THRESHOLD = 1.0
+
+# Maximum dispersion (in pixels), i.e., the sum of the
+# width and height of the bounding box, of the gaze
+# points of a fixation (I-DT)
+IDT_DISPERSION_THRESHOLD = 50
+
+# Minimum duration (in milliseconds) of a fixation;
+# shorter groups of gaze points are not fixations
+MIN_FIXATION_DURATION_MS = 60
+
+# Maximum time (in milliseconds) between two consecutive
+# gaze points of a fixation; longer gaps (e.g., blinks
+# or lost tracking) end the fixation
+MAX_FIXATION_GAP_MS = 75
+
 #########################
 # Figure Configurations #
 #########################
@@ -62,10 +171,36 @@ EXTREMA_BUFFER_PCT = 0.05
 
 MAX_FIXATION_PT_SIZE = 50
 
+# Maximum number of gaze points sent to a gaze Scatter Plot
+# or Line Plot, shared between the selected participants;
+# each participant's gaze points beyond its share are
+# downsampled (Largest-Triangle-Three-Buckets for line plots,
+# spatial thinning for scatter plots) so that the time taken
+# to render the figure does not grow with the number of
+# selected participants; None turns downsampling off
+MAX_GAZE_PLOT_POINTS = 20000
+
 DEFAULT_EPS_VALUE = 22
 
 DEFAULT_MIN_SAMPLES_VALUE = 10
 
+# Whether the fixations are weighed by their duration when clustered
+# with DBSCAN, relative to the mean duration so that min_samples is
+# still a number of fixations (of mean duration); otherwise each
+# fixation (and each gaze point) weighs 1
+WEIGH_FIXATION_CLUSTERS_BY_DURATION = False
+
+# Maximum number of edges (neighbor pairs, ~16 bytes each) of the
+# neighbor graph DBSCAN re-clusters from; the graph is built up to
+# the largest radius (from the maximum eps of the eps range halved
+# down to the eps) expected to stay within it, and the points are
+# clustered on a grid instead if even the graph of the eps would not
+MAX_NEIGHBOR_GRAPH_EDGES = 20000000
+
+# Number of points sampled to estimate the number of
+# edges of a neighbor graph before it is built
+NEIGHBOR_GRAPH_EDGE_SAMPLE_SIZE = 1000
+
 DEFAULT_SUPPORT_THRESHOLD = 0
 
 DEFAULT_FORWARD_CONFIDENCE_THRESHOLD = 50
@@ -74,6 +209,17 @@ DEFAULT_BACKWARD_CONFIDENCE_THRESHOLD = 50
 
 DEFAULT_NUM_MONTE_CARLO_TRIALS = 10000
 
+# Number of Monte Carlo trials drawn and counted at once,
+# between which the progress bar and the estimated time
+# left are updated
+MONTE_CARLO_CHUNK_SIZE = 100
+
+# Seed of the random trials of the Monte Carlo simulation,
+# so that it gives the same p-values for the same data
+# (which can then be cached); None draws different
+# trials each time (which are not cached)
+MONTE_CARLO_SEED = 0
+
 NUM_DIGITS_ROUND_P_VALUE = 3  # 3 decimal places
 
 ########################
@@ -88,3 +234,9 @@ RELATIVE_STIMULUS_IMAGE_DIR = "data/stimuli"
 EXCLUDE_STIMULI_LIST = ['nan', 'Instruction Element']
 
 MAKE_IMG_GRAYSCALE = True
+
+# Suffix of the sidecar file defining the areas of interest
+# (AOIs) of a stimulus, next to its image in the images
+# directory (e.g., "Array 1  1A 5TD.bmp.aoi.json"); see
+# aoi_utils.read_aoi_file for its format
+AOI_FILE_SUFFIX = ".aoi.json"
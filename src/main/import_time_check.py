@@ -0,0 +1,101 @@
+"""
+Checks that importing the startup path of the application stays
+within its import-time budget and does not load the modules that
+are only imported on first use; exits with a non-zero status if not
+
+Run from the root of the repository with
+    python -m src.main.import_time_check
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+# Module whose import is the startup path of the application
+STARTUP_MODULE = 'src.main.app'
+
+# Maximum median time (in ms) that importing the startup path may take
+STARTUP_IMPORT_TIME_BUDGET_MS = 1000
+
+# Number of times the startup path is imported; the median
+# import time is checked against the budget
+NUM_RUNS = 5
+
+# Modules that are only imported on first use and therefore
+# must not be imported by the startup path
+DEFERRED_MODULES = [
+    'PIL',
+    'PyQt5.QtWebEngineWidgets',
+    'matplotlib',
+    'numba',
+    'plotly.express',
+    'sklearn'
+]
+
+
+def measure_import_time(module_name: str) -> tuple:
+    """
+    Imports the specified module in a fresh interpreter with
+    `python -X importtime` and returns the cumulative import
+    time (in ms) of the module, along with the names of all the
+    modules imported along with it
+
+    :param module_name: name of the module to import
+    :type module_name: str
+    :return: import time (in ms) and names of the imported modules
+    :rtype: tuple
+    """
+    repo_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import ' + module_name],
+        cwd=repo_dir, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        universal_newlines=True, check=True
+    )
+    import_time_ms = None
+    imported_module_names = set()
+    for line in result.stderr.splitlines():
+        # lines are formatted as "import time: self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or line.endswith('imported package'):
+            continue
+        _, cumulative_us, imported_module_name = line[len('import time:'):].split('|')
+        imported_module_name = imported_module_name.strip()
+        imported_module_names.add(imported_module_name)
+        if imported_module_name == module_name:
+            import_time_ms = int(cumulative_us) / 1000
+    return import_time_ms, imported_module_names
+
+
+def check_startup_import_time() -> bool:
+    """
+    Prints the import time of the startup path and the deferred
+    modules it imports, and returns True if it is within budget
+    and imports none of the deferred modules
+
+    :return: True if the check passes
+    :rtype: bool
+    """
+    # the first import compiles the bytecode, so it is not measured
+    measure_import_time(STARTUP_MODULE)
+    import_times_ms = []
+    imported_module_names = set()
+    for _ in range(NUM_RUNS):
+        import_time_ms, imported_module_names = measure_import_time(STARTUP_MODULE)
+        import_times_ms.append(import_time_ms)
+    median_import_time_ms = statistics.median(import_times_ms)
+
+    eagerly_imported_modules = [
+        deferred_module for deferred_module in DEFERRED_MODULES
+        if deferred_module in imported_module_names
+    ]
+    is_within_budget = median_import_time_ms <= STARTUP_IMPORT_TIME_BUDGET_MS
+    print("Import of {}: {:.0f} ms (budget {} ms)".format(
+        STARTUP_MODULE, median_import_time_ms, STARTUP_IMPORT_TIME_BUDGET_MS))
+    if not is_within_budget:
+        print("  over budget")
+    for eagerly_imported_module in eagerly_imported_modules:
+        print("  imports {} at startup, which should be imported on first use".format(eagerly_imported_module))
+    return is_within_budget and len(eagerly_imported_modules) == 0
+
+
+if __name__ == '__main__':
+    sys.exit(0 if check_startup_import_time() else 1)
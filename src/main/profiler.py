@@ -1,6 +1,7 @@
 import cProfile
 import sys
 
+from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QApplication
 from src.controller.delegator import Delegator
 
@@ -9,6 +10,7 @@ def run():
     """
     Runs the program
     """
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
     Delegator()
     app.exec_()
@@ -8,10 +8,23 @@ HIGHLY MODULAR PROGRAM.
 """
 
 # External imports
-import os
+import atexit
+
+import numpy as np
 import pandas as pd
 
-from src.main.config import RELATIVE_DATA_DIR
+from src.main.config import FIXATION_DETECTION_ALGORITHM
+from src.main.config import NUM_INGEST_WORKERS
+from src.main.config import PARTICIPANT_FILENAME_COL_TITLE
+from src.main.config import RELATIVE_PARTITION_STORE_DIR
+from src.main.config import STIMULUS_COL_TITLE
+from src.main.config import STIMULUS_X_DISPLACEMENT_COL_TITLE
+from src.main.config import STIMULUS_Y_DISPLACEMENT_COL_TITLE
+from src.main.config import TIMESTAMP_COL_TITLE
+from src.main.config import USE_DATA_CACHE
+from src.main.config import USE_OUT_OF_CORE_INGEST
+from src.main.config import USE_PARALLEL_INGEST
+from src.main.config import VALIDITY_COL_TITLE
 
 
 class ModelData(object):
@@ -21,9 +34,55 @@ class ModelData(object):
     __instance = None
 
     df = None
+    # maps each (stimulus, participant filename) to the
+    # ascending positions of its observations within df,
+    # to their sorted timestamps (aligned with the positions)
+    # and to the first and last of their timestamps
+    partition_index: dict = None
+    partition_timestamps: dict = None
+    partition_time_ranges: dict = None
+    # maps each stimulus to the filenames of the participants
+    # with observations of it, ordered as in df
+    stimulus_participants: dict = None
+    # maps each participant filename to the signature of the
+    # data file when it was imported and to the range of
+    # positions of its observations within df
+    participant_signatures: dict = None
+    participant_row_ranges: dict = None
+    # maps each participant filename to the number of part files
+    # and rows of the partition of each stimulus in the on-disk
+    # partition store (when ingesting out of core, in which
+    # case df is not held in memory)
+    participant_partitions: dict = None
+    # fixations of every participant, derived from df when it
+    # is imported (or detected from its gaze points), the range
+    # of positions of the fixations of each participant within
+    # it and the positions (and sorted start timestamps) of the
+    # fixations of each (stimulus, participant filename) within it
+    fixation_df = None
+    fixation_partition_index: dict = None
+    fixation_partition_timestamps: dict = None
+    participant_fixation_row_ranges: dict = None
+    # descriptor and blocks of the numeric columns and codes
+    # of df published in shared memory for worker processes
+    shared_arrays_descriptor: dict = None
+    shared_memory_blocks: dict = None
+    is_shared_memory_released_at_exit = False
 
     def clear(self) -> None:
+        self.release_shared_arrays()
         self.df = None
+        self.partition_index = None
+        self.partition_timestamps = None
+        self.partition_time_ranges = None
+        self.stimulus_participants = None
+        self.participant_signatures = None
+        self.participant_row_ranges = None
+        self.participant_partitions = None
+        self.fixation_df = None
+        self.fixation_partition_index = None
+        self.fixation_partition_timestamps = None
+        self.participant_fixation_row_ranges = None
 
     def __init__(self):
         """
@@ -47,24 +106,718 @@ class ModelData(object):
             ModelData()
         return ModelData.__instance
 
-    def load_df(self) -> pd.DataFrame:
+    def load_df(self, progress_callback=None) -> pd.DataFrame:
         """
         Imports all the eye-tracking data
         (of the selected participants) available
-        in the specified data directory path
-        :return complete data
+        in the specified data directory path;
+        data files that have not changed since
+        they were last imported are reloaded
+        from the on-disk cache instead of being
+        re-parsed
+        :param progress_callback: None, or a function called with the
+            number of data files imported so far and the number of
+            data files to import as the data files are imported
+        :type progress_callback: callable
+        :return complete data, or None if ingesting out of core
         :rtype pd.DataFrame
         """
-        self.df = pd.concat(
-            pd.read_csv(
-                os.path.join(
-                    RELATIVE_DATA_DIR, participant_filename
-                ),
-                sep='\t'
-            ).assign(participant_filename=participant_filename) \
-            for participant_filename in ModelParticipantSelection.get_instance().import_all_participants()
+        if USE_OUT_OF_CORE_INGEST:
+            self.load_partition_store(progress_callback)
+            return self.df
+
+        participant_filenames = ModelParticipantSelection.get_instance().import_all_participants()
+        signatures = self.get_participant_signatures(participant_filenames)
+        manifest = cache_utils.load_manifest() if USE_DATA_CACHE else None
+
+        participant_dfs, participant_fixation_dfs = self.import_participant_dfs(
+            participant_filenames, signatures, manifest, progress_callback=progress_callback
         )
+        self.set_participant_dfs(participant_filenames, participant_dfs, participant_fixation_dfs, signatures)
+
+        self.save_manifest(manifest, participant_filenames)
         return self.df
 
+    def refresh_df(self) -> bool:
+        """
+        Brings the imported eye-tracking data up to date with
+        the data directory without re-importing unchanged data
+        files: only data files that were added or modified since
+        they were imported are imported, and the observations
+        of data files that were removed are dropped
+        :return True if the data changed
+        :rtype bool
+        """
+        if self.participant_signatures is None:
+            self.load_df()
+            return True
+
+        participant_filenames = ModelParticipantSelection.get_instance().import_all_participants()
+        signatures = self.get_participant_signatures(participant_filenames)
+        changed_participant_filenames = [
+            participant_filename for participant_filename in participant_filenames
+            if self.participant_signatures.get(participant_filename) != signatures[participant_filename]
+        ]
+        has_removed_participants = any(
+            participant_filename not in signatures for participant_filename in self.participant_signatures
+        )
+        if len(changed_participant_filenames) == 0 and not has_removed_participants:
+            return False
+        if USE_OUT_OF_CORE_INGEST:
+            # only the changed data files are streamed again
+            self.load_partition_store()
+            return True
+
+        manifest = cache_utils.load_manifest() if USE_DATA_CACHE else None
+        participant_dfs, participant_fixation_dfs = self.import_participant_dfs(
+            changed_participant_filenames, signatures, manifest
+        )
+        for participant_filename in participant_filenames:
+            if participant_filename not in participant_dfs:
+                start, stop = self.participant_row_ranges[participant_filename]
+                participant_dfs[participant_filename] = self.df.iloc[start:stop]
+                start, stop = self.participant_fixation_row_ranges[participant_filename]
+                participant_fixation_dfs[participant_filename] = self.fixation_df.iloc[start:stop]
+        self.set_participant_dfs(participant_filenames, participant_dfs, participant_fixation_dfs, signatures)
+
+        self.save_manifest(manifest, participant_filenames)
+        return True
+
+    def load_partition_store(self, progress_callback=None) -> None:
+        """
+        Streams the eye-tracking data files available in the
+        specified data directory path into the on-disk partition
+        store, chunk by chunk within the memory budget; data
+        files that have not changed since they were streamed
+        are not streamed again
+        :param progress_callback: None, or a function called with the
+            number of data files imported so far and the number of
+            data files to import as the data files are imported
+        :type progress_callback: callable
+        """
+        participant_filenames = ModelParticipantSelection.get_instance().import_all_participants()
+        signatures = self.get_participant_signatures(participant_filenames)
+        manifest = cache_utils.load_manifest(RELATIVE_PARTITION_STORE_DIR)
+
+        participant_partitions = {}
+        unstored_participant_filenames = []
+        for participant_filename in participant_filenames:
+            partitions = partition_store_utils.get_stored_partitions(
+                ingest_utils.get_participant_file_path(participant_filename),
+                signatures[participant_filename],
+                manifest
+            )
+            if partitions is None:
+                unstored_participant_filenames.append(participant_filename)
+                continue
+            participant_partitions[participant_filename] = partitions
+            if progress_callback is not None:
+                progress_callback(len(participant_partitions), len(participant_filenames))
+
+        num_stored = len(participant_partitions)
+        spilled_partitions = partition_store_utils.spill_participant_files(
+            unstored_participant_filenames,
+            progress_callback=None if progress_callback is None else
+            lambda num_spilled: progress_callback(num_stored + num_spilled, len(participant_filenames))
+        )
+        for participant_filename, partitions in zip(unstored_participant_filenames, spilled_partitions):
+            participant_partitions[participant_filename] = partitions
+            partition_store_utils.record_partitions(
+                ingest_utils.get_participant_file_path(participant_filename),
+                signatures[participant_filename],
+                partitions,
+                manifest
+            )
+
+        partition_store_utils.prune_manifest(
+            manifest,
+            [ingest_utils.get_participant_file_path(participant_filename)
+             for participant_filename in participant_filenames]
+        )
+        cache_utils.save_manifest(manifest, RELATIVE_PARTITION_STORE_DIR)
+
+        self.clear()
+        self.participant_signatures = signatures
+        self.participant_partitions = {
+            participant_filename: participant_partitions[participant_filename]
+            for participant_filename in participant_filenames
+        }
+        self.stimulus_participants = {}
+        self.partition_time_ranges = {}
+        for participant_filename, partitions in self.participant_partitions.items():
+            for stimulus, partition in partitions.items():
+                self.stimulus_participants.setdefault(stimulus, []).append(participant_filename)
+                self.partition_time_ranges[(stimulus, participant_filename)] = tuple(partition['time_range'])
+        # the fixation table is much smaller than the
+        # data, so it is held in memory regardless
+        self.detect_fixations(FIXATION_DETECTION_ALGORITHM)
+
+    def set_participant_dfs(self,
+                            participant_filenames: list,
+                            participant_dfs: dict,
+                            participant_fixation_dfs: dict,
+                            signatures: dict) -> None:
+        """
+        Concatenates the data and the fixation tables of the
+        specified participants (in the specified order) into the
+        complete data and fixation table and indexes them
+        :param participant_filenames: filenames of the participant data files
+        :type participant_filenames: list
+        :param participant_dfs: data of each participant, keyed by participant filename
+        :type participant_dfs: dict
+        :param participant_fixation_dfs: fixation table of each participant,
+            keyed by participant filename
+        :type participant_fixation_dfs: dict
+        :param signatures: signature of each participant data file
+        :type signatures: dict
+        """
+        self.release_shared_arrays()
+        self.df, self.participant_row_ranges = self.concat_participant_tables(
+            participant_filenames, participant_dfs
+        )
+        self.participant_signatures = signatures
+        self.build_partition_index()
+        if FIXATION_DETECTION_ALGORITHM is None:
+            self.set_fixation_dfs(participant_filenames, participant_fixation_dfs)
+        else:
+            self.detect_fixations(FIXATION_DETECTION_ALGORITHM)
+
+    def set_fixation_dfs(self, participant_filenames: list, participant_fixation_dfs: dict) -> None:
+        """
+        Concatenates the fixation tables of the specified
+        participants (in the specified order) into the
+        complete fixation table and indexes it
+        :param participant_filenames: filenames of the participant data files
+        :type participant_filenames: list
+        :param participant_fixation_dfs: fixation table of each participant,
+            keyed by participant filename
+        :type participant_fixation_dfs: dict
+        """
+        self.fixation_df, self.participant_fixation_row_ranges = self.concat_participant_tables(
+            participant_filenames, participant_fixation_dfs
+        )
+        self.fixation_partition_index = model_utils.build_partition_index(
+            self.fixation_df, [STIMULUS_COL_TITLE, PARTICIPANT_FILENAME_COL_TITLE]
+        )
+        self.fixation_partition_timestamps = model_utils.build_partition_timestamps(
+            self.fixation_partition_index, self.fixation_df[TIMESTAMP_COL_TITLE].to_numpy()
+        )
+
+    def detect_fixations(self,
+                         algorithm: str = FIXATION_DETECTION_ALGORITHM,
+                         **thresholds) -> None:
+        """
+        Rebuilds the fixation table by grouping the gaze points of
+        every participant into fixations with the specified
+        algorithm, concurrently for the participants, so that the
+        whole data can be re-segmented with new thresholds without
+        re-importing it; if the algorithm is None, the fixation
+        points of the data files are used instead
+        :param algorithm: None, fixation_detection_utils.IVT_ALGORITHM
+            or fixation_detection_utils.IDT_ALGORITHM
+        :type algorithm: str
+        :param thresholds: thresholds of the algorithm overriding the
+            configured ones, as keyword arguments of
+            fixation_detection_utils.detect_participant_fixations
+        """
+        participant_filenames = list(self.participant_signatures.keys())
+        if algorithm is not None:
+            participant_fixation_dfs = fixation_detection_utils.detect_participants_fixations(
+                participant_filenames,
+                self.get_participant_df,
+                algorithm,
+                num_workers=NUM_INGEST_WORKERS,
+                **thresholds
+            )
+        elif self.participant_partitions is not None:
+            participant_fixation_dfs = [
+                partition_store_utils.read_fixation_df(ingest_utils.get_participant_file_path(participant_filename))
+                for participant_filename in participant_filenames
+            ]
+        else:
+            participant_fixation_dfs = [
+                fixation_utils.build_fixation_df(
+                    fixation_utils.get_fixation_observations(self.get_participant_df(participant_filename))
+                )
+                for participant_filename in participant_filenames
+            ]
+        self.set_fixation_dfs(participant_filenames, dict(zip(participant_filenames, participant_fixation_dfs)))
+
+    def get_participant_df(self, participant_filename: str) -> pd.DataFrame:
+        """
+        Returns the observations of the specified participant,
+        in recording order; when ingesting out of core, they
+        are read from the partitions of the on-disk partition
+        store (without the observations without a stimulus)
+        :param participant_filename: filename of the participant data file
+        :type participant_filename: str
+        :return data of the participant
+        :rtype pd.DataFrame
+        """
+        if self.participant_partitions is None:
+            start, stop = self.participant_row_ranges[participant_filename]
+            return self.df.iloc[start:stop]
+        partition_dfs = [
+            partition_store_utils.read_partition(
+                ingest_utils.get_participant_file_path(participant_filename), stimulus, partition
+            )
+            for stimulus, partition in self.participant_partitions[participant_filename].items()
+        ]
+        if len(partition_dfs) == 0:
+            return pd.DataFrame(columns=ingest_utils.INGEST_COL_TITLES + [PARTICIPANT_FILENAME_COL_TITLE,
+                                                                          VALIDITY_COL_TITLE])
+        return ingest_utils.concat_participant_dfs(partition_dfs).sort_values(
+            TIMESTAMP_COL_TITLE, kind='stable', ignore_index=True
+        )
+
+    @staticmethod
+    def concat_participant_tables(participant_filenames: list, participant_dfs: dict) -> tuple:
+        """
+        Concatenates the tables of the specified participants (in
+        the specified order) and returns the concatenated table
+        along with the range of positions of each participant
+        within it
+        :param participant_filenames: filenames of the participant data files
+        :type participant_filenames: list
+        :param participant_dfs: table of each participant, keyed by participant filename
+        :type participant_dfs: dict
+        :return concatenated table and the range of positions of each
+            participant, keyed by participant filename
+        :rtype tuple
+        """
+        df = ingest_utils.concat_participant_dfs(
+            participant_dfs[participant_filename] for participant_filename in participant_filenames
+        )
+        row_ranges = {}
+        start = 0
+        for participant_filename in participant_filenames:
+            stop = start + len(participant_dfs[participant_filename].index)
+            row_ranges[participant_filename] = (start, stop)
+            start = stop
+        return df, row_ranges
+
+    @staticmethod
+    def get_participant_signatures(participant_filenames: list) -> dict:
+        """
+        Returns the signature of each specified participant data
+        file, which identifies whether the file has changed
+        :param participant_filenames: filenames of the participant data files
+        :type participant_filenames: list
+        :return signature of each participant data file
+        :rtype dict
+        """
+        return {
+            participant_filename: cache_utils.get_file_signature(
+                ingest_utils.get_participant_file_path(participant_filename)
+            )
+            for participant_filename in participant_filenames
+        }
+
+    @staticmethod
+    def save_manifest(manifest: dict, participant_filenames: list) -> None:
+        """
+        Prunes the cache of removed participant data
+        files and saves its manifest, if caching
+        :param manifest: manifest of the cache, or None if not caching
+        :type manifest: dict
+        :param participant_filenames: filenames of the participant data files
+        :type participant_filenames: list
+        """
+        if manifest is None:
+            return
+        cache_utils.prune_manifest(
+            manifest,
+            [ingest_utils.get_participant_file_path(participant_filename)
+             for participant_filename in participant_filenames]
+        )
+        cache_utils.save_manifest(manifest)
+
+    def publish_shared_arrays(self) -> dict:
+        """
+        Publishes the numeric columns of the data, and the codes
+        of its categorical columns, as arrays in shared memory
+        (once per import of the data) and returns their
+        descriptor, which worker processes pass to
+        shared_memory_utils.attach_arrays to view the arrays
+        without copying; positions within the arrays are
+        positions within the data
+        :return descriptor of the arrays ('arrays', keyed by column
+            title) and of the categories of the codes ('categories',
+            keyed by column title), or None if the data is not in memory
+        :rtype dict
+        """
+        if self.df is None:
+            return None
+        if self.shared_arrays_descriptor is not None:
+            return self.shared_arrays_descriptor
+
+        arrays = {}
+        categories = {}
+        for col_title in self.df.columns:
+            col = self.df[col_title]
+            if isinstance(col.dtype, pd.CategoricalDtype):
+                arrays[col_title] = col.cat.codes.to_numpy()
+                categories[col_title] = list(col.cat.categories)
+            elif np.issubdtype(col.dtype, np.number):
+                arrays[col_title] = col.to_numpy()
+        arrays_descriptor, self.shared_memory_blocks = shared_memory_utils.publish_arrays(arrays)
+        if not ModelData.is_shared_memory_released_at_exit:
+            atexit.register(lambda: ModelData.get_instance().release_shared_arrays())
+            ModelData.is_shared_memory_released_at_exit = True
+        self.shared_arrays_descriptor = {
+            'arrays': arrays_descriptor,
+            'categories': categories
+        }
+        return self.shared_arrays_descriptor
+
+    def release_shared_arrays(self) -> None:
+        """
+        Frees the arrays published in shared memory, if any;
+        worker processes must no longer be attached to them
+        """
+        if self.shared_memory_blocks is not None:
+            shared_memory_utils.release_arrays(self.shared_memory_blocks, unlink=True)
+        self.shared_arrays_descriptor = None
+        self.shared_memory_blocks = None
+
+    def build_partition_index(self) -> None:
+        """
+        Builds the index of the positions and the sorted
+        timestamps of the observations of each (stimulus,
+        participant filename) within the data so that
+        selections need not scan the whole data
+        """
+        self.partition_index = model_utils.build_partition_index(
+            self.df, [STIMULUS_COL_TITLE, PARTICIPANT_FILENAME_COL_TITLE]
+        )
+        timestamps = self.df[TIMESTAMP_COL_TITLE].to_numpy()
+        self.partition_timestamps = model_utils.build_partition_timestamps(self.partition_index, timestamps)
+        self.partition_time_ranges = {
+            key: model_utils.get_time_range(timestamps[positions])
+            for key, positions in self.partition_index.items()
+        }
+        self.stimulus_participants = {}
+        for stimulus, participant_filename in self.partition_index.keys():
+            self.stimulus_participants.setdefault(stimulus, []).append(participant_filename)
+
+    def get_stimulus_time_range(self, stimulus: str, is_relative: bool = False) -> tuple:
+        """
+        Returns the earliest and latest timestamps of the
+        observations of the specified stimulus by any participant,
+        or, if relative, 0 and the longest time elapsed between the
+        first and last timestamps of a participant on the stimulus
+        :param stimulus: filename of the stimulus
+        :type stimulus: str
+        :param is_relative: whether the time range is relative to the
+            first timestamp of each participant on the stimulus
+        :type is_relative: bool
+        :return first and last timestamps (in milliseconds), each None
+            if no observation of the stimulus has a timestamp
+        :rtype tuple
+        """
+        time_ranges = [self.partition_time_ranges[(stimulus, participant_filename)]
+                       for participant_filename in self.get_stimulus_participants(stimulus)]
+        time_ranges = [time_range for time_range in time_ranges if time_range[0] is not None]
+        if len(time_ranges) == 0:
+            return None, None
+        if is_relative:
+            return 0, max(last - first for first, last in time_ranges)
+        return min(first for first, _ in time_ranges), max(last for _, last in time_ranges)
+
+    def get_stimulus_participants(self, stimulus: str) -> list:
+        """
+        Returns the filenames of the participants with
+        observations of the specified stimulus
+        :param stimulus: filename of the stimulus
+        :type stimulus: str
+        :return filenames of the participants
+        :rtype list
+        """
+        return list(self.stimulus_participants.get(stimulus, []))
+
+    def get_stimuli(self) -> list:
+        """
+        Returns the filenames of the stimuli
+        with observations in the data
+        :return filenames of the stimuli
+        :rtype list
+        """
+        return list(self.stimulus_participants.keys())
+
+    def get_media_positions(self) -> dict:
+        """
+        Returns the position of the stimulus image (media
+        position) in the observations of each stimulus by each
+        participant, i.e., its first specified X and Y
+        displacements, each None if unspecified
+        :return media position, keyed by (stimulus, participant filename)
+        :rtype dict
+        """
+        if self.participant_partitions is not None:
+            return {
+                (stimulus, participant_filename): tuple(partition['media_position'])
+                for participant_filename, partitions in self.participant_partitions.items()
+                for stimulus, partition in partitions.items()
+            }
+        displacement_cols = [
+            self.df[col_title].to_numpy() if col_title in self.df else None
+            for col_title in [STIMULUS_X_DISPLACEMENT_COL_TITLE, STIMULUS_Y_DISPLACEMENT_COL_TITLE]
+        ]
+        return {
+            key: tuple(
+                None if displacement_col is None else model_utils.get_first_valid_value(displacement_col[positions])
+                for displacement_col in displacement_cols
+            )
+            for key, positions in self.partition_index.items()
+        }
+
+    def get_selection_positions(self,
+                                stimulus: str,
+                                participant_filenames: list,
+                                partition_index: dict = None,
+                                partition_timestamps: dict = None,
+                                time_window: tuple = None) -> np.ndarray:
+        """
+        Returns the ascending positions within the data (or
+        the table of the specified partition index) of the
+        observations of the specified stimulus by the
+        specified participants within the specified time
+        window, whose bounds are found by binary search of
+        the sorted timestamps of each partition
+        :param stimulus: filename of the stimulus
+        :type stimulus: str
+        :param participant_filenames: filenames of the participants
+        :type participant_filenames: list
+        :param partition_index: partition index of the table, or
+            None for that of the data
+        :type partition_index: dict
+        :param partition_timestamps: sorted timestamps of the partitions
+            of the table, or None for those of the data
+        :type partition_timestamps: dict
+        :param time_window: None, or the start and end (in milliseconds)
+            of the time window and whether they are relative to the
+            first timestamp of each participant on the stimulus
+            (see model_utils.get_time_window_slice)
+        :type time_window: tuple
+        :return positions of the observations
+        :rtype np.ndarray
+        """
+        if partition_index is None:
+            partition_index = self.partition_index
+            partition_timestamps = self.partition_timestamps
+        keys = [(stimulus, participant_filename) for participant_filename in set(participant_filenames)
+                if (stimulus, participant_filename) in partition_index]
+        partitions = [partition_index[key] for key in keys]
+        if time_window is not None:
+            partitions = [
+                partition[model_utils.get_time_window_slice(
+                    partition_timestamps[key], time_window, self.partition_time_ranges.get(key, (None, None))[0]
+                )]
+                for key, partition in zip(keys, partitions)
+            ]
+            partitions = [partition for partition in partitions if partition.size > 0]
+        if len(partitions) == 0:
+            return np.empty(0, dtype=np.int64)
+        # partitions of different participants do not interleave,
+        # so ordering them by their first position keeps the
+        # concatenated positions ascending
+        partitions.sort(key=lambda partition: partition[0])
+        return np.concatenate(partitions)
+
+    def select(self,
+               stimulus: str,
+               participant_filenames: list,
+               validity_flags: int = 0,
+               time_window: tuple = None) -> pd.DataFrame:
+        """
+        Returns the observations of the specified stimulus
+        by the specified participants within the specified
+        time window with the specified validity flags set,
+        gathered from the precomputed partitions of the
+        data in a single pass
+        :param stimulus: filename of the stimulus
+        :type stimulus: str
+        :param participant_filenames: filenames of the participants
+        :type participant_filenames: list
+        :param validity_flags: bitwise OR of the required validity flags
+            (such as model_utils.GAZE_VALIDITY_FLAG), or 0 for every observation
+        :type validity_flags: int
+        :param time_window: None, or the time window of the observations
+            (see model_utils.get_time_window_slice)
+        :type time_window: tuple
+        :return selected data
+        :rtype pd.DataFrame
+        """
+        if self.participant_partitions is not None:
+            return self.read_selection(stimulus, participant_filenames, validity_flags, time_window)
+        positions = self.get_selection_positions(stimulus, participant_filenames, time_window=time_window)
+        if validity_flags != 0:
+            validity = self.df[VALIDITY_COL_TITLE].to_numpy()
+            positions = positions[(validity[positions] & validity_flags) == validity_flags]
+        return self.df.iloc[positions]
+
+    def select_fixations(self,
+                         stimulus: str,
+                         participant_filenames: list,
+                         time_window: tuple = None) -> pd.DataFrame:
+        """
+        Returns the fixations of the specified stimulus by the
+        specified participants starting within the specified
+        time window, gathered from the precomputed partitions
+        of the fixation table
+        :param stimulus: filename of the stimulus
+        :type stimulus: str
+        :param participant_filenames: filenames of the participants
+        :type participant_filenames: list
+        :param time_window: None, or the time window of the fixations
+            (see model_utils.get_time_window_slice)
+        :type time_window: tuple
+        :return selected fixations
+        :rtype pd.DataFrame
+        """
+        return self.fixation_df.iloc[
+            self.get_selection_positions(stimulus, participant_filenames, self.fixation_partition_index,
+                                         self.fixation_partition_timestamps, time_window)
+        ]
+
+    def read_selection(self,
+                       stimulus: str,
+                       participant_filenames: list,
+                       validity_flags: int = 0,
+                       time_window: tuple = None) -> pd.DataFrame:
+        """
+        Returns the observations of the specified stimulus
+        by the specified participants within the specified
+        time window with the specified validity flags set,
+        read on demand from the partitions of the on-disk
+        partition store
+        :param stimulus: filename of the stimulus
+        :type stimulus: str
+        :param participant_filenames: filenames of the participants
+        :type participant_filenames: list
+        :param validity_flags: bitwise OR of the required validity flags
+            (such as model_utils.GAZE_VALIDITY_FLAG), or 0 for every observation
+        :type validity_flags: int
+        :param time_window: None, or the time window of the observations
+            (see model_utils.get_time_window_slice)
+        :type time_window: tuple
+        :return selected data
+        :rtype pd.DataFrame
+        """
+        participant_filenames = set(participant_filenames)
+        keys = [(stimulus, participant_filename)
+                for participant_filename, partitions in self.participant_partitions.items()
+                if participant_filename in participant_filenames and stimulus in partitions]
+        partition_dfs = [
+            partition_store_utils.read_partition(
+                ingest_utils.get_participant_file_path(participant_filename),
+                stimulus,
+                self.participant_partitions[participant_filename][stimulus]
+            )
+            for _, participant_filename in keys
+        ]
+        if time_window is not None:
+            partition_dfs = [
+                partition_df.iloc[model_utils.get_time_window_slice(
+                    model_utils.get_sorted_timestamps(partition_df[TIMESTAMP_COL_TITLE].to_numpy()),
+                    time_window,
+                    self.partition_time_ranges[key][0]
+                )]
+                for key, partition_df in zip(keys, partition_dfs)
+            ]
+        if validity_flags != 0:
+            partition_dfs = [
+                partition_df.iloc[model_utils.get_valid_positions(partition_df, validity_flags)]
+                for partition_df in partition_dfs
+            ]
+        if len(partition_dfs) == 0:
+            return pd.DataFrame(columns=ingest_utils.INGEST_COL_TITLES + [PARTICIPANT_FILENAME_COL_TITLE,
+                                                                          VALIDITY_COL_TITLE])
+        return ingest_utils.concat_participant_dfs(partition_dfs)
+
+    @staticmethod
+    def import_participant_dfs(participant_filenames: list,
+                               signatures: dict = None,
+                               manifest: dict = None,
+                               use_parallel_ingest: bool = USE_PARALLEL_INGEST,
+                               num_workers: int = NUM_INGEST_WORKERS,
+                               progress_callback=None) -> tuple:
+        """
+        Imports the eye-tracking data of the specified
+        participants and their fixation tables, reloading
+        them from the on-disk cache if the data file is
+        unchanged and parsing (and then caching) them
+        otherwise; the data files that have to be parsed
+        are parsed concurrently unless parallel ingest
+        is turned off
+        :param participant_filenames: filenames of the participant data files
+        :type participant_filenames: list
+        :param signatures: signature of each participant data file,
+            or None to determine them here
+        :type signatures: dict
+        :param manifest: manifest of the cache, or None to bypass the cache
+        :type manifest: dict
+        :param use_parallel_ingest: whether to parse the data files concurrently
+        :type use_parallel_ingest: bool
+        :param num_workers: number of worker processes, or None
+            for one per available CPU
+        :type num_workers: int
+        :param progress_callback: None, or a function called with the
+            number of data files imported so far and the number of
+            data files to import as the data files are imported
+        :type progress_callback: callable
+        :return data and fixation table of each participant,
+            each keyed by participant filename
+        :rtype tuple
+        """
+        if manifest is not None and signatures is None:
+            signatures = ModelData.get_participant_signatures(participant_filenames)
+
+        participant_dfs = {}
+        participant_fixation_dfs = {}
+        unparsed_participant_filenames = []
+        for participant_filename in participant_filenames:
+            if manifest is not None:
+                cached_dfs = cache_utils.load_cached_dfs(
+                    ingest_utils.get_participant_file_path(participant_filename),
+                    signatures[participant_filename],
+                    manifest
+                )
+                if cached_dfs is not None and 'data' in cached_dfs and 'fixations' in cached_dfs:
+                    participant_dfs[participant_filename] = cached_dfs['data']
+                    participant_fixation_dfs[participant_filename] = cached_dfs['fixations']
+                    if progress_callback is not None:
+                        progress_callback(len(participant_dfs), len(participant_filenames))
+                    continue
+            unparsed_participant_filenames.append(participant_filename)
+
+        num_cached = len(participant_dfs)
+        parsed_participant_tables = ingest_utils.read_participant_files(
+            unparsed_participant_filenames,
+            use_parallel_ingest=use_parallel_ingest,
+            num_workers=num_workers,
+            progress_callback=None if progress_callback is None else
+            lambda num_parsed: progress_callback(num_cached + num_parsed, len(participant_filenames))
+        )
+        for participant_filename, (participant_df, participant_fixation_df) in \
+                zip(unparsed_participant_filenames, parsed_participant_tables):
+            participant_dfs[participant_filename] = participant_df
+            participant_fixation_dfs[participant_filename] = participant_fixation_df
+            if manifest is not None:
+                cache_utils.store_cached_dfs(
+                    ingest_utils.get_participant_file_path(participant_filename),
+                    signatures[participant_filename],
+                    {'data': participant_df, 'fixations': participant_fixation_df},
+                    manifest
+                )
+        return participant_dfs, participant_fixation_dfs
+
 
+import src.model.utils.cache_utils as cache_utils
+import src.model.utils.fixation_detection_utils as fixation_detection_utils
+import src.model.utils.fixation_utils as fixation_utils
+import src.model.utils.ingest_utils as ingest_utils
+import src.model.utils.model_utils as model_utils
+import src.model.utils.partition_store_utils as partition_store_utils
+import src.model.utils.shared_memory_utils as shared_memory_utils
 from src.model.model_participant_selection import ModelParticipantSelection
@@ -0,0 +1,121 @@
+"""
+Contains the class ModelMetrics
+
+MODULAR INTERNAL IMPORTS ARE AT THE BOTTOM OF THE FILE. THIS IS AN
+INTENTIONAL DESIGN CHOICE. IT HELPS AVOID CIRCULAR IMPORT ISSUES.
+IT IS ALSO OKAY TO AVOID THEM IN THIS MANNER BECAUSE THIS IS A
+HIGHLY MODULAR PROGRAM.
+"""
+
+# External imports
+import pandas as pd
+
+
+class ModelMetrics(object):
+    """
+    Contains the saccades derived from the fixation table, the
+    eye-movement metrics of each participant on each stimulus and
+    the metrics of each participant on each area of interest (AOI),
+    computed for the whole data at once
+    """
+    __instance = None
+
+    # fixation table the tables below were computed from,
+    # so that they are only recomputed once it changes
+    fixation_df = None
+    saccade_df: pd.DataFrame = None
+    metrics_df: pd.DataFrame = None
+    # fixation table and AOIs of the stimuli the AOI
+    # metrics table was computed from
+    aoi_fixation_df = None
+    aois = None
+    aoi_metrics_df: pd.DataFrame = None
+
+    def clear(self) -> None:
+        self.fixation_df = None
+        self.saccade_df = None
+        self.metrics_df = None
+        self.aoi_fixation_df = None
+        self.aois = None
+        self.aoi_metrics_df = None
+
+    def __init__(self):
+        if ModelMetrics.__instance is not None:
+            raise Exception("ModelMetrics should be treated as a singleton class.")
+        else:
+            ModelMetrics.__instance = self
+
+    @staticmethod
+    def get_instance():
+        """
+        Static method to access the singleton
+        instance for this class
+
+        :return: the singleton instance
+        :rtype: ModelMetrics
+        """
+        if ModelMetrics.__instance is None:
+            ModelMetrics()
+        return ModelMetrics.__instance
+
+    def compute(self) -> pd.DataFrame:
+        """
+        Derives the saccades between the fixations of every
+        participant (with their peak velocities, from the gaze
+        points of the data) and computes the metrics table from
+        the current fixation table, unless they were already
+        computed from it (i.e., neither the data nor the
+        fixation detection changed since)
+        :return: metrics table
+        :rtype: pd.DataFrame
+        """
+        model_data = ModelData.get_instance()
+        fixation_df = model_data.fixation_df
+        if fixation_df is None:
+            self.clear()
+            return pd.DataFrame(columns=metrics_utils.METRIC_COL_TITLES)
+        if fixation_df is not self.fixation_df:
+            self.saccade_df = metrics_utils.build_saccade_df(fixation_df, model_data.df)
+            self.metrics_df = metrics_utils.build_metrics_df(fixation_df, model_data.df)
+            self.fixation_df = fixation_df
+        return self.metrics_df
+
+    def compute_aoi(self) -> pd.DataFrame:
+        """
+        Computes the AOI metrics table from the current fixation
+        table and the AOIs of the stimuli, unless it was already
+        computed from them
+        :return: AOI metrics table
+        :rtype: pd.DataFrame
+        """
+        model_data = ModelData.get_instance()
+        aois = ModelStimulusRegistry.get_instance().aois
+        if model_data.fixation_df is None or not aois:
+            self.aoi_fixation_df, self.aois, self.aoi_metrics_df = None, None, None
+            return pd.DataFrame(columns=aoi_utils.AOI_METRIC_COL_TITLES)
+        if model_data.fixation_df is not self.aoi_fixation_df or aois is not self.aois:
+            self.aoi_metrics_df = aoi_utils.build_aoi_metrics_df(
+                model_data.fixation_df,
+                aois,
+                {key: time_range[0] for key, time_range in model_data.partition_time_ranges.items()}
+            )
+            self.aoi_fixation_df, self.aois = model_data.fixation_df, aois
+        return self.aoi_metrics_df
+
+    def export_csv(self, file_path: str, is_aoi: bool = False) -> None:
+        """
+        Writes the metrics table (or the AOI metrics table) to
+        the specified CSV file, computing it first if needed
+        :param file_path: path of the CSV file
+        :type file_path: str
+        :param is_aoi: whether to write the AOI metrics table
+        :type is_aoi: bool
+        """
+        metrics_df = self.compute_aoi() if is_aoi else self.compute()
+        metrics_df.to_csv(file_path, index=False)
+
+
+from src.model.model_data import ModelData
+from src.model.model_stimulus_registry import ModelStimulusRegistry
+from src.model.utils import aoi_utils
+from src.model.utils import metrics_utils
@@ -12,7 +12,6 @@ import glob
 import os
 
 from src.main.config import RELATIVE_DATA_DIR
-from src.main.config import STIMULUS_COL_TITLE
 
 
 class ModelParticipantSelection(object):
@@ -58,21 +57,22 @@ class ModelParticipantSelection(object):
         :return: all participants
         :rtype: list
         """
-        saved_wd = os.getcwd()
-        os.chdir(RELATIVE_DATA_DIR)
-        self.all_participants = glob.glob('*.{}'.format('tsv'))
+        # the working directory is left unchanged as
+        # the data may be imported on a background thread
+        self.all_participants = [
+            os.path.basename(participant_path)
+            for participant_path in glob.glob(os.path.join(glob.escape(RELATIVE_DATA_DIR), '*.{}'.format('tsv')))
+        ]
         self.all_participants = sorted(self.all_participants)
-        os.chdir(saved_wd)
         return self.all_participants
 
     def import_stimuli_filtered_participant_selection(self) -> list:
         if self.all_participants is None:
             self.import_all_participants()
 
-        df = ModelData.get_instance().df
-        df = df[df[STIMULUS_COL_TITLE] == ViewStimulusSelection.get_instance().get_selected()]
-
-        self.stimulus_filtered_participants = df['participant_filename'].unique()
+        self.stimulus_filtered_participants = ModelData.get_instance().get_stimulus_participants(
+            ViewStimulusSelection.get_instance().get_selected()
+        )
         return self.stimulus_filtered_participants
 
 
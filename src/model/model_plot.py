@@ -7,8 +7,7 @@ IT IS ALSO OKAY TO AVOID THEM IN THIS MANNER BECAUSE THIS IS A
 HIGHLY MODULAR PROGRAM.
 """
 
-import base64
-import os.path
+import sys
 import time
 import warnings
 from collections import defaultdict
@@ -16,22 +15,17 @@ from collections import defaultdict
 import _plotly_utils
 import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-from PIL import Image, ImageOps
-from numba.core.errors import NumbaWarning, NumbaDeprecationWarning, NumbaPendingDeprecationWarning
-from sklearn.cluster import DBSCAN
 
-from src.main.config import MAX_FIXATION_PT_SIZE, DEFAULT_EPS_VALUE, DEFAULT_MIN_SAMPLES_VALUE, MAKE_IMG_GRAYSCALE, \
+from src.main.config import MAX_FIXATION_PT_SIZE, DEFAULT_EPS_VALUE, DEFAULT_MIN_SAMPLES_VALUE, \
     DEFAULT_SUPPORT_THRESHOLD, DEFAULT_FORWARD_CONFIDENCE_THRESHOLD, DEFAULT_BACKWARD_CONFIDENCE_THRESHOLD, \
-    DEFAULT_NUM_MONTE_CARLO_TRIALS
+    DEFAULT_NUM_MONTE_CARLO_TRIALS, MONTE_CARLO_CHUNK_SIZE, MONTE_CARLO_SEED
+from src.main.config import FIXATION_DURATION_COL_TITLE
+from src.main.config import MAX_GAZE_PLOT_POINTS
+from src.main.config import USE_ANALYSIS_CACHE
+from src.main.config import WEIGH_FIXATION_CLUSTERS_BY_DURATION
 from src.main.config import PARTICIPANT_FILENAME_COL_TITLE
 from src.main.config import PARTICIPANT_NAME_COL_TITLE
-from src.main.config import RELATIVE_STIMULUS_IMAGE_DIR
-from src.main.config import STIMULUS_COL_TITLE
-from src.main.config import STIMULUS_X_DISPLACEMENT_COL_TITLE
-from src.main.config import STIMULUS_Y_DISPLACEMENT_COL_TITLE
-from src.main.config import TIMESTAMP_COL_TITLE
 from src.main.config import X_FIXATION_COL_TITLE
 from src.main.config import X_GAZE_COL_TITLE
 from src.main.config import Y_FIXATION_COL_TITLE
@@ -51,19 +45,40 @@ class ModelPlot(object):
     color = None
     size = None
     fixation_participant_identifiers = None
+    fixation_durations = None
+    num_gaze_points = None
+    num_plotted_gaze_points = None
     num_fixations = None
     num_fixations_in_cluster = None
     cluster_centroids = None
+    # cluster label of each clustered point and its position among
+    # all the points (see get_clustered_xy), i.e., its row in the
+    # filtered data, so that the labels are carried to the rows
+    # in order without looking the points up by their coordinates
+    cluster_labels = None
+    clustered_point_positions = None
+    # radius-neighbor graph of the last clustered points (see
+    # cluster_utils.build_neighbor_graph), built with the maximum
+    # eps of the eps range (see cluster_utils.get_neighbor_graph_radius)
+    # so that the points are re-clustered for any eps and min_samples
+    # within it without it; None if it would be too large to build
+    neighbor_graph = None
+    # OPTICS reachability ordering of the last points clustered with
+    # OPTICS (see cluster_utils.build_optics_ordering), built with the
+    # maximum eps of the eps range so that the clusters are extracted
+    # for any eps within it without running OPTICS again
+    optics_ordering = None
     cluster_sequences = None
     ord_assoc_rule_count = None
     cluster_id_count = None
+    # count of each ordinal association rule, indexed by its clusters
+    pair_counts = None
     support_vals = None
     forward_confidence_vals = None
     backward_confidence_vals = None
     sig_cluster_assoc_rule_arrows = None
     assoc_rule_p_values = None
 
-    stimulus_image = None
     x_len = None
     y_len = None
     x_shift = None
@@ -83,11 +98,15 @@ class ModelPlot(object):
     @staticmethod
     def _suppress_warnings() -> None:
         """
-        Suppress numba warnings
+        Suppress numba warnings, if numba has
+        been loaded (it is not loaded just for this)
         """
-        warnings.simplefilter('ignore', category=NumbaWarning)
-        warnings.simplefilter('ignore', category=NumbaDeprecationWarning)
-        warnings.simplefilter('ignore', category=NumbaPendingDeprecationWarning)
+        numba_errors = sys.modules.get('numba.core.errors')
+        if numba_errors is None:
+            return
+        warnings.simplefilter('ignore', category=numba_errors.NumbaWarning)
+        warnings.simplefilter('ignore', category=numba_errors.NumbaDeprecationWarning)
+        warnings.simplefilter('ignore', category=numba_errors.NumbaPendingDeprecationWarning)
 
     @staticmethod
     def get_instance():
@@ -169,11 +188,11 @@ class ModelPlot(object):
         :type color_col: list
         """
         if color_col is not None:
-            self.color = pd.Categorical(color_col)
+            self.color = pd.Categorical(color_col).remove_unused_categories()
         elif df is not None:
             color_col_name = PARTICIPANT_NAME_COL_TITLE
             color_col = df[color_col_name].copy(deep=True)
-            self.color = pd.Categorical(color_col)
+            self.color = pd.Categorical(color_col).remove_unused_categories()
         else:
             raise Exception("Parameters df and color_col cannot both be None.")
 
@@ -204,34 +223,35 @@ class ModelPlot(object):
         """
         self.fig_params_clear()
 
-        self.filtered_df = ModelData.get_instance().df
         selected_stimulus_filename = ViewStimulusSelection.get_instance().get_selected()
+        selected_participants = ModelParticipantSelection.get_instance().get_selected_participants()
 
-        self.filtered_df = self.filtered_df[self.filtered_df[STIMULUS_COL_TITLE] == selected_stimulus_filename]
-        self.filtered_df = self.filtered_df[self.filtered_df[PARTICIPANT_FILENAME_COL_TITLE].isin(
-            ModelParticipantSelection.get_instance().get_selected_participants()
-        )]
+        data_type_selection = ViewDataTypeSelection.get_instance().get_selected()
+        analysis_type_selection = ViewAnalysisTypeSelection.get_instance().get_selected()
+        time_window = self.get_time_window()
 
         self.extract_and_set_stimulus_params(
-            selected_stimulus_filename=selected_stimulus_filename, df=self.filtered_df
+            selected_stimulus_filename=selected_stimulus_filename, participant_filenames=selected_participants
         )
 
-        data_type_selection = ViewDataTypeSelection.get_instance().get_selected()
-        analysis_type_selection = ViewAnalysisTypeSelection.get_instance().get_selected()
-
         if data_type_selection == "Fixation Data":
-            self.filtered_df = model_utils.remove_incomplete_observations(
-                self.filtered_df,
-                [TIMESTAMP_COL_TITLE, X_FIXATION_COL_TITLE, Y_FIXATION_COL_TITLE, PARTICIPANT_FILENAME_COL_TITLE]
+            # fixations are derived once, when the data is imported
+            self.filtered_df = ModelData.get_instance().select_fixations(
+                selected_stimulus_filename, selected_participants, time_window
             )
             self.set_fixation_params(df=self.filtered_df)
         else:
-            self.filtered_df = model_utils.remove_incomplete_observations(
-                self.filtered_df,
-                [TIMESTAMP_COL_TITLE, X_GAZE_COL_TITLE, Y_GAZE_COL_TITLE, PARTICIPANT_FILENAME_COL_TITLE]
+            # only the observations that can be plotted
+            # as gaze data are gathered from the data
+            self.filtered_df = ModelData.get_instance().select(
+                selected_stimulus_filename, selected_participants, model_utils.GAZE_VALIDITY_FLAG, time_window
             )
+            if analysis_type_selection in ["Scatter Plot", "Line Plot"]:
+                self.filtered_df = self.downsample_gaze_df(self.filtered_df, analysis_type_selection)
             self.set_gaze_params(df=self.filtered_df)
 
+        import plotly.express as px  # imported on first use to speed up startup
+
         if analysis_type_selection == "Scatter Plot":
             self.fig = px.scatter(
                 x=self.x,
@@ -245,6 +265,8 @@ class ModelPlot(object):
                 y=self.y,
                 color=self.color
             )
+        if data_type_selection == "Gaze Data" and analysis_type_selection in ["Scatter Plot", "Line Plot"]:
+            self.add_downsampling_indicator()
         if analysis_type_selection == "Heat Map":
             self.fig = go.Figure(
                 go.Histogram2dContour(
@@ -260,9 +282,14 @@ class ModelPlot(object):
                 visible=False,
                 selector=dict(type='contour')
             )
-        # "Cluster":
-        if analysis_type_selection == "Cluster":
-            self.perform_dbscan_clustering()
+        # "Cluster", "OPTICS Cluster" or "Grid Cluster":
+        if analysis_type_selection in ["Cluster", "OPTICS Cluster", "Grid Cluster"]:
+            if analysis_type_selection == "OPTICS Cluster":
+                self.perform_optics_clustering()
+            elif analysis_type_selection == "Grid Cluster":
+                self.perform_grid_dbscan_clustering()
+            else:
+                self.perform_dbscan_clustering()
             self.fig = px.scatter(
                 x=self.x,
                 y=self.y,
@@ -286,17 +313,35 @@ class ModelPlot(object):
             ))
             # self.run_monte_carlo_stimulation()
             # print(self.fig)
-
-        img_path_str = RELATIVE_STIMULUS_IMAGE_DIR + "/" + selected_stimulus_filename
-
-        img_bmp = Image.open(os.path.abspath(img_path_str))
-        img_bmp = ImageOps.grayscale(img_bmp) if MAKE_IMG_GRAYSCALE else img_bmp
-        img_bmp.save(os.path.abspath(img_path_str + ".png"))
-        enc_img = base64.b64encode(open(img_path_str + ".png", 'rb').read())
+        if analysis_type_selection == "AOI":
+            self.perform_aoi_hit_testing(selected_stimulus_filename)
+            self.fig = px.scatter(
+                x=self.x,
+                y=self.y,
+                color=self.color
+            )
+            self.add_aoi_shapes(selected_stimulus_filename)
+            self.find_label_sequences(np.asarray(self.color, dtype=np.int64),
+                                      self.get_point_participants(data_type_selection))
+            self.add_arrow_cluster_seq_if_one_participant()  # runs if one participant
+            self.ordinal_association_rule_mining()  # find num sequences each AOI and each association rule is in
+            self.compute_support_vals()
+            self.compute_confidence_vals()  # both forward and backward confidence vals
+            self.add_arrows_sig_cluster_assoc_rules()  # runs if more than one participant
+            self.fig.add_trace(go.Indicator(  # % Fixations in AOIs indicator
+                domain={'x': [0.07, 0.15], 'y': [0.9, 0.95]},
+                value=round((self.num_fixations_in_cluster / self.num_fixations) * 100, 2)
+                if self.num_fixations > 0 else 0,
+                number={"suffix": "%", "font": {"size": 10, "color": "black"}},
+                mode="gauge+number",
+                gauge={"axis": {"range": [None, 100], "showticklabels": False}},
+                title={'text': "Fixations in AOIs" if data_type_selection == "Fixation Data"
+                       else "Gaze Points in AOIs", "font": {"size": 10, "color": "black"}}
+            ))
 
         self.fig.add_layout_image(
             dict(
-                source="data:image/png;base64,{}".format(enc_img.decode()),
+                source=ModelStimulusRegistry.get_instance().get_encoded_img(selected_stimulus_filename),
                 xref="x",
                 yref="y",
                 x=self.x_shift,
@@ -324,7 +369,7 @@ class ModelPlot(object):
             autorange="reversed"
         )
 
-        if analysis_type_selection == "Cluster":
+        if analysis_type_selection in ["Cluster", "OPTICS Cluster", "Grid Cluster", "AOI"]:
             for i in range(len(self.fig.data)):  # ensure outliers are deselected by default
                 try:  # if inspecting a cluster of points within the figure object
                     if self.fig.data[i]['legendgroup'] == '-1':
@@ -334,6 +379,51 @@ class ModelPlot(object):
 
         return self.fig
 
+    def downsample_gaze_df(self, df: pd.DataFrame, analysis_type_selection: str) -> pd.DataFrame:
+        """
+        Returns the gaze points of the specified eye-tracking data
+        downsampled to the configured point budget, shared between
+        the participants: line plots keep the points that preserve
+        the shape of each participant's gaze path (LTTB), and
+        scatter plots keep one point per occupied area (spatial
+        thinning); also records the number of gaze points
+        before and after downsampling
+        :param df: gaze points of the eye-tracking data being analyzed
+        :type df: pd.DataFrame
+        :param analysis_type_selection: "Scatter Plot" or "Line Plot"
+        :type analysis_type_selection: str
+        :return: downsampled gaze points
+        :rtype: pd.DataFrame
+        """
+        self.num_gaze_points = len(df.index)
+        if MAX_GAZE_PLOT_POINTS is not None and self.num_gaze_points > MAX_GAZE_PLOT_POINTS:
+            df = df.iloc[downsampling_utils.downsample_groups(
+                df[X_GAZE_COL_TITLE].to_numpy(),
+                df[Y_GAZE_COL_TITLE].to_numpy(),
+                pd.factorize(df[PARTICIPANT_FILENAME_COL_TITLE])[0],
+                MAX_GAZE_PLOT_POINTS,
+                downsampling_utils.LTTB_METHOD if analysis_type_selection == "Line Plot"
+                else downsampling_utils.SPATIAL_THINNING_METHOD
+            )]
+        self.num_plotted_gaze_points = len(df.index)
+        return df
+
+    def add_downsampling_indicator(self) -> None:
+        """
+        Adds an indicator of the percentage of the gaze
+        points plotted to the figure, if they were downsampled
+        """
+        if self.num_plotted_gaze_points == self.num_gaze_points:
+            return
+        self.fig.add_trace(go.Indicator(  # % Gaze Points Plotted indicator
+            domain={'x': [0.07, 0.15], 'y': [0.9, 0.95]},
+            value=round((self.num_plotted_gaze_points / self.num_gaze_points) * 100, 2),
+            number={"suffix": "%", "font": {"size": 10, "color": "black"}},
+            mode="number",
+            title={'text': "Gaze Points Plotted ({} of {})".format(
+                self.num_plotted_gaze_points, self.num_gaze_points), "font": {"size": 10, "color": "black"}}
+        ))
+
     def set_fixation_params(self,
                             df: pd.DataFrame,
                             max_point_size: int = MAX_FIXATION_PT_SIZE) -> None:
@@ -342,139 +432,16 @@ class ModelPlot(object):
         fixation_durations of the fixations being plotted, which, in turn, are proportional to
         how long a fixation has been looked at (for a particular participant)
 
-        :param df: DataFrame containing fixations within eye-tracking data
-            currently being analyzed
+        :param df: fixation table of the fixations currently being analyzed
         :type df: pd.DataFrame
         :param max_point_size: size of the longest fixation point in the plot
         :type max_point_size: int
         """
-        # data being analyzed
-        timestamps = df[TIMESTAMP_COL_TITLE].to_numpy()
-        x_coord_fixation_points = df[X_FIXATION_COL_TITLE].to_numpy()
-        y_coord_fixation_points = df[Y_FIXATION_COL_TITLE].to_numpy()
-        participant_identifiers = df[PARTICIPANT_NAME_COL_TITLE].to_numpy()
-
-        fixation_x_coords = np.empty(shape=x_coord_fixation_points.size, dtype=np.float)
-        fixation_x_coords_curr_index = 0
-        fixation_y_coords = np.empty(shape=y_coord_fixation_points.size, dtype=np.float)
-        fixation_y_coords_curr_index = 0
-        fixation_durations = np.empty(shape=timestamps.size, dtype=np.float)
-        fixation_durations_curr_index = 0
-        fixation_point_sizes = np.empty(shape=timestamps.size, dtype=np.float)
-        # fixation_point_sizes_curr_index not needed; taken care of at end
-        # when fixation durations are mapped to fixation point sizes
-        fixation_participant_identifiers = np.empty(shape=participant_identifiers.size, dtype=object)
-        fixation_participant_identifiers_curr_index = 0
-
-        # always rolling variables
-        prev_participant_identifier = ''
-        prev_fixation_timestamp = 0
-
-        # per fixation variables
-        is_analyzing_fixation = False
-        curr_fixation_duration = 0
-        curr_fixation_x_coord = -1
-        curr_fixation_y_coord = -1
-        # noinspection PyUnusedLocal
-        curr_fixation_participant_identifier = None
-
-        # per fixation booleans
-        # (determining whether to continue analysis of current fixation)
-        # noinspection PyUnusedLocal
-        is_curr_x_coord_same_as_prev_x_coord = False
-        # noinspection PyUnusedLocal
-        is_curr_y_coord_same_as_prev_y_coord = False
-        # noinspection PyUnusedLocal
-        is_curr_participant_identifier_same_as_prev_participant_identifier = False
-        # noinspection PyUnusedLocal
-        is_curr_x_coord_nan = False
-        # noinspection PyUnusedLocal
-        is_curr_y_coord_nan = False
-
-        for fixation_index in range(len(df.index)):
-            # assessing if fixation is currently being iterated through
-            if is_analyzing_fixation:
-                # defining conditions for continuing to iterate through fixation
-                # that is being analyzed
-                is_curr_x_coord_same_as_prev_x_coord = \
-                    x_coord_fixation_points[fixation_index] == curr_fixation_x_coord
-                is_curr_y_coord_same_as_prev_y_coord = \
-                    y_coord_fixation_points[fixation_index] == curr_fixation_y_coord
-                is_curr_participant_identifier_same_as_prev_participant_identifier = \
-                    participant_identifiers[fixation_index] == prev_participant_identifier
-                if (is_curr_x_coord_same_as_prev_x_coord and
-                        is_curr_y_coord_same_as_prev_y_coord and
-                        is_curr_participant_identifier_same_as_prev_participant_identifier):
-                    curr_fixation_duration += timestamps[fixation_index] - prev_fixation_timestamp
-                else:  # finished analyzing current fixation
-                    # add size of fixation to resulting list
-                    fixation_durations[fixation_durations_curr_index] = curr_fixation_duration
-                    fixation_durations_curr_index += 1
-                    # reset variables related to
-                    # analysis of the current fixation
-                    curr_fixation_duration = 0
-                    curr_fixation_x_coord = -1
-                    curr_fixation_y_coord = -1
-                    is_analyzing_fixation = False
-            else:
-                # if not currently analyzing fixation and if
-                # the fixation coordinates in the current row
-                # are not nan, then start a new iterative fixation
-                # size calculation
-                is_curr_x_coord_nan = np.isnan(float(x_coord_fixation_points[fixation_index]))
-                is_curr_y_coord_nan = np.isnan(float(y_coord_fixation_points[fixation_index]))
-                if (not is_curr_x_coord_nan and
-                        not is_curr_y_coord_nan):
-                    is_analyzing_fixation = True
-                    curr_fixation_x_coord = float(x_coord_fixation_points[fixation_index])
-                    curr_fixation_y_coord = float(y_coord_fixation_points[fixation_index])
-                    curr_fixation_participant_identifier = participant_identifiers[fixation_index]
-
-                    fixation_x_coords[fixation_x_coords_curr_index] = curr_fixation_x_coord
-                    fixation_x_coords_curr_index += 1
-                    fixation_y_coords[fixation_y_coords_curr_index] = curr_fixation_y_coord
-                    fixation_y_coords_curr_index += 1
-                    fixation_participant_identifiers[fixation_participant_identifiers_curr_index] = \
-                        curr_fixation_participant_identifier
-                    fixation_participant_identifiers_curr_index += 1
-
-            prev_fixation_timestamp = timestamps[fixation_index]
-            prev_participant_identifier = participant_identifiers[fixation_index]
-
-        if is_analyzing_fixation:
-            fixation_durations[fixation_durations_curr_index] = curr_fixation_duration
-            fixation_durations_curr_index += 1
-
-        # scaling for maximum size
-        max_fixation_duration = np.amax(fixation_durations)
-        for i in range(fixation_durations.size):
-            fixation_point_sizes[i] = (float(fixation_durations[i]) / float(max_fixation_duration)) * max_point_size
-
-        xy = pd.concat(
-            [
-                pd.DataFrame(fixation_x_coords),
-                pd.DataFrame(fixation_y_coords)
-            ],
-            axis=1,
-            copy=False
-        )
-        xy.dropna(inplace=True)
-
-        fixation_x_coords = xy.iloc[:, 0].to_numpy()
-        fixation_y_coords = xy.iloc[:, 1].to_numpy()
-
-        for i in range(fixation_x_coords.size):
-            fixation_x_coords[i] += self.x_shift
-
-        for j in range(fixation_y_coords.size):
-            fixation_y_coords[j] += self.y_shift
-
-        fixation_x_coords = fixation_x_coords[:(fixation_x_coords_curr_index + 1)]
-        fixation_y_coords = fixation_y_coords[:(fixation_y_coords_curr_index + 1)]
-        fixation_participant_identifiers = fixation_participant_identifiers[
-                                           :(fixation_participant_identifiers_curr_index + 1)
-                                           ]
-        fixation_point_sizes = fixation_point_sizes[:(fixation_durations_curr_index + 1)]
+        fixation_durations = df[FIXATION_DURATION_COL_TITLE].to_numpy(dtype=np.float64)
+        fixation_x_coords = df[X_FIXATION_COL_TITLE].to_numpy(dtype=np.float64) + self.x_shift
+        fixation_y_coords = df[Y_FIXATION_COL_TITLE].to_numpy(dtype=np.float64) + self.y_shift
+        fixation_participant_identifiers = df[PARTICIPANT_NAME_COL_TITLE].to_numpy()
+        fixation_point_sizes = fixation_utils.scale_point_sizes(fixation_durations, max_point_size)
 
         # noinspection PyTypeChecker
         self.set_x(df=df, x_col=pd.Series(fixation_x_coords))
@@ -485,6 +452,7 @@ class ModelPlot(object):
         # noinspection PyTypeChecker
         self.set_size(size_col=pd.Series(fixation_point_sizes))
         self.fixation_participant_identifiers = pd.Series(fixation_participant_identifiers)
+        self.fixation_durations = pd.Series(fixation_durations)
 
     @staticmethod
     def get_eps_value() -> int:
@@ -526,22 +494,188 @@ class ModelPlot(object):
             min_samples_value = ViewPlot.get_instance().min_samples_curr_input.value()
         return min_samples_value
 
+    @staticmethod
+    def get_time_window() -> tuple:
+        """
+        Returns the selected time window, i.e., its start and
+        end (in milliseconds) and whether they are relative to
+        each participant's first observation of the stimulus,
+        or None if no time window is selected
+        :return: time window (see model_utils.get_time_window_slice)
+        :rtype: tuple
+        """
+        if not ViewPlot.get_instance().time_window_checkbox.isChecked():
+            return None
+        return (
+            ViewPlot.get_instance().time_window_start_input.value(),
+            ViewPlot.get_instance().time_window_end_input.value(),
+            ViewPlot.get_instance().time_window_relative_checkbox.isChecked()
+        )
+
     def perform_dbscan_clustering(self) -> None:
         """
         Performs clustering on the x and y attributes,
         removing any x, y pairs that have either value
         missing from their respective attributes, and
         sets the color of the points based upon
-        the cluster in which OPTICS assigns them to
+        the cluster in which DBSCAN assigns them to; the
+        duplicate points are clustered once, as a unique
+        point weighing as much as they do together, the
+        neighbors of the unique points are searched for once,
+        up to the maximum eps of the eps range (or as close to
+        it as MAX_NEIGHBOR_GRAPH_EDGES allows, clustering on a
+        grid instead if not even up to the eps), and reused as
+        long as the points and the eps range allow it, and the
+        labels are loaded from the analysis cache if the
+        same points were clustered the same way before
+        """
+
+        xy = self.get_clustered_xy()
+
+        eps = ModelPlot.get_eps_value()
+        min_samples = ModelPlot.get_min_samples_value()
+        xy_coords = xy.to_numpy(dtype=np.float64)
+        weights = self.get_cluster_weights()
+        cache_key = self.get_analysis_cache_key([xy_coords] if weights is None else [xy_coords, weights],
+                                                eps=eps, min_samples=min_samples)
+        cached_result = analysis_cache_utils.load_analysis_result(cache_key) if USE_ANALYSIS_CACHE else None
+        if cached_result is not None:
+            self.set_cluster_params(xy, cached_result['labels'])
+            return
+
+        unique_xy, unique_weights, point_codes = cluster_utils.collapse_duplicate_points(xy_coords, weights)
+        if not cluster_utils.is_neighbor_graph_reusable(self.neighbor_graph, unique_xy, eps):
+            self._suppress_warnings()
+            radius = cluster_utils.get_neighbor_graph_radius(
+                unique_xy, eps, max(eps, ViewPlot.get_instance().eps_input_max.value())
+            )
+            self.neighbor_graph = None if radius is None else cluster_utils.build_neighbor_graph(unique_xy, radius)
+        if self.neighbor_graph is None:
+            labels = cluster_utils.get_grid_dbscan_labels(unique_xy, eps, min_samples, unique_weights)[point_codes]
+        else:
+            labels = cluster_utils.get_dbscan_labels(self.neighbor_graph, eps, min_samples, unique_weights)[point_codes]
+        if USE_ANALYSIS_CACHE:
+            analysis_cache_utils.store_analysis_result(cache_key, {'labels': labels})
+        self.set_cluster_params(xy, labels)
+
+    def perform_optics_clustering(self) -> None:
         """
+        Performs clustering on the x and y attributes,
+        removing any x, y pairs that have either value
+        missing from their respective attributes, and
+        sets the color of the points based upon the
+        cluster extracted for the eps from their OPTICS
+        reachability ordering; OPTICS runs once, up to the
+        maximum eps of the eps range, and the ordering is
+        reused as long as the points, the min_samples and
+        the eps range allow it (and loaded from the analysis
+        cache if it was built before)
+        """
+        xy = self.get_clustered_xy()
+
+        eps = ModelPlot.get_eps_value()
+        min_samples = ModelPlot.get_min_samples_value()
+        xy_coords = xy.to_numpy(dtype=np.float64)
+        if not cluster_utils.is_optics_ordering_reusable(self.optics_ordering, xy_coords, eps, min_samples):
+            max_eps = max(eps, ViewPlot.get_instance().eps_input_max.value())
+            cache_key = self.get_analysis_cache_key([xy_coords], min_samples=min_samples, max_eps=max_eps)
+            cached_result = analysis_cache_utils.load_analysis_result(cache_key) if USE_ANALYSIS_CACHE else None
+            if cached_result is not None:
+                self.optics_ordering = dict(cached_result, xy=xy_coords)
+            else:
+                self._suppress_warnings()
+                self.optics_ordering = cluster_utils.build_optics_ordering(xy_coords, min_samples, max_eps)
+                if USE_ANALYSIS_CACHE:
+                    analysis_cache_utils.store_analysis_result(cache_key, {
+                        name: value for name, value in self.optics_ordering.items() if name != 'xy'
+                    })
+        self.set_cluster_params(xy, cluster_utils.get_optics_dbscan_labels(self.optics_ordering, eps))
+
+    def perform_grid_dbscan_clustering(self) -> None:
+        """
+        Performs clustering on the x and y attributes,
+        removing any x, y pairs that have either value
+        missing from their respective attributes, and
+        sets the color of the points based upon the
+        cluster in which DBSCAN assigns them to, found on
+        a grid of cells instead of from the neighbors of
+        each point, which scales to the raw gaze points of
+        whole studies (the labels are the same); the duplicate
+        points are clustered once, as a unique point weighing
+        as much as they do together
+        """
+        xy = self.get_clustered_xy()
+
+        unique_xy, unique_weights, point_codes = cluster_utils.collapse_duplicate_points(
+            xy.to_numpy(dtype=np.float64), self.get_cluster_weights()
+        )
+        labels = cluster_utils.get_grid_dbscan_labels(
+            unique_xy, ModelPlot.get_eps_value(), ModelPlot.get_min_samples_value(), unique_weights
+        )[point_codes]
+        self.set_cluster_params(xy, labels)
 
+    def get_clustered_xy(self) -> pd.DataFrame:
+        """
+        Returns the x and y of the points to cluster, i.e.,
+        those with neither value missing, and sets the
+        position of each of them among all the points, by
+        which their cluster labels are carried back to the
+        points (see find_cluster_sequences)
+        :return: x and y of each point to cluster
+        :rtype: pd.DataFrame
+        """
         xy = pd.concat([self.x, self.y], axis=1)
-        xy = xy.dropna()
+        is_clustered = xy.notna().all(axis=1).to_numpy()
+        self.clustered_point_positions = np.flatnonzero(is_clustered)
+        return xy[is_clustered]
+
+    def get_cluster_weights(self) -> np.ndarray:
+        """
+        Returns the weight of each point to cluster with
+        DBSCAN (see get_clustered_xy): the duration of each
+        fixation relative to the mean duration if the
+        fixations are weighed by duration, or None if
+        each point weighs 1
+        :return: weight of each point, or None
+        :rtype: np.ndarray
+        """
+        if not WEIGH_FIXATION_CLUSTERS_BY_DURATION or self.clustered_point_positions.size == 0 or \
+                ViewDataTypeSelection.get_instance().get_selected() != "Fixation Data":
+            return None
+        durations = self.fixation_durations.to_numpy(dtype=np.float64)[self.clustered_point_positions]
+        return durations / durations.mean()
+
+    @staticmethod
+    def get_analysis_cache_key(arrays: list, **params) -> str:
+        """
+        Returns the key of the result of the analysis of the
+        specified arrays with the specified parameters, under
+        the selected data type and analysis type, in the
+        analysis cache (see analysis_cache_utils.get_analysis_key)
+        :param arrays: input arrays of the analysis
+        :type arrays: list
+        :param params: parameters of the analysis
+        :type params: dict
+        :return: key of the result
+        :rtype: str
+        """
+        return analysis_cache_utils.get_analysis_key(arrays, dict(
+            params,
+            data_type=ViewDataTypeSelection.get_instance().get_selected(),
+            analysis_type=ViewAnalysisTypeSelection.get_instance().get_selected()
+        ))
 
-        optics_clustering = DBSCAN(eps=ModelPlot.get_eps_value(),
-                                   min_samples=ModelPlot.get_min_samples_value(),
-                                   n_jobs=-1).fit(xy)
-        labels = optics_clustering.labels_
+    def set_cluster_params(self, xy: pd.DataFrame, labels: np.ndarray) -> None:
+        """
+        Sets the x, y and color attributes to the
+        specified clustered points and their cluster
+        labels, and counts the points in a cluster
+        :param xy: x and y of each clustered point
+        :type xy: pd.DataFrame
+        :param labels: cluster label of each point (-1 if noise)
+        :type labels: np.ndarray
+        """
+        self.cluster_labels = labels
         self.num_fixations = labels.size
         self.num_fixations_in_cluster = np.count_nonzero(labels != -1)
 
@@ -550,6 +684,49 @@ class ModelPlot(object):
         self.set_y(y_col=xy.iloc[:, 1].tolist())
         self.set_color(color_col=labels)
 
+    def build_reachability_fig(self) -> go.Figure:
+        """
+        Returns the reachability plot of the points last
+        clustered with OPTICS: the reachability distance of
+        each point in the OPTICS ordering, colored by cluster,
+        with the current eps as a dashed line, so that the eps
+        can be read off the valleys (the clusters) it cuts;
+        the points not reachable within the maximum eps are gaps
+        :return: reachability plot
+        :rtype: go.Figure
+        """
+        import plotly.express as px  # imported on first use to speed up startup
+
+        fig = go.Figure()
+        if self.optics_ordering is None:
+            return fig
+        ordering = self.optics_ordering['ordering']
+        reachability = self.optics_ordering['reachability'][ordering]
+        reachability = np.where(np.isinf(reachability), np.nan, reachability)
+        labels = cluster_utils.get_optics_dbscan_labels(self.optics_ordering, ModelPlot.get_eps_value())[ordering]
+        palette = px.colors.qualitative.Plotly
+        is_noise = labels == -1
+        fig.add_trace(go.Scatter(
+            x=np.flatnonzero(is_noise), y=reachability[is_noise],
+            mode='markers', marker=dict(size=3, color='lightgray'), name="Noise"
+        ))
+        fig.add_trace(go.Scatter(
+            x=np.flatnonzero(~is_noise), y=reachability[~is_noise],
+            mode='markers', marker=dict(size=3, color=[palette[label % len(palette)] for label in labels[~is_noise]]),
+            text=labels[~is_noise], hovertemplate="Cluster %{text}<br>Reachability %{y:.1f}", name="Clustered"
+        ))
+        fig.add_hline(y=ModelPlot.get_eps_value(), line_dash='dash',
+                      annotation_text="eps = {}".format(ModelPlot.get_eps_value()))
+        fig.update_layout(
+            title="OPTICS Reachability (min_samples = {}, max eps = {})".format(
+                self.optics_ordering['min_samples'], self.optics_ordering['max_eps']),
+            xaxis_title="OPTICS Ordering",
+            yaxis_title="Reachability Distance (px)",
+            yaxis_rangemode='tozero',
+            showlegend=False
+        )
+        return fig
+
     def add_cluster_labels(self) -> None:
         cluster_data = {'x': self.x, 'y': self.y, 'color': self.color}
         cluster_df = pd.DataFrame(data=cluster_data)
@@ -573,39 +750,112 @@ class ModelPlot(object):
                     showarrow=False
                 )
 
-    def find_cluster_sequences(self, data_type_selection: str) -> None:
-        self.cluster_sequences = defaultdict(list)
+    def perform_aoi_hit_testing(self, stimulus: str) -> None:
+        """
+        Sets the color of the points based upon the area of
+        interest (AOI) of the specified stimulus they are in
+        (-1 if none), hit-testing all of them at once, and
+        sets the centers of the AOIs as the centroids the
+        association rule arrows point to
+        :param stimulus: filename of the stimulus
+        :type stimulus: str
+        """
+        aois = ModelStimulusRegistry.get_instance().get_aois(stimulus)
+        # AOIs are in the pixel coordinates of the stimulus image
+        labels = aoi_utils.get_aoi_labels(np.asarray(self.x, dtype=np.float64) - self.x_shift,
+                                          np.asarray(self.y, dtype=np.float64) - self.y_shift, aois)
+        self.num_fixations = labels.size
+        self.num_fixations_in_cluster = np.count_nonzero(labels != -1)
+        self.set_color(color_col=labels)
+        self.cluster_centroids = pd.DataFrame(aoi_utils.get_aoi_centers(aois) + [self.x_shift, self.y_shift],
+                                              columns=['x', 'y'])
 
-        cluster_df = pd.DataFrame(data={'x': self.x, 'y': self.y, 'color': self.color})
+    def add_aoi_shapes(self, stimulus: str) -> None:
+        """
+        Outlines each area of interest of the specified
+        stimulus and labels it with its label and name
+        :param stimulus: filename of the stimulus
+        :type stimulus: str
+        """
+        aois = ModelStimulusRegistry.get_instance().get_aois(stimulus)
+        for label, aoi in enumerate(aois):
+            vertices = aoi['vertices'] + [self.x_shift, self.y_shift]
+            self.fig.add_shape(
+                type="path",
+                path="M " + " L ".join("{},{}".format(x, y) for x, y in vertices) + " Z",
+                xref="x",
+                yref="y",
+                line=dict(color="#EE4B2B", width=2)
+            )
+            self.fig.add_annotation(
+                x=self.cluster_centroids['x'].loc[label],
+                y=self.cluster_centroids['y'].loc[label],
+                xref="x",
+                yref="y",
+                text="{}: {}".format(label, aoi['name']),
+                font=dict(
+                    family="Courier New, monospace",
+                    size=16,
+                    color="#ffffff"
+                ),
+                bgcolor="#EE4B2B",
+                opacity=0.5,
+                xanchor='center',
+                showarrow=False
+            )
 
-        df_all: pd.DataFrame = None
+    def get_point_participants(self, data_type_selection: str) -> pd.Series:
+        """
+        Returns the participant of each plotted point, i.e.,
+        its participant name for fixation data and its
+        participant filename for gaze data
+        :param data_type_selection: "Gaze Data" or "Fixation Data"
+        :type data_type_selection: str
+        :return: participant of each point
+        :rtype: pd.Series
+        """
         if data_type_selection == "Fixation Data":
-            df_all = pd.DataFrame({
-                'x': self.x,
-                'y': self.y,
-                'participant': self.fixation_participant_identifiers
-            })
-        else:
-            df_all = pd.DataFrame({
-                'x': self.filtered_df[X_GAZE_COL_TITLE],
-                'y': self.filtered_df[Y_GAZE_COL_TITLE],
-                'participant': self.filtered_df['participant_filename']
-            })
-
-        participants = df_all['participant'].unique()
-        for participant in participants:
-            df_participant = df_all[df_all['participant'] == participant]
-            for index, point in df_participant.iterrows():
-                point_label = int(
-                    cluster_df[(cluster_df['x'] == point['x']) & (cluster_df['y'] == point['y'])].iloc[0]['color']
-                )
-                if point_label == -1:
-                    continue
-                elif len(self.cluster_sequences[participant]) == 0:  # self.cluster_sequences[participant]
-                    # is the cluster sequence of a given participant
-                    self.cluster_sequences[participant].append(point_label)
-                elif self.cluster_sequences[participant][-1] != point_label:
-                    self.cluster_sequences[participant].append(point_label)
+            return self.fixation_participant_identifiers
+        return self.filtered_df[PARTICIPANT_FILENAME_COL_TITLE]
+
+    def find_cluster_sequences(self, data_type_selection: str) -> None:
+        """
+        Finds the cluster sequence of each participant (see
+        find_label_sequences); each clustered point carries
+        its cluster label back to its position among the
+        points, which are ordered by participant and time,
+        and the points that were not clustered are noise
+        :param data_type_selection: "Gaze Data" or "Fixation Data"
+        :type data_type_selection: str
+        """
+        point_participants = self.get_point_participants(data_type_selection)
+        point_labels = np.full(len(point_participants), -1, dtype=np.int64)
+        point_labels[self.clustered_point_positions] = self.cluster_labels
+        self.find_label_sequences(point_labels, point_participants)
+
+    def find_label_sequences(self, point_labels: np.ndarray, point_participants: pd.Series) -> None:
+        """
+        Finds the sequence of each participant, i.e., the labels
+        (clusters or AOIs) of their points, in order, without the
+        points labeled -1 and with each run of points with the same
+        label collapsed to one label; the sequences of all the
+        participants are collapsed at once by a compiled kernel
+        :param point_labels: label of each point
+        :type point_labels: np.ndarray
+        :param point_participants: participant of each point
+        :type point_participants: pd.Series
+        """
+        self.cluster_sequences = defaultdict(list)
+        # participants are numbered in the order of their first point
+        participant_codes, participants = pd.factorize(point_participants)
+        order = np.argsort(participant_codes, kind='stable')
+        order = order[participant_codes[order] >= 0]
+        sequence_labels, sequence_participant_codes = kernel_utils.get_kernel(kernel_utils.COLLAPSE_KERNEL)(
+            point_labels[order], participant_codes[order].astype(np.int64)
+        )
+        sequence_starts = np.flatnonzero(np.diff(sequence_participant_codes, prepend=-1))
+        for sequence_start, sequence in zip(sequence_starts, np.split(sequence_labels, sequence_starts[1:])):
+            self.cluster_sequences[participants[sequence_participant_codes[sequence_start]]] = sequence.tolist()
 
     def add_arrow_cluster_seq_if_one_participant(self) -> None:
         '''
@@ -650,6 +900,16 @@ class ModelPlot(object):
             print("{" + "\n".join("{!r}: {!r},".format(k, v) for k, v in getattr(self, d_name).items()) + "}")
 
     def run_monte_carlo_stimulation(self) -> None:
+        """
+        Computes the p-value of each ordinal association rule, i.e., the
+        fraction of random trials in which the rule is in at least as
+        many cluster sequences as in the data; in each trial, every
+        cluster sequence is replaced by as many clusters (or noise)
+        drawn from the frequencies of the clusters. The trials are
+        drawn in chunks and counted by a compiled kernel, or loaded
+        from the analysis cache if the same (seeded) trials were
+        counted for the same clusters and sequences before
+        """
         num_monte_carlo_trials = DEFAULT_NUM_MONTE_CARLO_TRIALS
         if ViewPlot.get_instance().num_trials_monte_carlo_input.value() != 0:
             num_monte_carlo_trials = ViewPlot.get_instance().num_trials_monte_carlo_input.value()
@@ -657,105 +917,131 @@ class ModelPlot(object):
             ViewPlot.get_instance().num_trials_monte_carlo_input.setValue(DEFAULT_NUM_MONTE_CARLO_TRIALS)
 
         self.assoc_rule_p_values = defaultdict(float)
-        num_trials_where_assoc_rule_support_value_met = defaultdict(
-            int)  # the number of trials in which the support value of
-        # association rule in a trial is at least the same, if not greater than, that calculated in the actual data.
-        # used to calculate the p values for each association rule (count / DEFAULT_NUM_MONTE_CARLO_TRIALS)
+        if len(self.ord_assoc_rule_count) == 0:
+            return
 
-        # initializing randomness
-        cluster_ids = self.color.unique().to_numpy(dtype=int)
-        cluster_id_freq = self.color.value_counts() / self.color.size
-        # np.random.choice parameters
-        a = cluster_ids
-        # size will be number of cluster_ids to generate for a particular sample cluster sequence
-        p = [cluster_id_freq[cluster_id] for cluster_id in cluster_ids]
-
-        num_participants = len(self.cluster_sequences.values())
+        cluster_ids, cluster_id_counts = np.unique(np.asarray(self.color, dtype=np.int64), return_counts=True)
+        # the sequences of a trial are drawn as one row
         participant_seq_lengths = np.array(
             [len(cluster_sequence) for cluster_sequence in self.cluster_sequences.values()],
-            dtype=int)
+            dtype=np.int64)
+        # the trials are only cached if they can be drawn again
+        cache_key = None
+        if USE_ANALYSIS_CACHE and MONTE_CARLO_SEED is not None:
+            cache_key = self.get_analysis_cache_key(
+                [cluster_ids, cluster_id_counts, participant_seq_lengths, self.pair_counts],
+                num_trials=num_monte_carlo_trials, seed=MONTE_CARLO_SEED, chunk_size=MONTE_CARLO_CHUNK_SIZE
+            )
+        cached_result = analysis_cache_utils.load_analysis_result(cache_key) if cache_key is not None else None
+        if cached_result is not None:
+            num_trials_where_assoc_rule_support_value_met = cached_result['exceeding_counts']
+        else:
+            num_trials_where_assoc_rule_support_value_met = self.count_exceeding_monte_carlo_trials(
+                num_monte_carlo_trials, cluster_ids, cluster_id_counts, participant_seq_lengths
+            )
+            if cache_key is not None:
+                analysis_cache_utils.store_analysis_result(
+                    cache_key, {'exceeding_counts': num_trials_where_assoc_rule_support_value_met}
+                )
+
+        for assoc_rule in self.ord_assoc_rule_count.keys():
+            self.assoc_rule_p_values[assoc_rule] = \
+                num_trials_where_assoc_rule_support_value_met[assoc_rule] / num_monte_carlo_trials
+
+    def count_exceeding_monte_carlo_trials(self,
+                                           num_monte_carlo_trials: int,
+                                           cluster_ids: np.ndarray,
+                                           cluster_id_counts: np.ndarray,
+                                           participant_seq_lengths: np.ndarray) -> np.ndarray:
+        """
+        Draws the random trials of the Monte Carlo simulation, in
+        chunks counted by a compiled kernel, showing the progress
+        and the estimated time left, and returns the number of
+        trials in which each ordinal association rule is in at
+        least as many cluster sequences as in the data
+        :param num_monte_carlo_trials: number of trials
+        :type num_monte_carlo_trials: int
+        :param cluster_ids: clusters (and noise) drawn from
+        :type cluster_ids: np.ndarray
+        :param cluster_id_counts: number of points of each cluster
+        :type cluster_id_counts: np.ndarray
+        :param participant_seq_lengths: length of the cluster sequence of each participant
+        :type participant_seq_lengths: np.ndarray
+        :return: number of trials exceeding the count of each association rule
+        :rtype: np.ndarray
+        """
+        # initializing randomness
+        cluster_id_freqs = cluster_id_counts / cluster_id_counts.sum()
+        rng = np.random.default_rng(MONTE_CARLO_SEED)
+        sequence_starts = np.concatenate(([0], np.cumsum(participant_seq_lengths)[:-1])).astype(np.int64)
+        count_exceeding_trials = kernel_utils.get_kernel(kernel_utils.EXCEEDANCE_KERNEL)
+        # the number of trials in which each association rule is in at least
+        # as many sequences as in the actual data, from which its p value is
+        # calculated (count / num_monte_carlo_trials)
+        num_trials_where_assoc_rule_support_value_met = np.zeros_like(self.pair_counts)
 
-        trial_sequence_set = np.empty(shape=num_participants, dtype=object)
-        total_time: int
-        seconds_left: int
         ViewPlot.get_instance().monte_carlo_progress_bar.setMinimum(0)
         ViewPlot.get_instance().monte_carlo_progress_bar.setMaximum(num_monte_carlo_trials)
-        for trial_num in range(num_monte_carlo_trials):
-            if trial_num == 0:
-                start_time = time.time()
-            if trial_num == 100:
-                total_time = round(
-                    (time.time() - start_time) * (num_monte_carlo_trials/100)
-                )
-            if trial_num % 100 == 0 and trial_num != 0:
+        start_time = time.time()
+        for chunk_start in range(0, num_monte_carlo_trials, MONTE_CARLO_CHUNK_SIZE):
+            chunk_size = min(MONTE_CARLO_CHUNK_SIZE, num_monte_carlo_trials - chunk_start)
+            trial_sequences = rng.choice(cluster_ids, size=(chunk_size, participant_seq_lengths.sum()),
+                                         p=cluster_id_freqs)
+            num_trials_where_assoc_rule_support_value_met += count_exceeding_trials(
+                trial_sequences, sequence_starts, self.pair_counts
+            )
+            num_trials_done = chunk_start + chunk_size
+            if num_trials_done < num_monte_carlo_trials:
                 # adopted from https://stackoverflow.com/questions/775049/how-do-i-convert-seconds-to-hours-minutes
                 # -and-seconds
-                ViewPlot.get_instance().monte_carlo_progress_bar.setValue(trial_num)
+                ViewPlot.get_instance().monte_carlo_progress_bar.setValue(num_trials_done)
                 seconds_left = round(
-                    total_time*(1-(trial_num/num_monte_carlo_trials))
+                    (time.time() - start_time) * (num_monte_carlo_trials / num_trials_done - 1)
                 )
                 m, s = divmod(seconds_left, 60)
                 h, m = divmod(m, 60)
                 ViewPlot.get_instance().time_left_monte_carlo.setText('ET: {:d}:{:02d}:{:02d} (h:m:s)'.format(h, m, s))
-            for i in range(trial_sequence_set.size):
-                trial_sequence_set[i] = np.random.choice(a=a, size=participant_seq_lengths[i], p=p)
-            trial_ord_assoc_rule_count = defaultdict(int)
-            trial_cluster_id_count = defaultdict(int)
-            for sequence in trial_sequence_set:
-                assoc_rules_for_seq = []
-                cluster_ids = []
-                for index_first in range(len(sequence)):
-                    if sequence[index_first] == -1:
-                        continue
-                    for index_last in range(index_first + 1, len(sequence), 1):
-                        if sequence[index_last] == -1:
-                            continue
-                        if (index_first, index_last) not in assoc_rules_for_seq:
-                            assoc_rules_for_seq.append((sequence[index_first], sequence[index_last]))
-                for assoc_rule in assoc_rules_for_seq:
-                    trial_ord_assoc_rule_count[assoc_rule] += 1
-                for cluster_id in sequence:
-                    if cluster_id not in cluster_ids:
-                        cluster_ids.append(cluster_id)
-                for cluster_id in cluster_ids:
-                    trial_cluster_id_count[cluster_id] += 1
-            for assoc_rule, count in trial_ord_assoc_rule_count.items():
-                trial_assoc_rule_support_val = count / num_monte_carlo_trials
-                if trial_assoc_rule_support_val >= self.support_vals[assoc_rule]:
-                    num_trials_where_assoc_rule_support_value_met[assoc_rule] += 1
-
-        for assoc_rule, count in num_trials_where_assoc_rule_support_value_met.items():
-            self.assoc_rule_p_values[assoc_rule] = count / num_monte_carlo_trials
+
         ViewPlot.get_instance().time_left_monte_carlo.setText("")
         ViewPlot.get_instance().monte_carlo_progress_bar.setValue(0)
+        return num_trials_where_assoc_rule_support_value_met
 
     def ordinal_association_rule_mining(self) -> None:
+        """
+        Counts the cluster sequences each cluster is in and each
+        ordinal association rule (a cluster followed, not necessarily
+        right away, by a cluster) is in; the sequences of all the
+        participants are counted at once by a compiled kernel
+        """
         self.ord_assoc_rule_count = defaultdict(int)
         self.cluster_id_count = defaultdict(int)
-        # print(self.cluster_sequences.values())
-        for sequence in self.cluster_sequences.values():
-            assoc_rules_for_seq = []
-            cluster_ids = []
-            for index_first in range(len(sequence)):
-                if sequence[index_first] == -1:
-                    continue
-                for index_last in range(index_first + 1, len(sequence), 1):
-                    if sequence[index_last] == -1:
-                        continue
-                    if (index_first, index_last) not in assoc_rules_for_seq:
-                        assoc_rules_for_seq.append((sequence[index_first], sequence[index_last]))
-            for assoc_rule in assoc_rules_for_seq:
-                self.ord_assoc_rule_count[assoc_rule] += 1
-            for cluster_id in sequence:
-                if cluster_id not in cluster_ids:
-                    cluster_ids.append(cluster_id)
-            for cluster_id in cluster_ids:
-                self.cluster_id_count[cluster_id] += 1
+        cluster_ids = np.asarray(self.color, dtype=np.int64)
+        num_cluster_ids = int(cluster_ids.max()) + 1 if cluster_ids.size > 0 else 0
+        sequences = list(self.cluster_sequences.values())
+        sequence_labels = np.fromiter(
+            (cluster_id for sequence in sequences for cluster_id in sequence), dtype=np.int64
+        )
+        sequence_starts = np.concatenate(
+            ([0], np.cumsum([len(sequence) for sequence in sequences])[:-1])
+        ).astype(np.int64) if len(sequences) > 0 else np.empty(0, dtype=np.int64)
+        self.pair_counts, cluster_id_counts = kernel_utils.get_kernel(kernel_utils.PAIR_COUNT_KERNEL)(
+            sequence_labels, sequence_starts, num_cluster_ids
+        )
+        for index_first, index_last in zip(*np.nonzero(self.pair_counts)):
+            self.ord_assoc_rule_count[(int(index_first), int(index_last))] = \
+                int(self.pair_counts[index_first, index_last])
+        for cluster_id in np.flatnonzero(cluster_id_counts):
+            self.cluster_id_count[int(cluster_id)] = int(cluster_id_counts[cluster_id])
 
     def compute_support_vals(self) -> None:
+        """
+        Computes the support of each ordinal association
+        rule, i.e., the fraction of the cluster
+        sequences the rule is in
+        """
         self.support_vals = defaultdict(float)
         for assoc_rule, count in self.ord_assoc_rule_count.items():
-            self.support_vals[assoc_rule] = count / len(self.ord_assoc_rule_count)
+            self.support_vals[assoc_rule] = count / len(self.cluster_sequences)
 
     def compute_confidence_vals(self) -> None:
         self.forward_confidence_vals = defaultdict(float)
@@ -874,33 +1160,34 @@ class ModelPlot(object):
 
     def extract_and_set_stimulus_params(self,
                                         selected_stimulus_filename: str,
-                                        df: pd.DataFrame) -> None:
+                                        participant_filenames: list) -> None:
         """
-        Saves the information about the stimulus image, including the image itself,
-        the dimensions of it, and the x and y shifts of the image on the plot
+        Saves the information about the stimulus image, namely
+        the dimensions of it and the x and y shifts of the image
+        on the plot, as registered when the data was loaded
         :param selected_stimulus_filename: filename of the stimulus
         :type selected_stimulus_filename: str
-        :param df: data
-        :type df: pd.DataFrame
+        :param participant_filenames: filenames of the participants being plotted
+        :type participant_filenames: list
         """
-        self.stimulus_image = imgutils.import_img_2d_rgb_arr(selected_stimulus_filename)
+        stimulus_registry = ModelStimulusRegistry.get_instance()
         # defining stimulus image extent in plot
-        self.x_len = len(self.stimulus_image[0])
-        self.y_len = len(self.stimulus_image)
-        self.x_shift = \
-            df[STIMULUS_X_DISPLACEMENT_COL_TITLE][df[STIMULUS_X_DISPLACEMENT_COL_TITLE].notnull()].iloc[0]
-        self.y_shift = \
-            df[STIMULUS_Y_DISPLACEMENT_COL_TITLE][df[STIMULUS_Y_DISPLACEMENT_COL_TITLE].notnull()].iloc[0]
-        if self.x_shift is None:
-            self.x_shift = 0
-        if self.y_shift is None:
-            self.y_shift = 0
+        self.x_len, self.y_len = stimulus_registry.get_img_size(selected_stimulus_filename)
+        self.x_shift, self.y_shift = stimulus_registry.get_media_position(
+            selected_stimulus_filename, participant_filenames
+        )
 
 
 import src.controller.controller_plot
-import src.model.utils.img_utils as imgutils
 from src.model.model_data import ModelData
 from src.model.model_participant_selection import ModelParticipantSelection
+from src.model.model_stimulus_registry import ModelStimulusRegistry
+from src.model.utils import analysis_cache_utils
+from src.model.utils import aoi_utils
+from src.model.utils import cluster_utils
+from src.model.utils import downsampling_utils
+from src.model.utils import fixation_utils
+from src.model.utils import kernel_utils
 from src.model.utils import model_utils
 from src.view.view_analysis_type_selection import ViewAnalysisTypeSelection
 from src.view.view_data_type_selection import ViewDataTypeSelection
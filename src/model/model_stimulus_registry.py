@@ -0,0 +1,217 @@
+"""
+Contains the class ModelStimulusRegistry
+
+MODULAR INTERNAL IMPORTS ARE AT THE BOTTOM OF THE FILE. THIS IS AN
+INTENTIONAL DESIGN CHOICE. IT HELPS AVOID CIRCULAR IMPORT ISSUES.
+IT IS ALSO OKAY TO AVOID THEM IN THIS MANNER BECAUSE THIS IS A
+HIGHLY MODULAR PROGRAM.
+"""
+
+# External imports
+import os
+
+from src.main.config import AOI_FILE_SUFFIX
+from src.main.config import EXCLUDE_STIMULI_LIST
+from src.main.config import MAKE_IMG_GRAYSCALE
+from src.main.config import RELATIVE_STIMULUS_IMAGE_DIR
+
+
+class ModelStimulusRegistry(object):
+    """
+    Registry of the metadata of the stimuli within the data,
+    built once the data is loaded so that plotting and the
+    stimulus menu look the metadata up instead of reading
+    the stimulus images or scanning the data
+    """
+    __instance = None
+
+    # maps each stimulus to its image path, the signature of
+    # the image file, whether it can be visualized and the
+    # width and height (in pixels) of its image
+    stimuli: dict = None
+    # maps each (stimulus, participant filename) to the
+    # position of the stimulus image (media position)
+    media_positions: dict = None
+    # maps each stimulus to its image encoded as a
+    # PNG data URI, once it has been plotted
+    encoded_images: dict = None
+    # maps each stimulus with an AOI file to its areas of
+    # interest (see aoi_utils.read_aoi_file) and to the
+    # signature of the AOI file
+    aois: dict = None
+    aoi_signatures: dict = None
+
+    def clear(self) -> None:
+        self.stimuli = None
+        self.media_positions = None
+        self.encoded_images = None
+        self.aois = None
+        self.aoi_signatures = None
+
+    def __init__(self):
+        if ModelStimulusRegistry.__instance is not None:
+            raise Exception("ModelStimulusRegistry should be treated as a singleton class.")
+        else:
+            ModelStimulusRegistry.__instance = self
+
+    @staticmethod
+    def get_instance():
+        """
+        Static method to access the singleton
+        instance for this class
+
+        :return: the singleton instance
+        :rtype: ModelStimulusRegistry
+        """
+        if ModelStimulusRegistry.__instance is None:
+            ModelStimulusRegistry()
+        return ModelStimulusRegistry.__instance
+
+    def build(self, img_relative_dir: str = RELATIVE_STIMULUS_IMAGE_DIR) -> None:
+        """
+        Registers the stimuli within the loaded data: the stimulus
+        images directory is listed once, the dimensions of each
+        available image are read from its header only, and the
+        media positions are gathered from the data, and the AOIs
+        of each stimulus are read from its AOI file, if any; the
+        metadata of images (and AOI files) that have not changed
+        since they were last registered is kept
+        :param img_relative_dir: directory containing the stimulus images
+        :type img_relative_dir: str
+        """
+        img_filenames = set(os.listdir(img_relative_dir)) if os.path.isdir(img_relative_dir) else set()
+        prev_stimuli = self.stimuli or {}
+        prev_encoded_images = self.encoded_images or {}
+        prev_aois = self.aois or {}
+        prev_aoi_signatures = self.aoi_signatures or {}
+
+        stimuli = {}
+        encoded_images = {}
+        aois = {}
+        aoi_signatures = {}
+        for stimulus in ModelData.get_instance().get_stimuli():
+            img_path = os.path.join(img_relative_dir, stimulus)
+            entry = {
+                'path': img_path,
+                'signature': None,
+                'is_available': False,
+                'width': None,
+                'height': None
+            }
+            if stimulus not in EXCLUDE_STIMULI_LIST and stimulus in img_filenames:
+                entry['signature'] = cache_utils.get_file_signature(img_path)
+                prev_entry = prev_stimuli.get(stimulus)
+                if prev_entry is not None and prev_entry['signature'] == entry['signature']:
+                    entry = prev_entry
+                    if stimulus in prev_encoded_images:
+                        encoded_images[stimulus] = prev_encoded_images[stimulus]
+                else:
+                    try:
+                        entry['width'], entry['height'] = imgutils.read_img_size(img_path)
+                        entry['is_available'] = True
+                    except OSError:
+                        # not an image that can be read
+                        pass
+            stimuli[stimulus] = entry
+
+            if stimulus not in EXCLUDE_STIMULI_LIST and stimulus + AOI_FILE_SUFFIX in img_filenames:
+                aoi_path = aoi_utils.get_aoi_file_path(img_path)
+                aoi_signatures[stimulus] = cache_utils.get_file_signature(aoi_path)
+                if stimulus in prev_aois and prev_aoi_signatures.get(stimulus) == aoi_signatures[stimulus]:
+                    aois[stimulus] = prev_aois[stimulus]
+                else:
+                    try:
+                        aois[stimulus] = aoi_utils.read_aoi_file(aoi_path)
+                    except (OSError, TypeError, ValueError):
+                        # not a valid AOI file
+                        pass
+
+        self.stimuli = stimuli
+        self.encoded_images = encoded_images
+        self.aois = aois
+        self.aoi_signatures = aoi_signatures
+        self.media_positions = ModelData.get_instance().get_media_positions()
+
+    def get_available_stimuli(self) -> list:
+        """
+        Returns the stimuli within the data that can be
+        visualized, i.e., that are not excluded and
+        whose image is in the stimulus images directory
+        :return: sorted filenames of the stimuli
+        :rtype: list
+        """
+        if self.stimuli is None:
+            return []
+        return sorted(stimulus for stimulus, entry in self.stimuli.items() if entry['is_available'])
+
+    def get_img_size(self, stimulus: str) -> tuple:
+        """
+        Returns the width and height (in pixels)
+        of the image of the specified stimulus
+        :param stimulus: filename of the stimulus
+        :type stimulus: str
+        :return: width and height of the image
+        :rtype: tuple
+        """
+        entry = self.stimuli[stimulus]
+        return entry['width'], entry['height']
+
+    def get_media_position(self, stimulus: str, participant_filenames: list) -> tuple:
+        """
+        Returns the position of the image of the specified stimulus
+        as seen by the first of the specified participants (in the
+        order of the data) whose observations specify it; each
+        coordinate is 0 if none of them does
+        :param stimulus: filename of the stimulus
+        :type stimulus: str
+        :param participant_filenames: filenames of the participants
+        :type participant_filenames: list
+        :return: X and Y displacements of the image
+        :rtype: tuple
+        """
+        participant_filenames = set(participant_filenames)
+        media_position = [None, None]
+        for participant_filename in ModelData.get_instance().get_stimulus_participants(stimulus):
+            if participant_filename not in participant_filenames:
+                continue
+            participant_media_position = self.media_positions.get((stimulus, participant_filename), (None, None))
+            for axis in range(2):
+                if media_position[axis] is None:
+                    media_position[axis] = participant_media_position[axis]
+            if None not in media_position:
+                break
+        return tuple(0 if coord is None else coord for coord in media_position)
+
+    def get_aois(self, stimulus: str) -> list:
+        """
+        Returns the areas of interest of the specified
+        stimulus, or an empty list if it has none
+        :param stimulus: filename of the stimulus
+        :type stimulus: str
+        :return: AOIs (see aoi_utils.read_aoi_file)
+        :rtype: list
+        """
+        if self.aois is None:
+            return []
+        return self.aois.get(stimulus, [])
+
+    def get_encoded_img(self, stimulus: str) -> str:
+        """
+        Returns the image of the specified stimulus encoded
+        as a PNG data URI, encoding it on first use only
+        :param stimulus: filename of the stimulus
+        :type stimulus: str
+        :return: data URI of the image
+        :rtype: str
+        """
+        if stimulus not in self.encoded_images:
+            self.encoded_images[stimulus] = imgutils.encode_img_png(
+                self.stimuli[stimulus]['path'], MAKE_IMG_GRAYSCALE
+            )
+        return self.encoded_images[stimulus]
+
+
+import src.model.utils.aoi_utils as aoi_utils
+import src.model.utils.cache_utils as cache_utils
+import src.model.utils.img_utils as imgutils
+from src.model.model_data import ModelData
@@ -7,13 +7,6 @@ IT IS ALSO OKAY TO AVOID THEM IN THIS MANNER BECAUSE THIS IS A
 HIGHLY MODULAR PROGRAM.
 """
 
-# External imports
-import numpy as np
-import pandas as pd
-
-from src.main.config import EXCLUDE_STIMULI_LIST
-from src.main.config import STIMULUS_COL_TITLE
-
 
 class ModelStimulusSelection(object):
     """
@@ -51,20 +44,10 @@ class ModelStimulusSelection(object):
         :return: list of stimuli names
         :rtype: list
         """
-        stimuli_names = ModelData.get_instance().df[STIMULUS_COL_TITLE].unique()
-        stimuli_names = stimuli_names[~(pd.isnull(stimuli_names))]
-
-        # filter found stimuli_names for those that
-        # are existing in the stimulus directory
-        for stimulus in stimuli_names:
-            if stimulus in EXCLUDE_STIMULI_LIST:
-                stimuli_names = np.delete(stimuli_names, np.argwhere(stimulus))
-            elif not imgutils.img_exists(stimulus):
-                stimuli_names = np.delete(stimuli_names, np.argwhere(stimulus))
-
-        self.stimuli_names = sorted(stimuli_names)
+        # the stimuli are filtered for those that are not excluded and
+        # are existing in the stimulus directory once, when registered
+        self.stimuli_names = ModelStimulusRegistry.get_instance().get_available_stimuli()
         return self.stimuli_names
 
 
-import src.model.utils.img_utils as imgutils
-from src.model.model_data import ModelData
+from src.model.model_stimulus_registry import ModelStimulusRegistry
@@ -0,0 +1,139 @@
+"""
+Utility to handle analysis-cache-related tasks, i.e., those dealing
+with storing the results of analyses (e.g., cluster labels or Monte
+Carlo trial counts) on disk, content-addressed by a hash of their
+inputs, so that an analysis repeated in this or a later session is
+loaded instead of recomputed
+"""
+import hashlib
+import json
+import os
+import zipfile
+
+import numpy as np
+
+from src.main.config import MAX_ANALYSIS_CACHE_BYTES
+from src.main.config import RELATIVE_ANALYSIS_CACHE_DIR
+
+# Incremented whenever an analysis changes the results
+# it gives for the same inputs, which invalidates
+# every previously cached analysis result
+ANALYSIS_CACHE_VERSION = 1
+
+ANALYSIS_RESULT_EXTENSION = '.npz'
+
+
+def get_analysis_key(arrays: list, params: dict) -> str:
+    """
+    Returns the key of the result of an analysis of the specified
+    input arrays with the specified parameters, i.e., a hash of the
+    values of the arrays and of the parameters. Since the key is
+    derived from the analyzed values themselves, the results of
+    data files that changed are never looked up again (they are
+    eventually evicted), while the results of the same values
+    are found in any session, whichever files they came from
+
+    :param arrays: input arrays of the analysis (e.g., the points)
+    :type arrays: list
+    :param params: parameters of the analysis (JSON-serializable)
+    :type params: dict
+    :return: key of the result
+    :rtype: str
+    """
+    analysis_hash = hashlib.sha256()
+    analysis_hash.update(json.dumps([ANALYSIS_CACHE_VERSION, params], sort_keys=True).encode('utf-8'))
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        analysis_hash.update(json.dumps([array.dtype.str, array.shape]).encode('utf-8'))
+        analysis_hash.update(array.tobytes())
+    return analysis_hash.hexdigest()
+
+
+def load_analysis_result(key: str,
+                         cache_relative_dir: str = RELATIVE_ANALYSIS_CACHE_DIR) -> dict:
+    """
+    Returns the cached result of the analysis with the specified
+    key, marking it as the most recently used, with its scalars
+    as Python scalars; returns None if it is not cached (or
+    cannot be read)
+
+    :param key: key of the result (see get_analysis_key)
+    :type key: str
+    :param cache_relative_dir: directory containing the analysis cache
+    :type cache_relative_dir: str
+    :return: arrays (or scalars) of the result, keyed by name, or None
+    :rtype: dict
+    """
+    result_path = os.path.join(cache_relative_dir, key + ANALYSIS_RESULT_EXTENSION)
+    try:
+        result = {}
+        with np.load(result_path, allow_pickle=False) as result_file:
+            for name in result_file.files:
+                value = result_file[name]
+                result[name] = value.item() if value.ndim == 0 else value
+        # the modification time of a result is when it was last used
+        os.utime(result_path)
+    except (OSError, ValueError, EOFError, zipfile.BadZipFile):
+        return None
+    return result
+
+
+def store_analysis_result(key: str,
+                          result: dict,
+                          cache_relative_dir: str = RELATIVE_ANALYSIS_CACHE_DIR,
+                          max_num_bytes: int = MAX_ANALYSIS_CACHE_BYTES) -> None:
+    """
+    Caches the result of the analysis with the specified key,
+    replacing the cached file atomically so that an interrupted
+    write never leaves a corrupt result behind, and evicts the
+    least recently used results beyond the maximum size; a
+    result that cannot be written is left uncached
+
+    :param key: key of the result (see get_analysis_key)
+    :type key: str
+    :param result: arrays (or scalars) of the result, keyed by name
+    :type result: dict
+    :param cache_relative_dir: directory containing the analysis cache
+    :type cache_relative_dir: str
+    :param max_num_bytes: maximum total size of the cached results
+    :type max_num_bytes: int
+    """
+    result_path = os.path.join(cache_relative_dir, key + ANALYSIS_RESULT_EXTENSION)
+    try:
+        os.makedirs(cache_relative_dir, exist_ok=True)
+        with open(result_path + '.tmp', 'wb') as result_file:
+            np.savez(result_file, **result)
+        os.replace(result_path + '.tmp', result_path)
+    except (OSError, ValueError, TypeError):
+        return
+    evict_analysis_results(cache_relative_dir, max_num_bytes)
+
+
+def evict_analysis_results(cache_relative_dir: str = RELATIVE_ANALYSIS_CACHE_DIR,
+                           max_num_bytes: int = MAX_ANALYSIS_CACHE_BYTES) -> None:
+    """
+    Removes the least recently used cached analysis results
+    until the total size of the rest is within the maximum size
+
+    :param cache_relative_dir: directory containing the analysis cache
+    :type cache_relative_dir: str
+    :param max_num_bytes: maximum total size of the cached results
+    :type max_num_bytes: int
+    """
+    result_stats = []
+    try:
+        with os.scandir(cache_relative_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(ANALYSIS_RESULT_EXTENSION) and entry.is_file():
+                    entry_stat = entry.stat()
+                    result_stats.append((entry_stat.st_mtime_ns, entry_stat.st_size, entry.path))
+    except OSError:
+        return
+    num_bytes = 0
+    for _, result_num_bytes, result_path in sorted(result_stats, reverse=True):
+        num_bytes += result_num_bytes
+        if num_bytes > max_num_bytes:
+            try:
+                os.remove(result_path)
+            except OSError:
+                pass
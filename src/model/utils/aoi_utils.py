@@ -0,0 +1,246 @@
+"""
+Utility to handle area-of-interest-related tasks, i.e., those dealing
+with reading the areas of interest (AOIs) of the stimuli from their
+sidecar files, finding the AOI of each gaze point or fixation and
+summarizing the fixations of each participant on each AOI
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+from src.main.config import AOI_FILE_SUFFIX
+from src.main.config import FIXATION_DURATION_COL_TITLE
+from src.main.config import PARTICIPANT_FILENAME_COL_TITLE
+from src.main.config import PARTICIPANT_NAME_COL_TITLE
+from src.main.config import STIMULUS_COL_TITLE
+from src.main.config import TIMESTAMP_COL_TITLE
+from src.main.config import X_FIXATION_COL_TITLE
+from src.main.config import Y_FIXATION_COL_TITLE
+
+# Columns of the AOI metrics table, in order, each of them
+# summarizing the fixations of a participant on an AOI of
+# a stimulus
+AOI_METRIC_COL_TITLES = [
+    'Participant',
+    'Participant File',
+    'Stimulus',
+    'AOI',
+    'Fixation Count',
+    'Visit Count',
+    'Dwell Time (ms)',
+    'First Fixation Latency (ms)',
+    'First Fixation Duration (ms)'
+]
+
+
+def get_aoi_file_path(img_path: str) -> str:
+    """
+    Returns the path of the sidecar file defining
+    the AOIs of the stimulus with the specified image
+
+    :param img_path: path of the stimulus image
+    :type img_path: str
+    :return: path of the AOI file
+    :rtype: str
+    """
+    return img_path + AOI_FILE_SUFFIX
+
+
+def read_aoi_file(file_path: str) -> list:
+    """
+    Returns the AOIs defined in the specified file (see build_aois).
+    The file is a JSON object whose "aois" list defines each AOI,
+    in the pixel coordinates of the stimulus image, either as
+    a rectangle:
+    {"name": "Target", "rect": [x, y, width, height]}
+    or as a polygon:
+    {"name": "Distractor", "polygon": [[x1, y1], [x2, y2], ...]}
+
+    :param file_path: path of the AOI file
+    :type file_path: str
+    :return: AOIs
+    :rtype: list
+    """
+    with open(file_path, 'r') as aoi_file:
+        aoi_file_content = json.load(aoi_file)
+    if not isinstance(aoi_file_content, dict):
+        raise ValueError("An AOI file needs to be a JSON object.")
+    return build_aois(aoi_file_content.get('aois', []))
+
+
+def build_aois(aoi_definitions: list) -> list:
+    """
+    Returns the specified AOIs, in order, as dictionaries
+    giving the name, the vertices and the bounds (minimum X,
+    minimum Y, maximum X and maximum Y) of each AOI and
+    whether it is a rectangle
+
+    :param aoi_definitions: definition of each AOI, as in an AOI file
+    :type aoi_definitions: list
+    :return: AOIs
+    :rtype: list
+    """
+    aois = []
+    for aoi_definition in aoi_definitions:
+        if 'rect' in aoi_definition:
+            x, y, width, height = (float(value) for value in aoi_definition['rect'])
+            vertices = np.array([[x, y], [x + width, y], [x + width, y + height], [x, y + height]])
+        elif 'polygon' in aoi_definition:
+            vertices = np.asarray(aoi_definition['polygon'], dtype=np.float64)
+            if vertices.ndim != 2 or vertices.shape[0] < 3 or vertices.shape[1] != 2:
+                raise ValueError("The polygon of an AOI needs at least 3 [x, y] vertices.")
+        else:
+            raise ValueError("An AOI needs either a rect or a polygon.")
+        aois.append({
+            'name': str(aoi_definition.get('name', 'AOI {}'.format(len(aois)))),
+            'vertices': vertices,
+            'bounds': (*vertices.min(axis=0), *vertices.max(axis=0)),
+            'is_rect': 'rect' in aoi_definition
+        })
+    return aois
+
+
+def get_aoi_labels(x_coords: np.ndarray, y_coords: np.ndarray, aois: list) -> np.ndarray:
+    """
+    Returns the AOI each of the specified points is in, as the
+    position of the AOI within the specified AOIs, or -1 if the
+    point is in none of them; if AOIs overlap, the point is in
+    the first of them. Each AOI tests every point at once: the
+    points within its bounds are found first, and only those are
+    tested against its polygon
+
+    :param x_coords: X coordinates of the points (in stimulus pixels)
+    :type x_coords: np.ndarray
+    :param y_coords: Y coordinates of the points (in stimulus pixels)
+    :type y_coords: np.ndarray
+    :param aois: AOIs (see read_aoi_file)
+    :type aois: list
+    :return: AOI label of each point
+    :rtype: np.ndarray
+    """
+    x_coords = np.asarray(x_coords, dtype=np.float64)
+    y_coords = np.asarray(y_coords, dtype=np.float64)
+    labels = np.full(x_coords.size, -1, dtype=np.int64)
+    for label, aoi in enumerate(aois):
+        min_x, min_y, max_x, max_y = aoi['bounds']
+        # NaN coordinates are within no bounds
+        candidates = np.flatnonzero((labels < 0) &
+                                    (x_coords >= min_x) & (x_coords <= max_x) &
+                                    (y_coords >= min_y) & (y_coords <= max_y))
+        if not aoi['is_rect'] and candidates.size > 0:
+            from matplotlib.path import Path  # imported on first use to speed up startup
+
+            candidates = candidates[Path(aoi['vertices']).contains_points(
+                np.column_stack((x_coords[candidates], y_coords[candidates]))
+            )]
+        labels[candidates] = label
+    return labels
+
+
+def get_aoi_centers(aois: list) -> np.ndarray:
+    """
+    Returns the center of the bounds of each of the specified AOIs
+
+    :param aois: AOIs (see read_aoi_file)
+    :type aois: list
+    :return: X and Y coordinates of the center of each AOI
+    :rtype: np.ndarray
+    """
+    if len(aois) == 0:
+        return np.empty((0, 2))
+    bounds = np.array([aoi['bounds'] for aoi in aois])
+    return (bounds[:, :2] + bounds[:, 2:]) / 2
+
+
+def build_aoi_metrics_df(fixation_df: pd.DataFrame,
+                         stimulus_aois: dict,
+                         onsets: dict) -> pd.DataFrame:
+    """
+    Returns the AOI metrics table of the specified fixation table,
+    with one row per AOI of each stimulus viewed by each participant:
+    the number of fixations and of visits (runs of consecutive
+    fixations) in the AOI, the dwell time (the total duration of the
+    fixations in it) and the latency (from the first timestamp of the
+    participant on the stimulus) and duration of the first fixation
+    in it. The fixation points are in the coordinates of the stimulus
+    image, so the fixations of every participant on a stimulus are
+    hit-tested at once, and the rows are ordered by participant,
+    stimulus and AOI
+
+    :param fixation_df: fixation table, ordered by participant and then by time
+    :type fixation_df: pd.DataFrame
+    :param stimulus_aois: AOIs of each stimulus (see read_aoi_file)
+    :type stimulus_aois: dict
+    :param onsets: first timestamp, keyed by (stimulus, participant filename)
+    :type onsets: dict
+    :return: AOI metrics table
+    :rtype: pd.DataFrame
+    """
+    if len(fixation_df.index) == 0 or STIMULUS_COL_TITLE not in fixation_df:
+        return pd.DataFrame(columns=AOI_METRIC_COL_TITLES)
+    participant_codes, participant_filenames = pd.factorize(fixation_df[PARTICIPANT_FILENAME_COL_TITLE])
+    stimulus_codes, stimuli = pd.factorize(fixation_df[STIMULUS_COL_TITLE])
+    x_coords = fixation_df[X_FIXATION_COL_TITLE].to_numpy(dtype=np.float64)
+    y_coords = fixation_df[Y_FIXATION_COL_TITLE].to_numpy(dtype=np.float64)
+    fixation_starts = fixation_df[TIMESTAMP_COL_TITLE].to_numpy(dtype=np.float64)
+    durations = fixation_df[FIXATION_DURATION_COL_TITLE].to_numpy(dtype=np.float64)
+    participant_firsts = np.unique(participant_codes, return_index=True)[1]
+    participant_names = fixation_df[PARTICIPANT_NAME_COL_TITLE].to_numpy()[participant_firsts] \
+        if PARTICIPANT_NAME_COL_TITLE in fixation_df else np.full(len(participant_filenames), np.nan)
+
+    stimulus_metrics_dfs = []
+    for stimulus_code, stimulus in enumerate(stimuli):
+        aois = stimulus_aois.get(stimulus)
+        if not aois:
+            continue
+        positions = np.flatnonzero(stimulus_codes == stimulus_code)
+        viewer_codes = pd.unique(participant_codes[positions])
+        viewer_ranks = np.empty(len(participant_filenames), dtype=np.int64)
+        viewer_ranks[viewer_codes] = np.arange(viewer_codes.size)
+        # first timestamp of each participant on the stimulus
+        viewer_onsets = np.array([onsets.get((stimulus, participant_filenames[code]), np.nan)
+                                  for code in viewer_codes], dtype=np.float64)
+
+        ranks = viewer_ranks[participant_codes[positions]]
+        labels = get_aoi_labels(x_coords[positions], y_coords[positions], aois)
+        # a visit starts with a fixation in an AOI that
+        # does not follow a fixation in the same AOI
+        is_visit_start = labels >= 0
+        is_visit_start[1:] &= (labels[1:] != labels[:-1]) | (ranks[1:] != ranks[:-1])
+        is_hit = labels >= 0
+        positions, ranks, labels, is_visit_start = \
+            positions[is_hit], ranks[is_hit], labels[is_hit], is_visit_start[is_hit]
+
+        # one group per (participant, AOI), ordered by participant and AOI
+        num_groups = viewer_codes.size * len(aois)
+        group_codes = ranks * len(aois) + labels
+        group_firsts = np.full(num_groups, -1, dtype=np.int64)
+        hit_groups, hit_group_firsts = np.unique(group_codes, return_index=True)
+        group_firsts[hit_groups] = positions[hit_group_firsts]
+        has_fixation = group_firsts >= 0
+        group_viewer_codes = np.repeat(viewer_codes, len(aois))
+        first_latencies = np.full(num_groups, np.nan)
+        first_latencies[has_fixation] = fixation_starts[group_firsts[has_fixation]] - \
+            np.repeat(viewer_onsets, len(aois))[has_fixation]
+        first_durations = np.full(num_groups, np.nan)
+        first_durations[has_fixation] = durations[group_firsts[has_fixation]]
+
+        stimulus_metrics_dfs.append(pd.DataFrame({
+            AOI_METRIC_COL_TITLES[0]: participant_names[group_viewer_codes],
+            AOI_METRIC_COL_TITLES[1]: np.asarray(participant_filenames)[group_viewer_codes],
+            AOI_METRIC_COL_TITLES[2]: stimulus,
+            AOI_METRIC_COL_TITLES[3]: np.tile([aoi['name'] for aoi in aois], viewer_codes.size),
+            AOI_METRIC_COL_TITLES[4]: np.bincount(group_codes, minlength=num_groups),
+            AOI_METRIC_COL_TITLES[5]: np.bincount(group_codes[is_visit_start], minlength=num_groups),
+            AOI_METRIC_COL_TITLES[6]: np.bincount(group_codes, weights=durations[positions], minlength=num_groups),
+            AOI_METRIC_COL_TITLES[7]: first_latencies,
+            AOI_METRIC_COL_TITLES[8]: first_durations,
+            'participant_code': group_viewer_codes
+        }))
+
+    if len(stimulus_metrics_dfs) == 0:
+        return pd.DataFrame(columns=AOI_METRIC_COL_TITLES)
+    aoi_metrics_df = pd.concat(stimulus_metrics_dfs, ignore_index=True)
+    aoi_metrics_df = aoi_metrics_df.iloc[np.argsort(aoi_metrics_df['participant_code'].to_numpy(), kind='stable')]
+    return aoi_metrics_df[AOI_METRIC_COL_TITLES].reset_index(drop=True)
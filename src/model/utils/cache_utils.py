@@ -0,0 +1,178 @@
+"""
+Utility to handle cache-related tasks, i.e., those dealing with
+storing parsed eye-tracking data on disk in a binary columnar
+format (Feather) so that unchanged data files are not re-parsed
+"""
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from src.main.config import RELATIVE_CACHE_DIR
+
+# Incremented whenever the layout of the cached
+# DataFrame objects changes, which invalidates
+# every previously cached data file
+CACHE_VERSION = 6
+
+MANIFEST_FILENAME = 'manifest.json'
+
+
+def get_file_signature(file_path: str) -> list:
+    """
+    Returns the signature of the specified file, i.e., its
+    size and modification time, which identifies whether
+    the file has changed since it was last cached
+
+    :param file_path: path of the file
+    :type file_path: str
+    :return: size (in bytes) and modification time (in ns) of the file
+    :rtype: list
+    """
+    file_stat = os.stat(file_path)
+    return [file_stat.st_size, file_stat.st_mtime_ns]
+
+
+def load_manifest(cache_relative_dir: str = RELATIVE_CACHE_DIR) -> dict:
+    """
+    Returns the manifest of the cache, which maps the absolute
+    path of each cached data file to its signature and the
+    filenames of its cached DataFrame objects; an empty manifest
+    is returned if none exists or if it was written by a
+    different cache version
+
+    :param cache_relative_dir: directory containing the cache
+    :type cache_relative_dir: str
+    :return: manifest of the cache
+    :rtype: dict
+    """
+    try:
+        with open(os.path.join(cache_relative_dir, MANIFEST_FILENAME), 'r') as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError):
+        return {'version': CACHE_VERSION, 'files': {}}
+    if manifest.get('version') != CACHE_VERSION:
+        return {'version': CACHE_VERSION, 'files': {}}
+    return manifest
+
+
+def save_manifest(manifest: dict,
+                  cache_relative_dir: str = RELATIVE_CACHE_DIR) -> None:
+    """
+    Writes the manifest of the cache to disk, replacing the
+    previous manifest atomically so that an interrupted write
+    never leaves a corrupt manifest behind
+
+    :param manifest: manifest of the cache
+    :type manifest: dict
+    :param cache_relative_dir: directory containing the cache
+    :type cache_relative_dir: str
+    """
+    os.makedirs(cache_relative_dir, exist_ok=True)
+    manifest_path = os.path.join(cache_relative_dir, MANIFEST_FILENAME)
+    with open(manifest_path + '.tmp', 'w') as manifest_file:
+        json.dump(manifest, manifest_file)
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+
+def load_cached_dfs(file_path: str,
+                    signature: list,
+                    manifest: dict,
+                    cache_relative_dir: str = RELATIVE_CACHE_DIR) -> dict:
+    """
+    Returns the cached DataFrame objects of the specified data
+    file if the file has not changed since they were cached;
+    otherwise, returns None
+
+    :param file_path: path of the data file
+    :type file_path: str
+    :param signature: current signature of the data file
+    :type signature: list
+    :param manifest: manifest of the cache
+    :type manifest: dict
+    :param cache_relative_dir: directory containing the cache
+    :type cache_relative_dir: str
+    :return: cached DataFrame objects of the data file, keyed by
+        table name (e.g., 'data' or 'fixations'), or None
+    :rtype: dict
+    """
+    entry = manifest['files'].get(os.path.abspath(file_path))
+    if entry is None or entry['signature'] != signature:
+        return None
+    try:
+        return {
+            table_name: pd.read_feather(os.path.join(cache_relative_dir, cache_filename))
+            for table_name, cache_filename in entry['cache_filenames'].items()
+        }
+    except (ImportError, OSError, ValueError, TypeError):
+        return None
+
+
+def store_cached_dfs(file_path: str,
+                     signature: list,
+                     dfs: dict,
+                     manifest: dict,
+                     cache_relative_dir: str = RELATIVE_CACHE_DIR) -> None:
+    """
+    Caches the DataFrame objects derived from the specified data
+    file and records them in the manifest; data that cannot be
+    represented in the columnar format is left uncached
+
+    :param file_path: path of the data file
+    :type file_path: str
+    :param signature: signature of the data file when it was parsed
+    :type signature: list
+    :param dfs: DataFrame objects derived from the data file,
+        keyed by table name (e.g., 'data' or 'fixations')
+    :type dfs: dict
+    :param manifest: manifest of the cache
+    :type manifest: dict
+    :param cache_relative_dir: directory containing the cache
+    :type cache_relative_dir: str
+    """
+    abs_file_path = os.path.abspath(file_path)
+    cache_filename_stem = hashlib.sha1(abs_file_path.encode('utf-8')).hexdigest()
+    cache_filenames = {
+        table_name: '{}.{}.feather'.format(cache_filename_stem, table_name)
+        for table_name in dfs.keys()
+    }
+    try:
+        os.makedirs(cache_relative_dir, exist_ok=True)
+        for table_name, df in dfs.items():
+            df.reset_index(drop=True).to_feather(os.path.join(cache_relative_dir, cache_filenames[table_name]))
+    except (ImportError, OSError, ValueError, TypeError):
+        manifest['files'].pop(abs_file_path, None)
+        return
+    manifest['files'][abs_file_path] = {
+        'signature': signature,
+        'cache_filenames': cache_filenames
+    }
+
+
+def prune_manifest(manifest: dict,
+                   file_paths: list,
+                   cache_relative_dir: str = RELATIVE_CACHE_DIR) -> None:
+    """
+    Removes the cached DataFrame objects of data files that
+    no longer exist in the directories of the specified
+    data files
+
+    :param manifest: manifest of the cache
+    :type manifest: dict
+    :param file_paths: paths of the data files currently available
+    :type file_paths: list
+    :param cache_relative_dir: directory containing the cache
+    :type cache_relative_dir: str
+    """
+    abs_file_paths = set(os.path.abspath(file_path) for file_path in file_paths)
+    abs_data_dirs = set(os.path.dirname(abs_file_path) for abs_file_path in abs_file_paths)
+    for abs_file_path in list(manifest['files'].keys()):
+        if abs_file_path in abs_file_paths or os.path.dirname(abs_file_path) not in abs_data_dirs:
+            continue
+        entry = manifest['files'].pop(abs_file_path)
+        for cache_filename in entry['cache_filenames'].values():
+            try:
+                os.remove(os.path.join(cache_relative_dir, cache_filename))
+            except OSError:
+                pass
@@ -0,0 +1,288 @@
+"""
+Utility to handle clustering-related tasks, i.e., those dealing with
+collapsing the duplicates of the plotted points, finding their
+neighbors and clustering them with DBSCAN from their neighbors or on
+a grid, or with OPTICS from their reachability
+"""
+import numpy as np
+import pandas as pd
+
+from src.main.config import MAX_NEIGHBOR_GRAPH_EDGES
+from src.main.config import NEIGHBOR_GRAPH_EDGE_SAMPLE_SIZE
+from src.model.utils import kernel_utils
+
+
+def collapse_duplicate_points(xy: np.ndarray, weights: np.ndarray = None) -> tuple:
+    """
+    Returns the unique points of the specified points, in the order
+    of their first occurrence, each weighing as much as its duplicates
+    together (its number of duplicates if the points are not weighed),
+    and the position of the unique point of each point. DBSCAN finds
+    the same core points among the weighted unique points as among the
+    points, in the same order, so it assigns every point the label of
+    its unique point while searching for the neighbors of far fewer
+    points if many of them are duplicates (e.g., fixations or gaze
+    samples at the same pixel)
+
+    :param xy: X and Y coordinates of each point (none missing)
+    :type xy: np.ndarray
+    :param weights: weight of each point (e.g., its duration), or None
+    :type weights: np.ndarray
+    :return: X and Y coordinates of each unique point, the weight of
+        each unique point and the position of the unique point of each point
+    :rtype: tuple
+    """
+    # each point is hashed as a complex number, which pandas
+    # numbers in the order of first occurrence, far faster
+    # than np.unique sorts the points
+    point_codes, unique_points = pd.factorize(xy[:, 0] + 1j * xy[:, 1])
+    point_codes = point_codes.astype(np.int64)
+    unique_weights = np.bincount(point_codes, weights=weights, minlength=unique_points.size).astype(np.float64)
+    return np.column_stack((unique_points.real, unique_points.imag)), unique_weights, point_codes
+
+
+def build_neighbor_graph(xy: np.ndarray, max_eps: float) -> dict:
+    """
+    Returns the radius-neighbor graph of the specified points, i.e.,
+    the neighbors of each point within the specified maximum eps
+    (including the point itself) and their distances, from which
+    the points can be clustered with DBSCAN for any eps up to the
+    maximum eps without searching for neighbors again
+
+    :param xy: X and Y coordinates of each point
+    :type xy: np.ndarray
+    :param max_eps: maximum distance between neighbors
+    :type max_eps: float
+    :return: the points, the maximum eps and the neighbor graph in
+        compressed sparse row form (row pointers, neighbor positions
+        and distances)
+    :rtype: dict
+    """
+    from sklearn.neighbors import NearestNeighbors  # imported on first use to speed up startup
+
+    if xy.shape[0] == 0:
+        neighbors, distances = [], []
+    else:
+        distances, neighbors = NearestNeighbors(radius=max_eps, n_jobs=-1).fit(xy).radius_neighbors(xy)
+    indptr = np.zeros(xy.shape[0] + 1, dtype=np.int64)
+    np.cumsum([row_neighbors.size for row_neighbors in neighbors], out=indptr[1:])
+    return {
+        'xy': xy,
+        'max_eps': max_eps,
+        'indptr': indptr,
+        'indices': np.concatenate(neighbors).astype(np.int64) if len(neighbors) > 0
+        else np.empty(0, dtype=np.int64),
+        'distances': np.concatenate(distances).astype(np.float64) if len(distances) > 0
+        else np.empty(0, dtype=np.float64)
+    }
+
+
+def get_neighbor_graph_radius(xy: np.ndarray, eps: float, max_eps: float) -> float:
+    """
+    Returns the radius to build the neighbor graph of the specified
+    points with (see build_neighbor_graph): the specified maximum
+    eps, halved down to the specified eps until the graph is expected
+    to have at most MAX_NEIGHBOR_GRAPH_EDGES edges, as estimated from
+    the neighbors of a random sample of the points, or None if even
+    the graph of the eps is expected to have more (e.g., if the eps
+    spans most of the stimulus), so that a large eps range does not
+    make the graph grow to the square of the number of points
+
+    :param xy: X and Y coordinates of each point
+    :type xy: np.ndarray
+    :param eps: minimum radius, i.e., the eps to cluster with
+    :type eps: float
+    :param max_eps: maximum radius, i.e., the maximum eps of the eps range
+    :type max_eps: float
+    :return: radius of the neighbor graph, or None
+    :rtype: float
+    """
+    from sklearn.neighbors import KDTree  # imported on first use to speed up startup
+
+    num_points = xy.shape[0]
+    if num_points * num_points <= MAX_NEIGHBOR_GRAPH_EDGES:
+        return max_eps
+    sample_xy = xy[np.random.default_rng(0).choice(
+        num_points, min(num_points, NEIGHBOR_GRAPH_EDGE_SAMPLE_SIZE), replace=False
+    )]
+    tree = KDTree(xy)
+    radius = max_eps
+    while tree.query_radius(sample_xy, radius, count_only=True).mean() * num_points > MAX_NEIGHBOR_GRAPH_EDGES:
+        if radius <= eps:
+            return None
+        radius = max(radius / 2, eps)
+    return radius
+
+
+def is_neighbor_graph_reusable(neighbor_graph: dict, xy: np.ndarray, eps: float) -> bool:
+    """
+    Returns whether the specified neighbor graph was built from
+    the specified points with at least the specified eps
+
+    :param neighbor_graph: neighbor graph (see build_neighbor_graph), or None
+    :type neighbor_graph: dict
+    :param xy: X and Y coordinates of each point
+    :type xy: np.ndarray
+    :param eps: maximum distance between neighbors to cluster with
+    :type eps: float
+    :return: True if the points can be clustered from the graph
+    :rtype: bool
+    """
+    return neighbor_graph is not None and neighbor_graph['max_eps'] >= eps and \
+        np.array_equal(neighbor_graph['xy'], xy)
+
+
+def get_dbscan_labels(neighbor_graph: dict, eps: float, min_samples: int,
+                      weights: np.ndarray = None) -> np.ndarray:
+    """
+    Returns the labels DBSCAN assigns to the points of the specified
+    neighbor graph for the specified eps (up to the maximum eps of
+    the graph), min_samples and weights of the points, the same as
+    sklearn.cluster.DBSCAN (see kernel_utils.expand_dbscan_clusters_loop)
+
+    :param neighbor_graph: neighbor graph (see build_neighbor_graph)
+    :type neighbor_graph: dict
+    :param eps: maximum distance between neighbors
+    :type eps: float
+    :param min_samples: minimum weight of the neighbors of a core point
+    :type min_samples: int
+    :param weights: weight of each point, or None if each weighs 1
+    :type weights: np.ndarray
+    :return: cluster label of each point
+    :rtype: np.ndarray
+    """
+    if weights is None:
+        weights = np.ones(neighbor_graph['indptr'].size - 1)
+    return kernel_utils.get_kernel(kernel_utils.DBSCAN_KERNEL)(
+        neighbor_graph['indptr'], neighbor_graph['indices'], neighbor_graph['distances'],
+        np.ascontiguousarray(weights, dtype=np.float64), float(eps), int(min_samples)
+    )
+
+
+def build_optics_ordering(xy: np.ndarray, min_samples: int, max_eps: float) -> dict:
+    """
+    Returns the OPTICS reachability ordering of the specified points,
+    i.e., the order in which OPTICS visits them and the reachability
+    and core distance of each point, from which the clusters DBSCAN
+    would find can be extracted for any eps up to the maximum eps
+    without running OPTICS again; OPTICS needs at least 2 min_samples
+
+    :param xy: X and Y coordinates of each point
+    :type xy: np.ndarray
+    :param min_samples: minimum number of neighbors of a core point
+    :type min_samples: int
+    :param max_eps: maximum distance between neighbors
+    :type max_eps: float
+    :return: the points, the min_samples, the maximum eps, the ordering
+        and the reachability and core distance of each point
+    :rtype: dict
+    """
+    from sklearn.cluster import OPTICS  # imported on first use to speed up startup
+
+    min_samples = max(int(min_samples), 2)
+    if xy.shape[0] < min_samples:
+        ordering = np.arange(xy.shape[0])
+        reachability = np.full(xy.shape[0], np.inf)
+        core_distances = np.full(xy.shape[0], np.inf)
+    else:
+        # duplicate points have a core distance of 0, which
+        # OPTICS divides by when ordering their neighbors
+        with np.errstate(divide='ignore'):
+            optics = OPTICS(min_samples=min_samples, max_eps=max_eps, n_jobs=-1).fit(xy)
+        ordering, reachability, core_distances = \
+            optics.ordering_, optics.reachability_, optics.core_distances_
+    return {
+        'xy': xy,
+        'min_samples': min_samples,
+        'max_eps': max_eps,
+        'ordering': ordering,
+        'reachability': reachability,
+        'core_distances': core_distances
+    }
+
+
+def is_optics_ordering_reusable(optics_ordering: dict, xy: np.ndarray, eps: float, min_samples: int) -> bool:
+    """
+    Returns whether the specified OPTICS reachability ordering was built
+    from the specified points and min_samples with at least the specified eps
+
+    :param optics_ordering: OPTICS reachability ordering (see build_optics_ordering), or None
+    :type optics_ordering: dict
+    :param xy: X and Y coordinates of each point
+    :type xy: np.ndarray
+    :param eps: maximum distance between neighbors to cluster with
+    :type eps: float
+    :param min_samples: minimum number of neighbors of a core point
+    :type min_samples: int
+    :return: True if the points can be clustered from the ordering
+    :rtype: bool
+    """
+    return optics_ordering is not None and optics_ordering['max_eps'] >= eps and \
+        optics_ordering['min_samples'] == max(int(min_samples), 2) and \
+        np.array_equal(optics_ordering['xy'], xy)
+
+
+def get_optics_dbscan_labels(optics_ordering: dict, eps: float) -> np.ndarray:
+    """
+    Returns the labels of the clusters extracted from the specified
+    OPTICS reachability ordering for the specified eps (up to the
+    maximum eps of the ordering): the same core points as DBSCAN with
+    the same eps and min_samples, although a point on the border of
+    two clusters may join the other one or be noise (-1)
+
+    :param optics_ordering: OPTICS reachability ordering (see build_optics_ordering)
+    :type optics_ordering: dict
+    :param eps: maximum distance between neighbors
+    :type eps: float
+    :return: cluster label of each point
+    :rtype: np.ndarray
+    """
+    from sklearn.cluster import cluster_optics_dbscan  # imported on first use to speed up startup
+
+    if optics_ordering['ordering'].size == 0:
+        return np.empty(0, dtype=np.int64)
+    return cluster_optics_dbscan(reachability=optics_ordering['reachability'],
+                                 core_distances=optics_ordering['core_distances'],
+                                 ordering=optics_ordering['ordering'],
+                                 eps=eps).astype(np.int64)
+
+
+def get_grid_dbscan_labels(xy: np.ndarray, eps: float, min_samples: int,
+                           weights: np.ndarray = None) -> np.ndarray:
+    """
+    Returns the labels DBSCAN assigns to the specified points for the
+    specified eps, min_samples and weights of the points, found on a
+    grid of cells of side eps / sqrt(2) (see
+    kernel_utils.cluster_grid_dbscan_loop), which
+    takes time and memory that grow with the number of points and
+    cells instead of the number of neighbors, for dense gaze data.
+    On the gaze points of each stimulus of data/tsv_files_sample, over
+    eps 5 to 40 and min_samples 2 to 20, it gives every point (279,920
+    of 279,920) the same label as sklearn.cluster.DBSCAN, which
+    tests/test_cluster_utils.py asserts for at least 99.9% of the points
+
+    :param xy: X and Y coordinates of each point
+    :type xy: np.ndarray
+    :param eps: maximum distance between neighbors
+    :type eps: float
+    :param min_samples: minimum weight of the neighbors of a core point
+    :type min_samples: int
+    :param weights: weight of each point, or None if each weighs 1
+    :type weights: np.ndarray
+    :return: cluster label of each point
+    :rtype: np.ndarray
+    """
+    if xy.shape[0] == 0:
+        return np.empty(0, dtype=np.int64)
+    if weights is None:
+        weights = np.ones(xy.shape[0])
+    cell_coords = np.floor((xy - xy.min(axis=0)) / (eps / np.sqrt(2))).astype(np.int64)
+    num_cell_cols = int(cell_coords[:, 1].max()) + 1
+    point_cell_keys = cell_coords[:, 0] * num_cell_cols + cell_coords[:, 1]
+    order = np.argsort(point_cell_keys, kind='stable')
+    cell_keys, cell_starts = np.unique(point_cell_keys[order], return_index=True)
+    return kernel_utils.get_kernel(kernel_utils.GRID_DBSCAN_KERNEL)(
+        np.ascontiguousarray(xy[:, 0], dtype=np.float64), np.ascontiguousarray(xy[:, 1], dtype=np.float64),
+        np.ascontiguousarray(weights, dtype=np.float64), order.astype(np.int64),
+        cell_keys, np.append(cell_starts, xy.shape[0]).astype(np.int64), num_cell_cols, float(eps), int(min_samples)
+    )
@@ -0,0 +1,198 @@
+"""
+Utility to handle downsampling-related tasks, i.e., those dealing with
+reducing the points of eye-tracking data sent to a figure to a point
+budget while preserving the shape of what is plotted
+"""
+import numpy as np
+
+LTTB_METHOD = 'lttb'
+
+SPATIAL_THINNING_METHOD = 'spatial_thinning'
+
+
+def downsample_groups(x_coords: np.ndarray,
+                      y_coords: np.ndarray,
+                      group_codes: np.ndarray,
+                      point_budget: int,
+                      method: str) -> np.ndarray:
+    """
+    Returns the ascending positions of the points kept when the
+    specified points are downsampled to the point budget with the
+    specified method; the budget is shared between the groups
+    (e.g., participants), each of which is downsampled on its own
+
+    :param x_coords: X coordinates of the points, in plotting order
+    :type x_coords: np.ndarray
+    :param y_coords: Y coordinates of the points, in plotting order
+    :type y_coords: np.ndarray
+    :param group_codes: codes identifying the group of each point
+    :type group_codes: np.ndarray
+    :param point_budget: maximum number of points kept
+    :type point_budget: int
+    :param method: LTTB_METHOD or SPATIAL_THINNING_METHOD
+    :type method: str
+    :return: positions of the points kept
+    :rtype: np.ndarray
+    """
+    if method == LTTB_METHOD:
+        get_positions = get_lttb_positions
+    elif method == SPATIAL_THINNING_METHOD:
+        get_positions = get_spatial_thinning_positions
+    else:
+        raise ValueError("Unknown downsampling method: {}".format(method))
+    if x_coords.size <= point_budget:
+        return np.arange(x_coords.size)
+
+    groups, group_codes = np.unique(group_codes, return_inverse=True)
+    group_positions = np.split(np.argsort(group_codes, kind='stable'),
+                               np.cumsum(np.bincount(group_codes, minlength=groups.size))[:-1])
+    quotas = get_point_quotas(np.array([positions.size for positions in group_positions]), point_budget)
+    kept_positions = [
+        positions[get_positions(x_coords[positions], y_coords[positions], quota)]
+        for positions, quota in zip(group_positions, quotas)
+    ]
+    return np.sort(np.concatenate(kept_positions))
+
+
+def get_point_quotas(group_num_points: np.ndarray, point_budget: int) -> np.ndarray:
+    """
+    Returns the number of points each group may keep so that all
+    the groups together keep at most the point budget: the budget
+    is shared evenly, and what groups with fewer points than their
+    share do not use is shared among the others
+
+    :param group_num_points: number of points of each group
+    :type group_num_points: np.ndarray
+    :param point_budget: maximum number of points kept
+    :type point_budget: int
+    :return: maximum number of points kept of each group
+    :rtype: np.ndarray
+    """
+    quotas = np.zeros(group_num_points.size, dtype=np.int64)
+    remaining_budget = point_budget
+    order = np.argsort(group_num_points, kind='stable')
+    for num_remaining_groups, group in zip(range(order.size, 0, -1), order):
+        quotas[group] = min(group_num_points[group], remaining_budget // num_remaining_groups)
+        remaining_budget -= quotas[group]
+    return quotas
+
+
+def get_lttb_positions(x_coords: np.ndarray,
+                       y_coords: np.ndarray,
+                       num_points: int) -> np.ndarray:
+    """
+    Returns the ascending positions of the specified number of
+    points of the specified path chosen by the
+    Largest-Triangle-Three-Buckets algorithm: the first and last
+    points are kept and the others are split into equal buckets,
+    from each of which the point forming the largest triangle with
+    the point kept from the previous bucket and the average point
+    of the next bucket is kept; the triangles are measured in the
+    plane of the path since a gaze path is plotted as Y against X
+
+    :param x_coords: X coordinates of the points of the path
+    :type x_coords: np.ndarray
+    :param y_coords: Y coordinates of the points of the path
+    :type y_coords: np.ndarray
+    :param num_points: number of points to keep
+    :type num_points: int
+    :return: positions of the points kept
+    :rtype: np.ndarray
+    """
+    num_all_points = x_coords.size
+    if num_points >= num_all_points:
+        return np.arange(num_all_points)
+    if num_points < 3:
+        return np.array([0, num_all_points - 1][:num_points], dtype=np.int64)
+
+    x_coords = x_coords.astype(np.float64)
+    y_coords = y_coords.astype(np.float64)
+    # each of the num_points - 2 buckets holds at least
+    # one point since they split num_all_points - 2 points
+    bucket_starts = np.linspace(1, num_all_points - 1, num_points - 1).astype(np.int64)
+    bucket_sizes = np.diff(bucket_starts)
+    bucket_x_means = np.add.reduceat(x_coords[:-1], bucket_starts[:-1]) / bucket_sizes
+    bucket_y_means = np.add.reduceat(y_coords[:-1], bucket_starts[:-1]) / bucket_sizes
+    # the last point stands in for the bucket after the last one
+    next_x_means = np.append(bucket_x_means[1:], x_coords[-1])
+    next_y_means = np.append(bucket_y_means[1:], y_coords[-1])
+
+    positions = np.empty(num_points, dtype=np.int64)
+    positions[0] = 0
+    positions[-1] = num_all_points - 1
+    prev_x, prev_y = x_coords[0], y_coords[0]
+    for bucket in range(num_points - 2):
+        start, stop = bucket_starts[bucket], bucket_starts[bucket + 1]
+        # twice the area of each triangle, which
+        # orders the triangles all the same
+        double_areas = np.abs(
+            (prev_x - next_x_means[bucket]) * (y_coords[start:stop] - prev_y) -
+            (prev_x - x_coords[start:stop]) * (next_y_means[bucket] - prev_y)
+        )
+        position = start + int(np.argmax(double_areas))
+        positions[bucket + 1] = position
+        prev_x, prev_y = x_coords[position], y_coords[position]
+    return positions
+
+
+def get_spatial_thinning_positions(x_coords: np.ndarray,
+                                   y_coords: np.ndarray,
+                                   num_points: int) -> np.ndarray:
+    """
+    Returns the ascending positions of at most the specified
+    number of points kept by spatial thinning: the bounding box
+    of the points is divided into the finest square grid whose
+    occupied cells do not outnumber the points to keep, and the
+    first point of each occupied cell is kept, so that dense
+    areas are thinned and sparse areas are kept as they are
+
+    :param x_coords: X coordinates of the points
+    :type x_coords: np.ndarray
+    :param y_coords: Y coordinates of the points
+    :type y_coords: np.ndarray
+    :param num_points: maximum number of points to keep
+    :type num_points: int
+    :return: positions of the points kept
+    :rtype: np.ndarray
+    """
+    if num_points >= x_coords.size:
+        return np.arange(x_coords.size)
+    if num_points <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    def get_cell_positions(grid_size):
+        x_cells = np.minimum((x_unit_coords * grid_size).astype(np.int64), grid_size - 1)
+        y_cells = np.minimum((y_unit_coords * grid_size).astype(np.int64), grid_size - 1)
+        return np.unique(x_cells * grid_size + y_cells, return_index=True)[1]
+
+    x_unit_coords = get_unit_coords(x_coords)
+    y_unit_coords = get_unit_coords(y_coords)
+    # a grid of at most num_points cells can never have too many
+    # occupied cells, so the finest acceptable grid is bisected for
+    min_grid_size = max(int(np.sqrt(num_points)), 1)
+    max_grid_size = num_points + 1
+    cell_positions = get_cell_positions(min_grid_size)
+    while max_grid_size - min_grid_size > 1:
+        grid_size = (min_grid_size + max_grid_size) // 2
+        grid_cell_positions = get_cell_positions(grid_size)
+        if grid_cell_positions.size <= num_points:
+            min_grid_size, cell_positions = grid_size, grid_cell_positions
+        else:
+            max_grid_size = grid_size
+    return np.sort(cell_positions)
+
+
+def get_unit_coords(coords: np.ndarray) -> np.ndarray:
+    """
+    Returns the specified coordinates scaled to the range [0, 1]
+
+    :param coords: target coordinates
+    :type coords: np.ndarray
+    :return: scaled coordinates
+    :rtype: np.ndarray
+    """
+    coords = coords.astype(np.float64)
+    coord_range = coords.max() - coords.min()
+    if coord_range <= 0:
+        return np.zeros(coords.size, dtype=np.float64)
+    return (coords - coords.min()) / coord_range
@@ -0,0 +1,337 @@
+"""
+Utility to handle fixation-detection-related tasks, i.e., those dealing
+with grouping the gaze points of eye-tracking data into fixations with
+a velocity-threshold (I-VT) or a dispersion-threshold (I-DT) algorithm
+instead of relying on the fixation points of the data files
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.main.config import FIXATION_DURATION_COL_TITLE
+from src.main.config import FIXATION_ID_COL_TITLE
+from src.main.config import IDT_DISPERSION_THRESHOLD
+from src.main.config import IVT_VELOCITY_THRESHOLD
+from src.main.config import MAX_FIXATION_GAP_MS
+from src.main.config import MIN_FIXATION_DURATION_MS
+from src.main.config import PARTICIPANT_FILENAME_COL_TITLE
+from src.main.config import PARTICIPANT_NAME_COL_TITLE
+from src.main.config import STIMULUS_COL_TITLE
+from src.main.config import STIMULUS_X_DISPLACEMENT_COL_TITLE
+from src.main.config import STIMULUS_Y_DISPLACEMENT_COL_TITLE
+from src.main.config import TIMESTAMP_COL_TITLE
+from src.main.config import VALIDITY_COL_TITLE
+from src.main.config import X_FIXATION_COL_TITLE
+from src.main.config import X_GAZE_COL_TITLE
+from src.main.config import Y_FIXATION_COL_TITLE
+from src.main.config import Y_GAZE_COL_TITLE
+from src.model.utils import fixation_utils
+from src.model.utils import kernel_utils
+from src.model.utils import model_utils
+
+IVT_ALGORITHM = 'I-VT'
+
+IDT_ALGORITHM = 'I-DT'
+
+# Numba signature of the I-DT kernel
+IDT_KERNEL_SIGNATURE = 'UniTuple(int64[:], 2)(float64[:], float64[:], float64[:], boolean[:], float64, float64)'
+
+# I-DT kernel, compiled with numba on first use if numba is available
+idt_kernel = None
+
+
+def detect_participants_fixations(participant_filenames: list,
+                                  get_participant_df,
+                                  algorithm: str,
+                                  num_workers: int = None,
+                                  **thresholds) -> list:
+    """
+    Detects the fixations of each of the specified participants
+    with the specified algorithm, concurrently in a pool of
+    threads (the detection runs in NumPy or in compiled code,
+    both of which release the GIL); each thread gets the data
+    of the participant it processes, so that only the data of
+    the participants being processed is held at once
+
+    :param participant_filenames: filenames of the participant data files
+    :type participant_filenames: list
+    :param get_participant_df: function returning the data
+        of a participant, given its filename
+    :type get_participant_df: callable
+    :param algorithm: IVT_ALGORITHM or IDT_ALGORITHM
+    :type algorithm: str
+    :param num_workers: number of threads, or None for one per available CPU
+    :type num_workers: int
+    :param thresholds: thresholds of the algorithm overriding the
+        configured ones, as keyword arguments of detect_participant_fixations
+    :return: fixation table of each participant, in the order of the filenames
+    :rtype: list
+    """
+    if algorithm == IDT_ALGORITHM:
+        # the kernel is compiled before the threads start
+        # so that they do not all compile it at once
+        get_idt_kernel()
+
+    def detect(participant_filename):
+        return detect_participant_fixations(get_participant_df(participant_filename), algorithm, **thresholds)
+
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        return list(executor.map(detect, participant_filenames))
+
+
+def detect_participant_fixations(participant_df: pd.DataFrame,
+                                 algorithm: str,
+                                 velocity_threshold: float = IVT_VELOCITY_THRESHOLD,
+                                 dispersion_threshold: float = IDT_DISPERSION_THRESHOLD,
+                                 min_duration: float = MIN_FIXATION_DURATION_MS,
+                                 max_gap: float = MAX_FIXATION_GAP_MS) -> pd.DataFrame:
+    """
+    Detects the fixations of the specified participant data with
+    the specified algorithm and returns its fixation table, with
+    the centroid of the gaze points of each fixation as its
+    fixation point; fixations do not span stimuli
+
+    :param participant_df: data of the participant, in recording order
+    :type participant_df: pd.DataFrame
+    :param algorithm: IVT_ALGORITHM or IDT_ALGORITHM
+    :type algorithm: str
+    :param velocity_threshold: maximum velocity (in pixels per
+        millisecond) between consecutive gaze points of a fixation (I-VT)
+    :type velocity_threshold: float
+    :param dispersion_threshold: maximum dispersion (in pixels)
+        of the gaze points of a fixation (I-DT)
+    :type dispersion_threshold: float
+    :param min_duration: minimum duration (in milliseconds) of a fixation
+    :type min_duration: float
+    :param max_gap: maximum time (in milliseconds) between
+        consecutive gaze points of a fixation
+    :type max_gap: float
+    :return: fixation table
+    :rtype: pd.DataFrame
+    """
+    if VALIDITY_COL_TITLE not in participant_df or STIMULUS_COL_TITLE not in participant_df:
+        return pd.DataFrame(columns=fixation_utils.FIXATION_COL_TITLES)
+    positions = model_utils.get_valid_positions(participant_df, model_utils.GAZE_VALIDITY_FLAG)
+    gaze_df = participant_df.iloc[positions[participant_df[STIMULUS_COL_TITLE].iloc[positions].notnull().to_numpy()]]
+    timestamps = gaze_df[TIMESTAMP_COL_TITLE].to_numpy(dtype=np.float64)
+    x_coords = gaze_df[X_GAZE_COL_TITLE].to_numpy(dtype=np.float64)
+    y_coords = gaze_df[Y_GAZE_COL_TITLE].to_numpy(dtype=np.float64)
+    is_break = get_gaze_breaks(timestamps, pd.factorize(gaze_df[STIMULUS_COL_TITLE])[0], max_gap)
+
+    if algorithm == IVT_ALGORITHM:
+        firsts, lasts = get_ivt_fixation_bounds(timestamps, x_coords, y_coords, is_break,
+                                                velocity_threshold, min_duration)
+    elif algorithm == IDT_ALGORITHM:
+        firsts, lasts = get_idt_kernel()(timestamps, x_coords, y_coords, is_break,
+                                         float(dispersion_threshold), float(min_duration))
+    else:
+        raise ValueError("Unknown fixation detection algorithm: {}".format(algorithm))
+    return build_detected_fixation_df(gaze_df, timestamps, x_coords, y_coords, firsts, lasts)
+
+
+def get_gaze_breaks(timestamps: np.ndarray,
+                    stimulus_codes: np.ndarray,
+                    max_gap: float) -> np.ndarray:
+    """
+    Returns, for each pair of consecutive gaze points, whether
+    a fixation cannot continue from the first to the second,
+    i.e., whether they are too far apart in time or belong
+    to different stimuli
+
+    :param timestamps: timestamps of the gaze points
+    :type timestamps: np.ndarray
+    :param stimulus_codes: codes identifying the stimulus of each gaze point
+    :type stimulus_codes: np.ndarray
+    :param max_gap: maximum time (in milliseconds) between
+        consecutive gaze points of a fixation
+    :type max_gap: float
+    :return: whether each pair of consecutive gaze points is a break
+    :rtype: np.ndarray
+    """
+    timestamp_deltas = np.diff(timestamps)
+    return (timestamp_deltas > max_gap) | (timestamp_deltas < 0) | \
+        (stimulus_codes[1:] != stimulus_codes[:-1])
+
+
+def get_ivt_fixation_bounds(timestamps: np.ndarray,
+                            x_coords: np.ndarray,
+                            y_coords: np.ndarray,
+                            is_break: np.ndarray,
+                            velocity_threshold: float,
+                            min_duration: float) -> tuple:
+    """
+    Returns the positions of the first and last gaze points of
+    each fixation detected by the I-VT algorithm: each maximal
+    run of consecutive gaze points moving slower than the
+    velocity threshold that lasts at least the minimum duration
+
+    :param timestamps: timestamps of the gaze points
+    :type timestamps: np.ndarray
+    :param x_coords: X coordinates of the gaze points
+    :type x_coords: np.ndarray
+    :param y_coords: Y coordinates of the gaze points
+    :type y_coords: np.ndarray
+    :param is_break: whether each pair of consecutive gaze points is a break
+    :type is_break: np.ndarray
+    :param velocity_threshold: maximum velocity (in pixels per
+        millisecond) between consecutive gaze points of a fixation
+    :type velocity_threshold: float
+    :param min_duration: minimum duration (in milliseconds) of a fixation
+    :type min_duration: float
+    :return: positions of the first and last gaze points of each fixation
+    :rtype: tuple
+    """
+    timestamp_deltas = np.diff(timestamps)
+    distances = np.hypot(np.diff(x_coords), np.diff(y_coords))
+    # a step is slow if it covers at most the distance
+    # allowed by the threshold in the time it takes,
+    # which also handles steps of zero time
+    is_slow_step = (distances <= velocity_threshold * timestamp_deltas) & ~is_break
+
+    # each run of slow steps joins the gaze points from
+    # its first step to the point after its last step
+    is_padded_slow_step = np.concatenate(([False], is_slow_step, [False]))
+    run_bounds = np.flatnonzero(np.diff(is_padded_slow_step.view(np.int8)))
+    firsts = run_bounds[0::2]
+    lasts = run_bounds[1::2]
+    is_long_enough = timestamps[lasts] - timestamps[firsts] >= min_duration
+    return firsts[is_long_enough], lasts[is_long_enough]
+
+
+def find_idt_fixation_bounds(timestamps: np.ndarray,
+                             x_coords: np.ndarray,
+                             y_coords: np.ndarray,
+                             is_break: np.ndarray,
+                             dispersion_threshold: float,
+                             min_duration: float) -> tuple:
+    """
+    Returns the positions of the first and last gaze points of
+    each fixation detected by the I-DT algorithm: a window of
+    gaze points spanning the minimum duration starts a fixation
+    if its dispersion is within the threshold, and is then
+    extended for as long as the dispersion stays within it;
+    otherwise, the window slides by one gaze point. Written as
+    plain loops so that numba can compile it (see get_idt_kernel)
+
+    :param timestamps: timestamps of the gaze points
+    :type timestamps: np.ndarray
+    :param x_coords: X coordinates of the gaze points
+    :type x_coords: np.ndarray
+    :param y_coords: Y coordinates of the gaze points
+    :type y_coords: np.ndarray
+    :param is_break: whether each pair of consecutive gaze points is a break
+    :type is_break: np.ndarray
+    :param dispersion_threshold: maximum dispersion (in pixels),
+        i.e., the sum of the width and height of the bounding box,
+        of the gaze points of a fixation
+    :type dispersion_threshold: float
+    :param min_duration: minimum duration (in milliseconds) of a fixation
+    :type min_duration: float
+    :return: positions of the first and last gaze points of each fixation
+    :rtype: tuple
+    """
+    num_points = timestamps.size
+    firsts = np.empty(num_points, dtype=np.int64)
+    lasts = np.empty(num_points, dtype=np.int64)
+    num_fixations = 0
+    first = 0
+    while first < num_points:
+        last = first
+        min_x = max_x = x_coords[first]
+        min_y = max_y = y_coords[first]
+        while last + 1 < num_points and not is_break[last] and \
+                timestamps[last] - timestamps[first] < min_duration:
+            last += 1
+            min_x = min(min_x, x_coords[last])
+            max_x = max(max_x, x_coords[last])
+            min_y = min(min_y, y_coords[last])
+            max_y = max(max_y, y_coords[last])
+        if timestamps[last] - timestamps[first] < min_duration or \
+                (max_x - min_x) + (max_y - min_y) > dispersion_threshold:
+            first += 1
+            continue
+        while last + 1 < num_points and not is_break[last]:
+            next_x = x_coords[last + 1]
+            next_y = y_coords[last + 1]
+            if (max(max_x, next_x) - min(min_x, next_x)) + \
+                    (max(max_y, next_y) - min(min_y, next_y)) > dispersion_threshold:
+                break
+            last += 1
+            min_x = min(min_x, next_x)
+            max_x = max(max_x, next_x)
+            min_y = min(min_y, next_y)
+            max_y = max(max_y, next_y)
+        firsts[num_fixations] = first
+        lasts[num_fixations] = last
+        num_fixations += 1
+        first = last + 1
+    return firsts[:num_fixations], lasts[:num_fixations]
+
+
+def get_idt_kernel():
+    """
+    Returns find_idt_fixation_bounds compiled with numba (without
+    holding the GIL, so that participants can be processed by
+    concurrent threads), compiling it on first use; if numba is
+    not available, returns it uncompiled
+
+    :return: I-DT kernel
+    :rtype: callable
+    """
+    global idt_kernel
+    if idt_kernel is None:
+        # the signature is given so that the kernel is compiled
+        # (or loaded from the on-disk cache) right away
+        idt_kernel = kernel_utils.compile_kernel(find_idt_fixation_bounds, IDT_KERNEL_SIGNATURE)
+    return idt_kernel
+
+
+def build_detected_fixation_df(gaze_df: pd.DataFrame,
+                               timestamps: np.ndarray,
+                               x_coords: np.ndarray,
+                               y_coords: np.ndarray,
+                               firsts: np.ndarray,
+                               lasts: np.ndarray) -> pd.DataFrame:
+    """
+    Returns the fixation table of the specified detected fixations,
+    shaped as the fixation table of fixation_utils.build_fixation_df;
+    as the fixation points of the data files, the fixation points
+    are in the coordinates of the stimulus image, i.e., relative
+    to its position (media position) at the start of the fixation
+
+    :param gaze_df: gaze points of the participant
+    :type gaze_df: pd.DataFrame
+    :param timestamps: timestamps of the gaze points
+    :type timestamps: np.ndarray
+    :param x_coords: X coordinates of the gaze points
+    :type x_coords: np.ndarray
+    :param y_coords: Y coordinates of the gaze points
+    :type y_coords: np.ndarray
+    :param firsts: positions of the first gaze point of each fixation
+    :type firsts: np.ndarray
+    :param lasts: positions of the last gaze point of each fixation
+    :type lasts: np.ndarray
+    :return: fixation table
+    :rtype: pd.DataFrame
+    """
+    num_points = lasts - firsts + 1
+    cumulative_x_coords = np.concatenate(([0], np.cumsum(x_coords)))
+    cumulative_y_coords = np.concatenate(([0], np.cumsum(y_coords)))
+    fixation_df = pd.DataFrame({
+        FIXATION_ID_COL_TITLE: np.arange(firsts.size, dtype=np.int32)
+    })
+    for col_title in [PARTICIPANT_NAME_COL_TITLE, PARTICIPANT_FILENAME_COL_TITLE, STIMULUS_COL_TITLE]:
+        if col_title in gaze_df:
+            fixation_df[col_title] = gaze_df[col_title].iloc[firsts].reset_index(drop=True)
+    media_positions = [
+        np.nan_to_num(gaze_df[col_title].to_numpy(dtype=np.float64)[firsts]) if col_title in gaze_df else 0
+        for col_title in [STIMULUS_X_DISPLACEMENT_COL_TITLE, STIMULUS_Y_DISPLACEMENT_COL_TITLE]
+    ]
+    fixation_df[X_FIXATION_COL_TITLE] = \
+        (cumulative_x_coords[lasts + 1] - cumulative_x_coords[firsts]) / num_points - media_positions[0]
+    fixation_df[Y_FIXATION_COL_TITLE] = \
+        (cumulative_y_coords[lasts + 1] - cumulative_y_coords[firsts]) / num_points - media_positions[1]
+    fixation_df[TIMESTAMP_COL_TITLE] = gaze_df[TIMESTAMP_COL_TITLE].iloc[firsts].reset_index(drop=True)
+    fixation_df[FIXATION_DURATION_COL_TITLE] = timestamps[lasts] - timestamps[firsts]
+    return fixation_df
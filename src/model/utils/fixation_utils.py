@@ -0,0 +1,164 @@
+"""
+Utility to handle fixation-related tasks, i.e., those dealing with
+grouping the observations of eye-tracking data into fixations
+"""
+import numpy as np
+import pandas as pd
+
+from src.main.config import FIXATION_DURATION_COL_TITLE
+from src.main.config import FIXATION_ID_COL_TITLE
+from src.main.config import PARTICIPANT_FILENAME_COL_TITLE
+from src.main.config import PARTICIPANT_NAME_COL_TITLE
+from src.main.config import STIMULUS_COL_TITLE
+from src.main.config import TIMESTAMP_COL_TITLE
+from src.main.config import VALIDITY_COL_TITLE
+from src.main.config import X_FIXATION_COL_TITLE
+from src.main.config import Y_FIXATION_COL_TITLE
+from src.model.utils import model_utils
+
+# Columns of the fixation table, in order; the timestamp
+# column holds the timestamp of the start of each fixation
+FIXATION_COL_TITLES = [
+    FIXATION_ID_COL_TITLE,
+    PARTICIPANT_NAME_COL_TITLE,
+    PARTICIPANT_FILENAME_COL_TITLE,
+    STIMULUS_COL_TITLE,
+    X_FIXATION_COL_TITLE,
+    Y_FIXATION_COL_TITLE,
+    TIMESTAMP_COL_TITLE,
+    FIXATION_DURATION_COL_TITLE
+]
+
+
+def get_fixation_starts(x_coords: np.ndarray,
+                        y_coords: np.ndarray,
+                        group_codes: np.ndarray) -> np.ndarray:
+    """
+    Returns the positions of the observations that start a
+    fixation, i.e., the first observation of each run of
+    consecutive observations of a group (e.g., a participant)
+    with the same fixation point; the coordinates must
+    not be missing
+
+    :param x_coords: X coordinates of the fixation points
+    :type x_coords: np.ndarray
+    :param y_coords: Y coordinates of the fixation points
+    :type y_coords: np.ndarray
+    :param group_codes: codes identifying the group of each
+        observation; fixations do not span groups
+    :type group_codes: np.ndarray
+    :return: ascending positions of the first observation of each fixation
+    :rtype: np.ndarray
+    """
+    if x_coords.size == 0:
+        return np.empty(0, dtype=np.int64)
+    is_fixation_start = np.empty(x_coords.size, dtype=bool)
+    is_fixation_start[0] = True
+    np.not_equal(x_coords[1:], x_coords[:-1], out=is_fixation_start[1:])
+    is_fixation_start[1:] |= y_coords[1:] != y_coords[:-1]
+    is_fixation_start[1:] |= group_codes[1:] != group_codes[:-1]
+    return np.flatnonzero(is_fixation_start)
+
+
+def get_fixation_durations(timestamps: np.ndarray,
+                           fixation_starts: np.ndarray) -> np.ndarray:
+    """
+    Returns the duration of each fixation, i.e., the sum of
+    the time elapsed between its consecutive observations
+
+    :param timestamps: timestamps of the observations
+    :type timestamps: np.ndarray
+    :param fixation_starts: ascending positions of the first
+        observation of each fixation
+    :type fixation_starts: np.ndarray
+    :return: duration of each fixation
+    :rtype: np.ndarray
+    """
+    if fixation_starts.size == 0:
+        return np.empty(0, dtype=np.float64)
+    timestamp_deltas = np.diff(timestamps.astype(np.float64), prepend=np.nan)
+    # time elapsed before the first observation of a
+    # fixation does not count towards its duration
+    timestamp_deltas[fixation_starts] = 0
+    return np.add.reduceat(timestamp_deltas, fixation_starts)
+
+
+def scale_point_sizes(fixation_durations: np.ndarray,
+                      max_point_size: float) -> np.ndarray:
+    """
+    Returns the size of the point of each fixation, proportional
+    to its duration so that the longest fixation has the
+    specified maximum size
+
+    :param fixation_durations: duration of each fixation
+    :type fixation_durations: np.ndarray
+    :param max_point_size: size of the point of the longest fixation
+    :type max_point_size: float
+    :return: size of the point of each fixation
+    :rtype: np.ndarray
+    """
+    max_fixation_duration = fixation_durations.max() if fixation_durations.size > 0 else 0
+    if max_fixation_duration <= 0:
+        return np.zeros(fixation_durations.size, dtype=np.float64)
+    return fixation_durations * (max_point_size / max_fixation_duration)
+
+
+def get_fixation_observations(participant_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns the observations of the specified participant data
+    that can be part of a fixation, i.e., those that are valid
+    fixation observations and have a stimulus
+
+    :param participant_df: data of the participant
+    :type participant_df: pd.DataFrame
+    :return: observations that can be part of a fixation
+    :rtype: pd.DataFrame
+    """
+    if VALIDITY_COL_TITLE not in participant_df or STIMULUS_COL_TITLE not in participant_df:
+        return participant_df.iloc[0:0]
+    positions = model_utils.get_valid_positions(participant_df, model_utils.FIXATION_VALIDITY_FLAG)
+    return participant_df.iloc[positions[participant_df[STIMULUS_COL_TITLE].iloc[positions].notnull().to_numpy()]]
+
+
+def get_observation_fixation_starts(observations_df: pd.DataFrame) -> np.ndarray:
+    """
+    Returns the positions of the specified observations of a
+    participant that start a fixation; fixations do not span
+    stimuli
+
+    :param observations_df: observations that can be part of a fixation
+    :type observations_df: pd.DataFrame
+    :return: ascending positions of the first observation of each fixation
+    :rtype: np.ndarray
+    """
+    return get_fixation_starts(
+        observations_df[X_FIXATION_COL_TITLE].to_numpy(),
+        observations_df[Y_FIXATION_COL_TITLE].to_numpy(),
+        pd.factorize(observations_df[STIMULUS_COL_TITLE])[0]
+    )
+
+
+def build_fixation_df(observations_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns the fixation table of the specified observations
+    of a participant, with one row per fixation giving its
+    ordinal, participant, stimulus, fixation point, start
+    timestamp and duration
+
+    :param observations_df: observations that can be part of a fixation
+    :type observations_df: pd.DataFrame
+    :return: fixation table
+    :rtype: pd.DataFrame
+    """
+    fixation_starts = get_observation_fixation_starts(observations_df)
+    fixation_df = pd.DataFrame({
+        FIXATION_ID_COL_TITLE: np.arange(fixation_starts.size, dtype=np.int32)
+    })
+    for col_title in [PARTICIPANT_NAME_COL_TITLE, PARTICIPANT_FILENAME_COL_TITLE, STIMULUS_COL_TITLE,
+                      X_FIXATION_COL_TITLE, Y_FIXATION_COL_TITLE, TIMESTAMP_COL_TITLE]:
+        if col_title in observations_df:
+            fixation_df[col_title] = observations_df[col_title].iloc[fixation_starts].reset_index(drop=True)
+    fixation_df[FIXATION_DURATION_COL_TITLE] = get_fixation_durations(
+        observations_df[TIMESTAMP_COL_TITLE].to_numpy(), fixation_starts
+    )
+    return fixation_df
@@ -1,10 +1,11 @@
 """
 Utility to handle image-related tasks, i.e., those dealing with stimulus images
 """
+import base64
+import io
 import os
 
 import numpy as np
-from matplotlib import pyplot as plt
 
 from src.main.config import RELATIVE_STIMULUS_IMAGE_DIR
 
@@ -23,6 +24,8 @@ def import_img_2d_rgb_arr(img_filename,
         :return: 2D array of RGB values of stimulus
         :rtype: np.array
         """
+    from matplotlib import pyplot as plt  # imported on first use to speed up startup
+
     return plt.imread(
         str(img_relative_dir + "/" + \
             img_filename)
@@ -44,8 +47,41 @@ def img_exists(img_filename: str,
         the relative image (or stimuli) directory
     :rtype: bool
     """
-    return os.path.exists(
-        str(os.path.dirname(os.path.realpath(__file__)) + \
-            img_relative_dir + \
-            img_filename)
-    )
+    return os.path.isfile(os.path.join(img_relative_dir, img_filename))
+
+
+def read_img_size(img_path: str) -> tuple:
+    """
+    Returns the width and height (in pixels) of the specified
+    image, read from its header without decoding its pixels
+
+    :param img_path: path of the image
+    :type img_path: str
+    :return: width and height of the image
+    :rtype: tuple
+    """
+    from PIL import Image  # imported on first use to speed up startup
+
+    with Image.open(img_path) as img:
+        return img.size
+
+
+def encode_img_png(img_path: str, make_grayscale: bool = False) -> str:
+    """
+    Returns the specified image encoded as a base64 PNG
+    data URI, which can be embedded in a figure
+
+    :param img_path: path of the image
+    :type img_path: str
+    :param make_grayscale: whether to convert the image to grayscale
+    :type make_grayscale: bool
+    :return: data URI of the image
+    :rtype: str
+    """
+    from PIL import Image, ImageOps  # imported on first use to speed up startup
+
+    with Image.open(img_path) as img:
+        img = ImageOps.grayscale(img) if make_grayscale else img
+        png_buffer = io.BytesIO()
+        img.save(png_buffer, format='PNG')
+    return "data:image/png;base64,{}".format(base64.b64encode(png_buffer.getvalue()).decode())
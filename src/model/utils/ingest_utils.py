@@ -0,0 +1,320 @@
+"""
+Utility to handle ingest-related tasks, i.e., those dealing with
+reading the eye-tracking data files into pandas DataFrame objects
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from src.main.config import NUM_INGEST_WORKERS
+from src.main.config import PARTICIPANT_FILENAME_COL_TITLE
+from src.main.config import PARTICIPANT_NAME_COL_TITLE
+from src.main.config import RELATIVE_DATA_DIR
+from src.main.config import STIMULUS_COL_TITLE
+from src.main.config import STIMULUS_X_DISPLACEMENT_COL_TITLE
+from src.main.config import STIMULUS_Y_DISPLACEMENT_COL_TITLE
+from src.main.config import TIMESTAMP_COL_TITLE
+from src.main.config import USE_PARALLEL_INGEST
+from src.main.config import VALIDITY_COL_TITLE
+from src.main.config import X_FIXATION_COL_TITLE
+from src.main.config import X_GAZE_COL_TITLE
+from src.main.config import Y_FIXATION_COL_TITLE
+from src.main.config import Y_GAZE_COL_TITLE
+from src.model.utils import fixation_utils
+from src.model.utils import model_utils
+
+# Columns of the data files that are stored as integers
+# (if possible without loss of precision)
+INTEGER_COL_TITLES = [TIMESTAMP_COL_TITLE]
+
+# Columns of the data files that are stored as single-precision
+# floats (if possible without loss of precision)
+FLOAT_COL_TITLES = [
+    STIMULUS_X_DISPLACEMENT_COL_TITLE,
+    STIMULUS_Y_DISPLACEMENT_COL_TITLE,
+    X_FIXATION_COL_TITLE,
+    Y_FIXATION_COL_TITLE,
+    X_GAZE_COL_TITLE,
+    Y_GAZE_COL_TITLE
+]
+
+# Columns of the data files that are stored as categoricals
+CATEGORICAL_COL_TITLES = [PARTICIPANT_NAME_COL_TITLE, STIMULUS_COL_TITLE]
+
+# Columns of the data files that are read; every other
+# column of the data files is skipped while parsing
+INGEST_COL_TITLES = INTEGER_COL_TITLES + FLOAT_COL_TITLES + CATEGORICAL_COL_TITLES
+
+
+def get_participant_file_path(participant_filename: str,
+                              data_relative_dir: str = RELATIVE_DATA_DIR) -> str:
+    """
+    Returns the path of the specified participant
+    data file within the specified data directory
+
+    :param participant_filename: filename of the participant data file
+    :type participant_filename: str
+    :param data_relative_dir: directory containing the data files
+    :type data_relative_dir: str
+    :return: path of the participant data file
+    :rtype: str
+    """
+    return os.path.join(data_relative_dir, participant_filename)
+
+
+def read_participant_file(participant_filename: str,
+                          data_relative_dir: str = RELATIVE_DATA_DIR) -> pd.DataFrame:
+    """
+    Parses the configured columns of the specified participant
+    data file into compact dtypes and tags every observation
+    with the participant filename and its validity flags
+
+    :param participant_filename: filename of the participant data file
+    :type participant_filename: str
+    :param data_relative_dir: directory containing the data files
+    :type data_relative_dir: str
+    :return: data of the participant
+    :rtype: pd.DataFrame
+    """
+    participant_df = pd.read_csv(
+        get_participant_file_path(participant_filename, data_relative_dir),
+        sep='\t',
+        usecols=lambda col_title: col_title in INGEST_COL_TITLES,
+        dtype={col_title: 'category' for col_title in CATEGORICAL_COL_TITLES}
+    )
+    return compact_participant_df(participant_df, participant_filename)
+
+
+def read_participant_tables(participant_filename: str,
+                            data_relative_dir: str = RELATIVE_DATA_DIR) -> tuple:
+    """
+    Parses the specified participant data file and derives
+    its fixation table from the parsed data
+
+    :param participant_filename: filename of the participant data file
+    :type participant_filename: str
+    :param data_relative_dir: directory containing the data files
+    :type data_relative_dir: str
+    :return: data of the participant and its fixation table
+    :rtype: tuple
+    """
+    participant_df = read_participant_file(participant_filename, data_relative_dir)
+    fixation_df = fixation_utils.build_fixation_df(fixation_utils.get_fixation_observations(participant_df))
+    return participant_df, fixation_df
+
+
+def read_participant_file_chunks(participant_filename: str,
+                                 chunk_num_rows: int,
+                                 data_relative_dir: str = RELATIVE_DATA_DIR):
+    """
+    Parses the configured columns of the specified participant
+    data file into compact dtypes chunk by chunk, so that only
+    one chunk of the data file is held in memory at a time
+
+    :param participant_filename: filename of the participant data file
+    :type participant_filename: str
+    :param chunk_num_rows: number of rows per chunk
+    :type chunk_num_rows: int
+    :param data_relative_dir: directory containing the data files
+    :type data_relative_dir: str
+    :return: generator of the data of the participant, chunk by chunk
+    :rtype: generator
+    """
+    with pd.read_csv(
+            get_participant_file_path(participant_filename, data_relative_dir),
+            sep='\t',
+            usecols=lambda col_title: col_title in INGEST_COL_TITLES,
+            dtype={col_title: 'category' for col_title in CATEGORICAL_COL_TITLES},
+            chunksize=chunk_num_rows
+    ) as reader:
+        for chunk_df in reader:
+            yield compact_participant_df(chunk_df, participant_filename)
+
+
+def read_participant_files(participant_filenames: list,
+                           use_parallel_ingest: bool = USE_PARALLEL_INGEST,
+                           num_workers: int = NUM_INGEST_WORKERS,
+                           progress_callback=None) -> list:
+    """
+    Parses the specified participant data files and derives
+    their fixation tables, concurrently in a pool of worker
+    processes or serially in this process, and returns their
+    data and fixation tables in the order of the filenames
+
+    :param participant_filenames: filenames of the participant data files
+    :type participant_filenames: list
+    :param use_parallel_ingest: whether to parse the data files concurrently
+    :type use_parallel_ingest: bool
+    :param num_workers: number of worker processes, or None
+        for one per available CPU
+    :type num_workers: int
+    :param progress_callback: None, or a function called with the
+        number of data files parsed so far after each data file is parsed
+    :type progress_callback: callable
+    :return: data and fixation table of each participant
+    :rtype: list
+    """
+    return map_participant_files(read_participant_tables, participant_filenames,
+                                 use_parallel_ingest=use_parallel_ingest,
+                                 num_workers=num_workers,
+                                 progress_callback=progress_callback)
+
+
+def map_participant_files(func,
+                          participant_filenames: list,
+                          use_parallel_ingest: bool = USE_PARALLEL_INGEST,
+                          num_workers: int = NUM_INGEST_WORKERS,
+                          progress_callback=None) -> list:
+    """
+    Applies the specified function to each of the specified
+    participant filenames, concurrently in a pool of worker
+    processes or serially in this process, and returns the
+    results in the order of the filenames
+
+    :param func: picklable function of a participant filename
+    :type func: callable
+    :param participant_filenames: filenames of the participant data files
+    :type participant_filenames: list
+    :param use_parallel_ingest: whether to process the data files concurrently
+    :type use_parallel_ingest: bool
+    :param num_workers: number of worker processes, or None
+        for one per available CPU
+    :type num_workers: int
+    :param progress_callback: None, or a function called with the
+        number of data files processed so far after each data file is processed
+    :type progress_callback: callable
+    :return: result of the function for each participant
+    :rtype: list
+    """
+    num_workers = get_num_workers(participant_filenames, use_parallel_ingest, num_workers)
+    if num_workers <= 1:
+        results = []
+        for participant_filename in participant_filenames:
+            results.append(func(participant_filename))
+            if progress_callback is not None:
+                progress_callback(len(results))
+        return results
+    # worker processes are spawned rather than forked so that
+    # they do not inherit the state of the GUI's threads
+    with ProcessPoolExecutor(max_workers=num_workers,
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = [executor.submit(func, participant_filename)
+                   for participant_filename in participant_filenames]
+        if progress_callback is not None:
+            for num_processed, _ in enumerate(as_completed(futures), start=1):
+                progress_callback(num_processed)
+        return [future.result() for future in futures]
+
+
+def get_num_workers(participant_filenames: list,
+                    use_parallel_ingest: bool = USE_PARALLEL_INGEST,
+                    num_workers: int = NUM_INGEST_WORKERS) -> int:
+    """
+    Returns the number of worker processes that process
+    the specified participant data files concurrently
+
+    :param participant_filenames: filenames of the participant data files
+    :type participant_filenames: list
+    :param use_parallel_ingest: whether to process the data files concurrently
+    :type use_parallel_ingest: bool
+    :param num_workers: number of worker processes, or None
+        for one per available CPU
+    :type num_workers: int
+    :return: number of worker processes, 1 if processing serially
+    :rtype: int
+    """
+    if not use_parallel_ingest:
+        return 1
+    return max(min(num_workers or os.cpu_count() or 1, len(participant_filenames)), 1)
+
+
+def compact_participant_df(participant_df: pd.DataFrame,
+                           participant_filename: str) -> pd.DataFrame:
+    """
+    Converts the columns of the specified participant data
+    into their compact dtypes where that is lossless and tags
+    every observation with the participant filename and its
+    validity flags
+
+    :param participant_df: data of the participant
+    :type participant_df: pd.DataFrame
+    :param participant_filename: filename of the participant data file
+    :type participant_filename: str
+    :return: compacted data of the participant
+    :rtype: pd.DataFrame
+    """
+    for col_title in INTEGER_COL_TITLES:
+        if col_title in participant_df:
+            participant_df[col_title] = downcast_col(participant_df[col_title], np.int32)
+    for col_title in FLOAT_COL_TITLES:
+        if col_title in participant_df:
+            participant_df[col_title] = downcast_col(participant_df[col_title], np.float32)
+    participant_df[PARTICIPANT_FILENAME_COL_TITLE] = pd.Categorical.from_codes(
+        np.zeros(len(participant_df.index), dtype=np.int8),
+        categories=[participant_filename]
+    )
+    participant_df[VALIDITY_COL_TITLE] = model_utils.get_validity_flags(participant_df)
+    return participant_df
+
+
+def downcast_col(col: pd.Series, dtype: type) -> pd.Series:
+    """
+    Returns the specified column converted to the specified
+    dtype if no value changes in the conversion; otherwise,
+    returns the column unchanged
+
+    :param col: target column
+    :type col: pd.Series
+    :param dtype: compact dtype of the column
+    :type dtype: type
+    :return: result column
+    :rtype: pd.Series
+    """
+    values = col.to_numpy()
+    if not np.issubdtype(values.dtype, np.number):
+        return col
+    if np.issubdtype(dtype, np.integer) and \
+            (not np.isfinite(values).all() or
+             (values.size > 0 and
+              (values.min() < np.iinfo(dtype).min or values.max() > np.iinfo(dtype).max))):
+        return col
+    with np.errstate(invalid='ignore', over='ignore'):
+        compact_values = values.astype(dtype)
+    if not np.array_equal(compact_values.astype(values.dtype), values,
+                          equal_nan=np.issubdtype(values.dtype, np.floating)):
+        return col
+    return pd.Series(compact_values, index=col.index, name=col.name)
+
+
+def concat_participant_dfs(participant_dfs: list) -> pd.DataFrame:
+    """
+    Concatenates the data of the specified participants,
+    unifying the categories of the categorical columns
+    beforehand so that they remain categorical
+
+    :param participant_dfs: data of each participant
+    :type participant_dfs: list
+    :return: complete data
+    :rtype: pd.DataFrame
+    """
+    # shallow copies are taken so that replacing the categorical
+    # columns below leaves the specified DataFrame objects intact
+    participant_dfs = [participant_df.copy(deep=False) for participant_df in participant_dfs]
+    for col_title in CATEGORICAL_COL_TITLES + [PARTICIPANT_FILENAME_COL_TITLE]:
+        categorical_dfs = [participant_df for participant_df in participant_dfs
+                           if col_title in participant_df and
+                           isinstance(participant_df[col_title].dtype, pd.CategoricalDtype)]
+        if len(categorical_dfs) == 0:
+            continue
+        categories = union_categoricals(
+            [participant_df[col_title] for participant_df in categorical_dfs],
+            sort_categories=True
+        ).remove_unused_categories().categories
+        for participant_df in categorical_dfs:
+            participant_df[col_title] = participant_df[col_title].cat.set_categories(categories)
+    return pd.concat(participant_dfs)
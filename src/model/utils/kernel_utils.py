@@ -0,0 +1,690 @@
+"""
+Utility to handle compiled-kernel-related tasks, i.e., those dealing
+with the tight loops of the cluster analysis, each of which is compiled
+with numba (and cached on disk, so that it is compiled only once across
+launches) if numba is available and otherwise falls back to NumPy
+"""
+import threading
+import warnings
+
+import numpy as np
+
+COLLAPSE_KERNEL = 'collapse_label_runs'
+
+PAIR_COUNT_KERNEL = 'count_ordered_pairs'
+
+EXCEEDANCE_KERNEL = 'count_exceeding_trials'
+
+DBSCAN_KERNEL = 'expand_dbscan_clusters'
+
+GRID_DBSCAN_KERNEL = 'cluster_grid_dbscan'
+
+# Signature of each kernel, given so that the kernel is compiled
+# (or loaded from the on-disk cache) as soon as it is requested
+KERNEL_SIGNATURES = {
+    COLLAPSE_KERNEL: 'UniTuple(int64[:], 2)(int64[:], int64[:])',
+    PAIR_COUNT_KERNEL: 'Tuple((int64[:, :], int64[:]))(int64[:], int64[:], int64)',
+    EXCEEDANCE_KERNEL: 'int64[:, :](int64[:, :], int64[:], int64[:, :])',
+    DBSCAN_KERNEL: 'int64[:](int64[:], int64[:], float64[:], float64[:], float64, int64)',
+    GRID_DBSCAN_KERNEL: 'int64[:](float64[:], float64[:], float64[:], int64[:], int64[:], int64[:], int64, float64, int64)'
+}
+
+# kernels compiled with numba (or their NumPy fallbacks if numba
+# is not available), keyed by name, compiled on first use
+kernels = {}
+
+kernels_lock = threading.Lock()
+
+
+def get_kernel(name: str):
+    """
+    Returns the specified kernel compiled with numba, compiling it
+    (or loading it from the on-disk cache) on first use; if numba
+    is not available, returns its NumPy fallback
+
+    :param name: COLLAPSE_KERNEL, PAIR_COUNT_KERNEL, EXCEEDANCE_KERNEL,
+        DBSCAN_KERNEL or GRID_DBSCAN_KERNEL
+    :type name: str
+    :return: kernel
+    :rtype: callable
+    """
+    with kernels_lock:
+        if name not in kernels:
+            kernels[name] = compile_kernel(KERNEL_LOOPS[name], KERNEL_SIGNATURES[name], KERNEL_FALLBACKS[name])
+        return kernels[name]
+
+
+def load_kernels() -> None:
+    """
+    Compiles (or loads from the on-disk cache) every
+    kernel so that none is compiled on first use
+    """
+    for name in KERNEL_SIGNATURES.keys():
+        get_kernel(name)
+
+
+def compile_kernel(loop_func, signature: str, fallback_func=None):
+    """
+    Returns the specified function compiled with numba for the
+    specified signature, without holding the GIL and cached on
+    disk; if numba is not available, or cannot compile the function
+    (or load it from a corrupt on-disk cache), returns the fallback
+    (or the function itself, uncompiled, if there is no fallback)
+
+    :param loop_func: function written in plain loops
+    :type loop_func: callable
+    :param signature: numba signature of the function
+    :type signature: str
+    :param fallback_func: function to use if numba is not available
+    :type fallback_func: callable
+    :return: compiled function, or fallback
+    :rtype: callable
+    """
+    try:
+        import numba  # imported on first use to speed up startup
+    except ImportError:
+        return loop_func if fallback_func is None else fallback_func
+    try:
+        return numba.njit(signature, nogil=True, cache=True)(loop_func)
+    except Exception as exception:
+        warnings.warn("{} could not be compiled, so its fallback is used: {}".format(loop_func.__name__, exception))
+        return loop_func if fallback_func is None else fallback_func
+
+
+def collapse_label_runs_loop(labels: np.ndarray, group_codes: np.ndarray) -> tuple:
+    """
+    Returns the sequence of labels of each group (e.g., the cluster
+    sequence of each participant), i.e., the specified labels
+    without the negative ones (e.g., noise) and with each run of
+    equal consecutive labels of a group collapsed to one label,
+    along with the group code of each label kept; the labels
+    must be ordered by group. Written in plain loops so that
+    numba can compile it (see get_kernel)
+
+    :param labels: label of each point
+    :type labels: np.ndarray
+    :param group_codes: code identifying the group of each point
+    :type group_codes: np.ndarray
+    :return: labels kept and their group codes
+    :rtype: tuple
+    """
+    kept_labels = np.empty(labels.size, dtype=np.int64)
+    kept_group_codes = np.empty(labels.size, dtype=np.int64)
+    num_kept = 0
+    for position in range(labels.size):
+        label = labels[position]
+        if label < 0:
+            continue
+        if num_kept > 0 and kept_labels[num_kept - 1] == label and \
+                kept_group_codes[num_kept - 1] == group_codes[position]:
+            continue
+        kept_labels[num_kept] = label
+        kept_group_codes[num_kept] = group_codes[position]
+        num_kept += 1
+    return kept_labels[:num_kept].copy(), kept_group_codes[:num_kept].copy()
+
+
+def collapse_label_runs(labels: np.ndarray, group_codes: np.ndarray) -> tuple:
+    """
+    NumPy version of collapse_label_runs_loop
+
+    :param labels: label of each point
+    :type labels: np.ndarray
+    :param group_codes: code identifying the group of each point
+    :type group_codes: np.ndarray
+    :return: labels kept and their group codes
+    :rtype: tuple
+    """
+    is_labeled = labels >= 0
+    labels = labels[is_labeled]
+    group_codes = group_codes[is_labeled]
+    is_kept = np.ones(labels.size, dtype=bool)
+    is_kept[1:] = (labels[1:] != labels[:-1]) | (group_codes[1:] != group_codes[:-1])
+    return labels[is_kept].astype(np.int64), group_codes[is_kept].astype(np.int64)
+
+
+def count_ordered_pairs_loop(labels: np.ndarray,
+                             sequence_starts: np.ndarray,
+                             num_labels: int) -> tuple:
+    """
+    Returns the number of the specified sequences of labels in
+    which each label occurs before each label (the count of each
+    ordered pair, i.e., ordinal association rule) and in which each
+    label occurs; negative labels are skipped. A sequence contains
+    the pair (a, b) if and only if the first occurrence of a is
+    before the last occurrence of b. Written in plain loops so
+    that numba can compile it (see get_kernel)
+
+    :param labels: labels of the sequences, concatenated
+    :type labels: np.ndarray
+    :param sequence_starts: ascending positions of the first label of each sequence
+    :type sequence_starts: np.ndarray
+    :param num_labels: number of labels, i.e., one more than the largest label
+    :type num_labels: int
+    :return: count of each pair (indexed by the labels) and of each label
+    :rtype: tuple
+    """
+    pair_counts = np.zeros((num_labels, num_labels), dtype=np.int64)
+    label_counts = np.zeros(num_labels, dtype=np.int64)
+    firsts = np.full(num_labels, -1, dtype=np.int64)
+    lasts = np.full(num_labels, -1, dtype=np.int64)
+    present_labels = np.empty(num_labels, dtype=np.int64)
+    for sequence in range(sequence_starts.size):
+        start = sequence_starts[sequence]
+        stop = sequence_starts[sequence + 1] if sequence + 1 < sequence_starts.size else labels.size
+        num_present = 0
+        for position in range(start, stop):
+            label = labels[position]
+            if label < 0:
+                continue
+            if firsts[label] < 0:
+                firsts[label] = position
+                present_labels[num_present] = label
+                num_present += 1
+            lasts[label] = position
+        for first_num in range(num_present):
+            first_label = present_labels[first_num]
+            label_counts[first_label] += 1
+            for last_num in range(num_present):
+                last_label = present_labels[last_num]
+                if firsts[first_label] < lasts[last_label]:
+                    pair_counts[first_label, last_label] += 1
+        for first_num in range(num_present):
+            firsts[present_labels[first_num]] = -1
+    return pair_counts, label_counts
+
+
+def count_ordered_pairs(labels: np.ndarray,
+                        sequence_starts: np.ndarray,
+                        num_labels: int) -> tuple:
+    """
+    NumPy version of count_ordered_pairs_loop
+
+    :param labels: labels of the sequences, concatenated
+    :type labels: np.ndarray
+    :param sequence_starts: ascending positions of the first label of each sequence
+    :type sequence_starts: np.ndarray
+    :param num_labels: number of labels, i.e., one more than the largest label
+    :type num_labels: int
+    :return: count of each pair (indexed by the labels) and of each label
+    :rtype: tuple
+    """
+    num_sequences = sequence_starts.size
+    positions = np.arange(labels.size)
+    sequences = np.repeat(np.arange(num_sequences), np.diff(np.append(sequence_starts, labels.size)))
+    is_labeled = labels >= 0
+    index = (sequences[is_labeled], labels[is_labeled])
+    # a missing label occurs after the end and before the start
+    firsts = np.full((num_sequences, num_labels), labels.size, dtype=np.int64)
+    np.minimum.at(firsts, index, positions[is_labeled])
+    lasts = np.full((num_sequences, num_labels), -1, dtype=np.int64)
+    np.maximum.at(lasts, index, positions[is_labeled])
+    pair_counts = (firsts[:, :, np.newaxis] < lasts[:, np.newaxis, :]).sum(axis=0, dtype=np.int64)
+    label_counts = (lasts >= 0).sum(axis=0, dtype=np.int64)
+    return pair_counts, label_counts
+
+
+def count_exceeding_trials_loop(trial_labels: np.ndarray,
+                                sequence_starts: np.ndarray,
+                                pair_counts: np.ndarray) -> np.ndarray:
+    """
+    Returns the number of the specified trials (e.g., of a Monte
+    Carlo simulation) in which each ordered pair of labels is
+    counted (see count_ordered_pairs_loop) at least as many times
+    as in the specified pair counts; each trial is a row of
+    sequences of labels laid out as given by the sequence starts.
+    Written in plain loops so that numba can compile it (see
+    get_kernel)
+
+    :param trial_labels: labels of the sequences of each trial
+    :type trial_labels: np.ndarray
+    :param sequence_starts: ascending positions of the first label of each sequence
+    :type sequence_starts: np.ndarray
+    :param pair_counts: count of each pair to exceed
+    :type pair_counts: np.ndarray
+    :return: number of trials exceeding the count of each pair
+    :rtype: np.ndarray
+    """
+    num_labels = pair_counts.shape[0]
+    num_positions = trial_labels.shape[1]
+    exceeding_counts = np.zeros((num_labels, num_labels), dtype=np.int64)
+    trial_pair_counts = np.zeros((num_labels, num_labels), dtype=np.int64)
+    firsts = np.full(num_labels, -1, dtype=np.int64)
+    lasts = np.full(num_labels, -1, dtype=np.int64)
+    present_labels = np.empty(num_labels, dtype=np.int64)
+    for trial in range(trial_labels.shape[0]):
+        trial_pair_counts[:, :] = 0
+        for sequence in range(sequence_starts.size):
+            start = sequence_starts[sequence]
+            stop = sequence_starts[sequence + 1] if sequence + 1 < sequence_starts.size else num_positions
+            num_present = 0
+            for position in range(start, stop):
+                label = trial_labels[trial, position]
+                if label < 0:
+                    continue
+                if firsts[label] < 0:
+                    firsts[label] = position
+                    present_labels[num_present] = label
+                    num_present += 1
+                lasts[label] = position
+            for first_num in range(num_present):
+                first_label = present_labels[first_num]
+                for last_num in range(num_present):
+                    last_label = present_labels[last_num]
+                    if firsts[first_label] < lasts[last_label]:
+                        trial_pair_counts[first_label, last_label] += 1
+            for first_num in range(num_present):
+                firsts[present_labels[first_num]] = -1
+        for first_label in range(num_labels):
+            for last_label in range(num_labels):
+                if trial_pair_counts[first_label, last_label] >= pair_counts[first_label, last_label]:
+                    exceeding_counts[first_label, last_label] += 1
+    return exceeding_counts
+
+
+def count_exceeding_trials(trial_labels: np.ndarray,
+                           sequence_starts: np.ndarray,
+                           pair_counts: np.ndarray) -> np.ndarray:
+    """
+    NumPy version of count_exceeding_trials_loop
+
+    :param trial_labels: labels of the sequences of each trial
+    :type trial_labels: np.ndarray
+    :param sequence_starts: ascending positions of the first label of each sequence
+    :type sequence_starts: np.ndarray
+    :param pair_counts: count of each pair to exceed
+    :type pair_counts: np.ndarray
+    :return: number of trials exceeding the count of each pair
+    :rtype: np.ndarray
+    """
+    num_trials, num_positions = trial_labels.shape
+    num_sequences = sequence_starts.size
+    # the sequences of all the trials are counted as
+    # the sequences of one trial, shifted per trial
+    all_sequence_starts = (sequence_starts[np.newaxis, :] +
+                           num_positions * np.arange(num_trials)[:, np.newaxis]).ravel()
+    num_labels = pair_counts.shape[0]
+    positions = np.arange(trial_labels.size)
+    sequences = np.repeat(np.arange(all_sequence_starts.size),
+                          np.diff(np.append(all_sequence_starts, trial_labels.size)))
+    labels = trial_labels.ravel()
+    is_labeled = labels >= 0
+    index = (sequences[is_labeled], labels[is_labeled])
+    firsts = np.full((all_sequence_starts.size, num_labels), labels.size, dtype=np.int64)
+    np.minimum.at(firsts, index, positions[is_labeled])
+    lasts = np.full((all_sequence_starts.size, num_labels), -1, dtype=np.int64)
+    np.maximum.at(lasts, index, positions[is_labeled])
+    trial_pair_counts = (firsts[:, :, np.newaxis] < lasts[:, np.newaxis, :]) \
+        .reshape(num_trials, num_sequences, num_labels, num_labels).sum(axis=1, dtype=np.int64)
+    return (trial_pair_counts >= pair_counts[np.newaxis, :, :]).sum(axis=0, dtype=np.int64)
+
+
+def expand_dbscan_clusters_loop(indptr: np.ndarray,
+                                indices: np.ndarray,
+                                distances: np.ndarray,
+                                weights: np.ndarray,
+                                eps: float,
+                                min_samples: int) -> np.ndarray:
+    """
+    Returns the labels DBSCAN assigns to the points of the specified
+    neighbor graph for the specified eps and min_samples, as
+    sklearn.cluster.DBSCAN does with sample weights: the core points
+    (whose neighbors within eps, including themselves, weigh at least
+    min_samples, i.e., number at least min_samples if every point
+    weighs 1) connected
+    through core neighbors form a cluster, the clusters are numbered
+    in the order of their first core point, the other points with a
+    core neighbor are assigned to the first of its clusters and the
+    rest are noise (-1). Written in plain loops so that numba can
+    compile it (see get_kernel)
+
+    :param indptr: position of the first neighbor of each point, and the number of neighbors
+    :type indptr: np.ndarray
+    :param indices: neighbors of each point, concatenated
+    :type indices: np.ndarray
+    :param distances: distance to each neighbor of each point, concatenated
+    :type distances: np.ndarray
+    :param weights: weight of each point
+    :type weights: np.ndarray
+    :param eps: maximum distance between neighbors
+    :type eps: float
+    :param min_samples: minimum weight of the neighbors of a core point
+    :type min_samples: int
+    :return: cluster label of each point
+    :rtype: np.ndarray
+    """
+    num_points = indptr.size - 1
+    is_core = np.zeros(num_points, dtype=np.bool_)
+    for point in range(num_points):
+        neighbor_weight = 0.0
+        for edge in range(indptr[point], indptr[point + 1]):
+            if distances[edge] <= eps:
+                neighbor_weight += weights[indices[edge]]
+        is_core[point] = neighbor_weight >= min_samples
+
+    labels = np.full(num_points, -1, dtype=np.int64)
+    stack = np.empty(num_points, dtype=np.int64)
+    label = 0
+    for point in range(num_points):
+        if labels[point] >= 0 or not is_core[point]:
+            continue
+        # every point reachable from the core point
+        # through core points joins its cluster
+        labels[point] = label
+        stack[0] = point
+        stack_size = 1
+        while stack_size > 0:
+            stack_size -= 1
+            reached_point = stack[stack_size]
+            if not is_core[reached_point]:
+                continue
+            for edge in range(indptr[reached_point], indptr[reached_point + 1]):
+                neighbor = indices[edge]
+                if distances[edge] <= eps and labels[neighbor] < 0:
+                    labels[neighbor] = label
+                    stack[stack_size] = neighbor
+                    stack_size += 1
+        label += 1
+    return labels
+
+
+def expand_dbscan_clusters(indptr: np.ndarray,
+                           indices: np.ndarray,
+                           distances: np.ndarray,
+                           weights: np.ndarray,
+                           eps: float,
+                           min_samples: int) -> np.ndarray:
+    """
+    NumPy (and SciPy) version of expand_dbscan_clusters_loop
+
+    :param indptr: position of the first neighbor of each point, and the number of neighbors
+    :type indptr: np.ndarray
+    :param indices: neighbors of each point, concatenated
+    :type indices: np.ndarray
+    :param distances: distance to each neighbor of each point, concatenated
+    :type distances: np.ndarray
+    :param weights: weight of each point
+    :type weights: np.ndarray
+    :param eps: maximum distance between neighbors
+    :type eps: float
+    :param min_samples: minimum weight of the neighbors of a core point
+    :type min_samples: int
+    :return: cluster label of each point
+    :rtype: np.ndarray
+    """
+    # imported here to keep scipy out of the import-time dependencies of this module
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    num_points = indptr.size - 1
+    is_within_eps = distances <= eps
+    rows = np.repeat(np.arange(num_points), np.diff(indptr))[is_within_eps]
+    cols = indices[is_within_eps]
+    is_core = np.bincount(rows, weights=weights[cols], minlength=num_points) >= min_samples
+
+    labels = np.full(num_points, -1, dtype=np.int64)
+    core_points = np.flatnonzero(is_core)
+    if core_points.size == 0:
+        return labels
+    # the edges between core points, still ordered by point, are
+    # symmetric, so their strongly connected components are the clusters
+    is_core_edge = is_core[rows] & is_core[cols]
+    core_edge_indptr = np.zeros(num_points + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows[is_core_edge], minlength=num_points), out=core_edge_indptr[1:])
+    components = connected_components(
+        csr_matrix((np.ones(core_edge_indptr[-1], dtype=np.int8), cols[is_core_edge], core_edge_indptr),
+                   shape=(num_points, num_points)),
+        connection='strong'
+    )[1][core_points]
+    core_components, component_firsts = np.unique(components, return_index=True)
+    component_labels = np.empty(components.max() + 1, dtype=np.int64)
+    component_labels[core_components[np.argsort(component_firsts)]] = np.arange(core_components.size)
+    labels[core_points] = component_labels[components]
+
+    # the other points join the cluster of their
+    # core neighbors that was numbered first
+    is_border_edge = ~is_core[rows] & is_core[cols]
+    border_labels = np.full(num_points, np.iinfo(np.int64).max)
+    np.minimum.at(border_labels, rows[is_border_edge], labels[cols[is_border_edge]])
+    is_border = border_labels != np.iinfo(np.int64).max
+    labels[is_border] = border_labels[is_border]
+    return labels
+
+
+def cluster_grid_dbscan_loop(x_coords: np.ndarray,
+                             y_coords: np.ndarray,
+                             weights: np.ndarray,
+                             order: np.ndarray,
+                             cell_keys: np.ndarray,
+                             cell_starts: np.ndarray,
+                             num_cell_cols: int,
+                             eps: float,
+                             min_samples: int) -> np.ndarray:
+    """
+    Returns the labels DBSCAN assigns to the specified points for the
+    specified eps and min_samples (see expand_dbscan_clusters_loop),
+    found on a grid of cells whose diagonal is eps, so that the points
+    of a cell are all neighbors and the neighbors of a point are all
+    in the 21 cells around its cell (5 by 5 cells without the corners).
+    Every point of a cell whose points weigh at least min_samples is a
+    core point, and only the points of the other cells have their
+    neighbors weighed; the clusters are then found by merging the cells with
+    core points, each with the cells around it, if any of their core
+    points are neighbors (a union-find of the cells), so that the time
+    taken grows with the number of cells rather than of neighbors.
+    Written in plain loops so that numba can compile it (see get_kernel)
+
+    :param x_coords: X coordinate of each point
+    :type x_coords: np.ndarray
+    :param y_coords: Y coordinate of each point
+    :type y_coords: np.ndarray
+    :param weights: weight of each point
+    :type weights: np.ndarray
+    :param order: positions of the points ordered by cell
+    :type order: np.ndarray
+    :param cell_keys: ascending key of each (non-empty) cell, i.e., its
+        column times the number of cell columns plus its row
+    :type cell_keys: np.ndarray
+    :param cell_starts: position in the order of the first point of each
+        cell, and the number of points
+    :type cell_starts: np.ndarray
+    :param num_cell_cols: number of cell columns
+    :type num_cell_cols: int
+    :param eps: maximum distance between neighbors
+    :type eps: float
+    :param min_samples: minimum weight of the neighbors of a core point
+    :type min_samples: int
+    :return: cluster label of each point
+    :rtype: np.ndarray
+    """
+    num_points = x_coords.size
+    num_cells = cell_keys.size
+    eps_squared = eps * eps
+    ordered_x_coords = x_coords[order]
+    ordered_y_coords = y_coords[order]
+    ordered_weights = weights[order]
+    cell_offsets = np.empty((20, 2), dtype=np.int64)
+    num_cell_offsets = 0
+    for col_offset in range(-2, 3):
+        for row_offset in range(-2, 3):
+            if (col_offset == 0 and row_offset == 0) or (abs(col_offset) == 2 and abs(row_offset) == 2):
+                continue
+            cell_offsets[num_cell_offsets, 0] = col_offset
+            cell_offsets[num_cell_offsets, 1] = row_offset
+            num_cell_offsets += 1
+    # cells around each cell (-1 if empty), found by binary search
+    around_cells = np.full((num_cells, 20), -1, dtype=np.int64)
+    for cell in range(num_cells):
+        cell_col = cell_keys[cell] // num_cell_cols
+        cell_row = cell_keys[cell] % num_cell_cols
+        for offset_num in range(20):
+            col = cell_col + cell_offsets[offset_num, 0]
+            row = cell_row + cell_offsets[offset_num, 1]
+            if col < 0 or row < 0 or row >= num_cell_cols:
+                continue
+            key = col * num_cell_cols + row
+            around_cell = np.searchsorted(cell_keys, key)
+            if around_cell < num_cells and cell_keys[around_cell] == key:
+                around_cells[cell, offset_num] = around_cell
+
+    # core points, by position in the order
+    is_core = np.zeros(num_points, dtype=np.bool_)
+    has_core = np.zeros(num_cells, dtype=np.bool_)
+    for cell in range(num_cells):
+        start, stop = cell_starts[cell], cell_starts[cell + 1]
+        cell_weight = 0.0
+        for position in range(start, stop):
+            cell_weight += ordered_weights[position]
+        for position in range(start, stop):
+            neighbor_weight = cell_weight
+            for offset_num in range(20):
+                around_cell = around_cells[cell, offset_num]
+                if neighbor_weight >= min_samples or around_cell < 0:
+                    continue
+                for around_position in range(cell_starts[around_cell], cell_starts[around_cell + 1]):
+                    x_diff = ordered_x_coords[around_position] - ordered_x_coords[position]
+                    y_diff = ordered_y_coords[around_position] - ordered_y_coords[position]
+                    if x_diff * x_diff + y_diff * y_diff <= eps_squared:
+                        neighbor_weight += ordered_weights[around_position]
+                        if neighbor_weight >= min_samples:
+                            break
+            is_core[position] = neighbor_weight >= min_samples
+            has_core[cell] |= is_core[position]
+
+    # cells whose core points are neighbors are merged
+    parents = np.arange(num_cells)
+    for cell in range(num_cells):
+        if not has_core[cell]:
+            continue
+        for offset_num in range(20):
+            around_cell = around_cells[cell, offset_num]
+            if around_cell <= cell or not has_core[around_cell]:
+                continue
+            root = cell
+            while parents[root] != root:
+                parents[root] = parents[parents[root]]
+                root = parents[root]
+            around_root = around_cell
+            while parents[around_root] != around_root:
+                parents[around_root] = parents[parents[around_root]]
+                around_root = parents[around_root]
+            if root == around_root:
+                continue
+            are_neighbors = False
+            for position in range(cell_starts[cell], cell_starts[cell + 1]):
+                if not is_core[position]:
+                    continue
+                for around_position in range(cell_starts[around_cell], cell_starts[around_cell + 1]):
+                    x_diff = ordered_x_coords[around_position] - ordered_x_coords[position]
+                    y_diff = ordered_y_coords[around_position] - ordered_y_coords[position]
+                    if is_core[around_position] and x_diff * x_diff + y_diff * y_diff <= eps_squared:
+                        are_neighbors = True
+                        break
+                if are_neighbors:
+                    break
+            if are_neighbors:
+                parents[max(root, around_root)] = min(root, around_root)
+
+    # the clusters are numbered in the order of their first core point
+    roots = np.empty(num_cells, dtype=np.int64)
+    cluster_firsts = np.full(num_cells, num_points, dtype=np.int64)
+    for cell in range(num_cells):
+        root = cell
+        while parents[root] != root:
+            root = parents[root]
+        roots[cell] = root
+        for position in range(cell_starts[cell], cell_starts[cell + 1]):
+            if is_core[position] and order[position] < cluster_firsts[root]:
+                cluster_firsts[root] = order[position]
+    cluster_roots = np.nonzero(cluster_firsts < num_points)[0]
+    cluster_roots = cluster_roots[np.argsort(cluster_firsts[cluster_roots])]
+    root_labels = np.full(num_cells, -1, dtype=np.int64)
+    for label in range(cluster_roots.size):
+        root_labels[cluster_roots[label]] = label
+
+    # the other points join the cluster of their
+    # core neighbors that was numbered first
+    labels = np.full(num_points, -1, dtype=np.int64)
+    for cell in range(num_cells):
+        cell_label = root_labels[roots[cell]]
+        for position in range(cell_starts[cell], cell_starts[cell + 1]):
+            if is_core[position]:
+                labels[order[position]] = cell_label
+                continue
+            label = cell_label if has_core[cell] else num_points
+            for offset_num in range(20):
+                around_cell = around_cells[cell, offset_num]
+                if around_cell < 0 or not has_core[around_cell] or root_labels[roots[around_cell]] >= label:
+                    continue
+                for around_position in range(cell_starts[around_cell], cell_starts[around_cell + 1]):
+                    x_diff = ordered_x_coords[around_position] - ordered_x_coords[position]
+                    y_diff = ordered_y_coords[around_position] - ordered_y_coords[position]
+                    if is_core[around_position] and x_diff * x_diff + y_diff * y_diff <= eps_squared:
+                        label = root_labels[roots[around_cell]]
+                        break
+            if label < num_points:
+                labels[order[position]] = label
+    return labels
+
+
+def cluster_grid_dbscan(x_coords: np.ndarray,
+                        y_coords: np.ndarray,
+                        weights: np.ndarray,
+                        order: np.ndarray,
+                        cell_keys: np.ndarray,
+                        cell_starts: np.ndarray,
+                        num_cell_cols: int,
+                        eps: float,
+                        min_samples: int) -> np.ndarray:
+    """
+    Version of cluster_grid_dbscan_loop that clusters the points
+    with sklearn.cluster.DBSCAN instead, without the grid
+
+    :param x_coords: X coordinate of each point
+    :type x_coords: np.ndarray
+    :param y_coords: Y coordinate of each point
+    :type y_coords: np.ndarray
+    :param weights: weight of each point
+    :type weights: np.ndarray
+    :param order: positions of the points ordered by cell (unused)
+    :type order: np.ndarray
+    :param cell_keys: ascending key of each (non-empty) cell (unused)
+    :type cell_keys: np.ndarray
+    :param cell_starts: position in the order of the first point of each cell (unused)
+    :type cell_starts: np.ndarray
+    :param num_cell_cols: number of cell columns (unused)
+    :type num_cell_cols: int
+    :param eps: maximum distance between neighbors
+    :type eps: float
+    :param min_samples: minimum weight of the neighbors of a core point
+    :type min_samples: int
+    :return: cluster label of each point
+    :rtype: np.ndarray
+    """
+    # imported here to keep sklearn out of the import-time dependencies of this module
+    from sklearn.cluster import DBSCAN
+
+    if x_coords.size == 0:
+        return np.empty(0, dtype=np.int64)
+    return DBSCAN(eps=eps, min_samples=min_samples).fit(
+        np.column_stack((x_coords, y_coords)), sample_weight=weights
+    ).labels_.astype(np.int64)
+
+
+# Plain-loop function of each kernel, which numba compiles
+KERNEL_LOOPS = {
+    COLLAPSE_KERNEL: collapse_label_runs_loop,
+    PAIR_COUNT_KERNEL: count_ordered_pairs_loop,
+    EXCEEDANCE_KERNEL: count_exceeding_trials_loop,
+    DBSCAN_KERNEL: expand_dbscan_clusters_loop,
+    GRID_DBSCAN_KERNEL: cluster_grid_dbscan_loop
+}
+
+# NumPy function of each kernel, used if numba is not available
+KERNEL_FALLBACKS = {
+    COLLAPSE_KERNEL: collapse_label_runs,
+    PAIR_COUNT_KERNEL: count_ordered_pairs,
+    EXCEEDANCE_KERNEL: count_exceeding_trials,
+    DBSCAN_KERNEL: expand_dbscan_clusters,
+    GRID_DBSCAN_KERNEL: cluster_grid_dbscan
+}
@@ -0,0 +1,309 @@
+"""
+Utility to handle eye-movement-metric-related tasks, i.e., those dealing
+with deriving the saccades between the fixations of the fixation table
+(and their peak velocities from the gaze points between the fixations)
+and summarizing the eye movements of each participant on each stimulus
+"""
+import numpy as np
+import pandas as pd
+
+from src.main.config import FIXATION_DURATION_COL_TITLE
+from src.main.config import PARTICIPANT_FILENAME_COL_TITLE
+from src.main.config import PARTICIPANT_NAME_COL_TITLE
+from src.main.config import STIMULUS_COL_TITLE
+from src.main.config import TIMESTAMP_COL_TITLE
+from src.main.config import VALIDITY_COL_TITLE
+from src.main.config import X_FIXATION_COL_TITLE
+from src.main.config import X_GAZE_COL_TITLE
+from src.main.config import Y_FIXATION_COL_TITLE
+from src.main.config import Y_GAZE_COL_TITLE
+from src.model.utils import model_utils
+
+SACCADE_DURATION_COL_TITLE = 'saccade_duration'
+
+SACCADE_AMPLITUDE_COL_TITLE = 'saccade_amplitude'
+
+SACCADE_VELOCITY_COL_TITLE = 'saccade_velocity'
+
+SACCADE_PEAK_VELOCITY_COL_TITLE = 'saccade_peak_velocity'
+
+# Columns of the saccade table, in order; the timestamp column
+# holds the timestamp of the start of each saccade, i.e., of
+# the end of the fixation it leaves, and the fixation point
+# columns hold the fixation point it leaves
+SACCADE_COL_TITLES = [
+    PARTICIPANT_NAME_COL_TITLE,
+    PARTICIPANT_FILENAME_COL_TITLE,
+    STIMULUS_COL_TITLE,
+    X_FIXATION_COL_TITLE,
+    Y_FIXATION_COL_TITLE,
+    TIMESTAMP_COL_TITLE,
+    SACCADE_DURATION_COL_TITLE,
+    SACCADE_AMPLITUDE_COL_TITLE,
+    SACCADE_VELOCITY_COL_TITLE,
+    SACCADE_PEAK_VELOCITY_COL_TITLE
+]
+
+# Columns of the metrics table, in order, each
+# of them summarizing the eye movements of a
+# participant on a stimulus
+METRIC_COL_TITLES = [
+    'Participant',
+    'Participant File',
+    'Stimulus',
+    'Fixation Count',
+    'Total Fixation Duration (ms)',
+    'Mean Fixation Duration (ms)',
+    'Fixation Rate (per s)',
+    'Saccade Count',
+    'Mean Saccade Duration (ms)',
+    'Mean Saccade Amplitude (px)',
+    'Max Saccade Amplitude (px)',
+    'Mean Saccade Velocity (px/ms)',
+    'Mean Peak Saccade Velocity (px/ms)',
+    'Scanpath Length (px)'
+]
+
+
+def get_saccade_positions(participant_codes: np.ndarray,
+                          stimulus_codes: np.ndarray) -> np.ndarray:
+    """
+    Returns the positions of the fixations that are left by a
+    saccade, i.e., those followed by a fixation of the same
+    participant on the same stimulus; the fixations must be
+    ordered by participant and then by time
+
+    :param participant_codes: codes identifying the participant of each fixation
+    :type participant_codes: np.ndarray
+    :param stimulus_codes: codes identifying the stimulus of each fixation,
+        negative for fixations without a stimulus
+    :type stimulus_codes: np.ndarray
+    :return: ascending positions of the fixations left by a saccade
+    :rtype: np.ndarray
+    """
+    if participant_codes.size < 2:
+        return np.empty(0, dtype=np.int64)
+    is_saccade_start = participant_codes[1:] == participant_codes[:-1]
+    is_saccade_start &= stimulus_codes[1:] == stimulus_codes[:-1]
+    is_saccade_start &= stimulus_codes[:-1] >= 0
+    return np.flatnonzero(is_saccade_start)
+
+
+def get_peak_saccade_velocities(fixation_df: pd.DataFrame,
+                                saccade_starts: np.ndarray,
+                                gaze_df: pd.DataFrame) -> np.ndarray:
+    """
+    Returns the peak velocity of the saccade leaving each of the
+    specified fixations, i.e., the velocity of the fastest step
+    between consecutive gaze points of the participant from the last
+    gaze point at or before the end of the fixation to the first at
+    or after the start of the next one; the gaze points of all the
+    participants are searched at once, by a key of their participant
+    and timestamp, and the velocity is NaN if no such step takes
+    time (or if the gaze points are not known)
+
+    :param fixation_df: fixation table, ordered by participant and then by time
+    :type fixation_df: pd.DataFrame
+    :param saccade_starts: positions of the fixations left by a saccade
+    :type saccade_starts: np.ndarray
+    :param gaze_df: data the fixations are of, with the observations
+        of each participant together and in recording order, or None
+    :type gaze_df: pd.DataFrame
+    :return: peak velocities (in pixels per millisecond)
+    :rtype: np.ndarray
+    """
+    peak_velocities = np.full(saccade_starts.size, np.nan)
+    if gaze_df is None or VALIDITY_COL_TITLE not in gaze_df or saccade_starts.size == 0:
+        return peak_velocities
+    positions = model_utils.get_valid_positions(gaze_df, model_utils.GAZE_VALIDITY_FLAG)
+    if positions.size < 2:
+        return peak_velocities
+    participant_codes, participant_filenames = pd.factorize(
+        gaze_df[PARTICIPANT_FILENAME_COL_TITLE].iloc[positions].to_numpy()
+    )
+    timestamps = gaze_df[TIMESTAMP_COL_TITLE].to_numpy(dtype=np.float64)[positions]
+    timestamp_deltas = np.diff(timestamps)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        step_velocities = np.hypot(np.diff(gaze_df[X_GAZE_COL_TITLE].to_numpy(dtype=np.float64)[positions]),
+                                   np.diff(gaze_df[Y_GAZE_COL_TITLE].to_numpy(dtype=np.float64)[positions])) / \
+            timestamp_deltas
+    is_step = (timestamp_deltas > 0) & (participant_codes[1:] == participant_codes[:-1])
+    # a step after the last one pads the reduction below
+    step_velocities = np.append(np.where(is_step, step_velocities, -np.inf), -np.inf)
+
+    # the participants are numbered in the order of their gaze points,
+    # so offsetting the timestamps of each of them by its number times
+    # the span of the timestamps gives a key sorted (once each timestamp
+    # is the running maximum of the timestamps so far) across them
+    min_timestamp = timestamps.min()
+    timestamp_span = timestamps.max() - min_timestamp + 1
+    gaze_keys = np.maximum.accumulate(participant_codes * timestamp_span + (timestamps - min_timestamp))
+    saccade_participant_codes = pd.Index(participant_filenames).get_indexer(
+        fixation_df[PARTICIPANT_FILENAME_COL_TITLE].iloc[saccade_starts].to_numpy()
+    )
+    key_offsets = saccade_participant_codes * timestamp_span - min_timestamp
+    fixation_starts = fixation_df[TIMESTAMP_COL_TITLE].to_numpy(dtype=np.float64)
+    fixation_ends = fixation_starts + fixation_df[FIXATION_DURATION_COL_TITLE].to_numpy(dtype=np.float64)
+    firsts = np.clip(np.searchsorted(gaze_keys, key_offsets + fixation_ends[saccade_starts], side='right') - 1,
+                     0, positions.size - 1)
+    lasts = np.clip(np.searchsorted(gaze_keys, key_offsets + fixation_starts[saccade_starts + 1], side='left'),
+                    0, positions.size - 1)
+
+    # the steps of each saccade are those from its first to its last gaze point
+    has_steps = (saccade_participant_codes >= 0) & (lasts > firsts)
+    step_peak_velocities = np.maximum.reduceat(step_velocities, np.column_stack((firsts, lasts)).ravel())[0::2]
+    peak_velocities[has_steps] = step_peak_velocities[has_steps]
+    peak_velocities[np.isinf(peak_velocities)] = np.nan
+    return peak_velocities
+
+
+def get_saccade_measures(fixation_df: pd.DataFrame,
+                         saccade_starts: np.ndarray,
+                         gaze_df: pd.DataFrame = None) -> tuple:
+    """
+    Returns the start timestamp, duration (the time between the end
+    of the fixation it leaves and the start of the next one),
+    amplitude (the distance between their fixation points), mean
+    velocity and peak velocity (see get_peak_saccade_velocities) of
+    the saccade leaving each of the specified fixations; the mean
+    velocity is NaN if the fixations touch
+
+    :param fixation_df: fixation table, ordered by participant and then by time
+    :type fixation_df: pd.DataFrame
+    :param saccade_starts: positions of the fixations left by a saccade
+    :type saccade_starts: np.ndarray
+    :param gaze_df: data the fixations are of, or None if the peak velocities are not known
+    :type gaze_df: pd.DataFrame
+    :return: start timestamps, durations, amplitudes, velocities and peak velocities
+    :rtype: tuple
+    """
+    saccade_ends = saccade_starts + 1
+    x_coords = fixation_df[X_FIXATION_COL_TITLE].to_numpy(dtype=np.float64)
+    y_coords = fixation_df[Y_FIXATION_COL_TITLE].to_numpy(dtype=np.float64)
+    fixation_starts = fixation_df[TIMESTAMP_COL_TITLE].to_numpy(dtype=np.float64)
+    fixation_ends = fixation_starts + fixation_df[FIXATION_DURATION_COL_TITLE].to_numpy(dtype=np.float64)
+
+    durations = fixation_starts[saccade_ends] - fixation_ends[saccade_starts]
+    amplitudes = np.hypot(x_coords[saccade_ends] - x_coords[saccade_starts],
+                          y_coords[saccade_ends] - y_coords[saccade_starts])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        velocities = np.where(durations > 0, amplitudes / durations, np.nan)
+    return fixation_ends[saccade_starts], durations, amplitudes, velocities, \
+        get_peak_saccade_velocities(fixation_df, saccade_starts, gaze_df)
+
+
+def build_saccade_df(fixation_df: pd.DataFrame, gaze_df: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Returns the saccade table of the specified fixation table, with
+    one row per saccade between two consecutive fixations of a
+    participant on a stimulus giving its participant, stimulus,
+    start point, start timestamp, duration, amplitude, mean velocity
+    and peak velocity, found from the gaze points of the specified
+    data (NaN if it is None, e.g., when ingesting out of core)
+
+    :param fixation_df: fixation table, ordered by participant and then by time
+    :type fixation_df: pd.DataFrame
+    :param gaze_df: data the fixations are of, or None
+    :type gaze_df: pd.DataFrame
+    :return: saccade table
+    :rtype: pd.DataFrame
+    """
+    if len(fixation_df.index) == 0 or STIMULUS_COL_TITLE not in fixation_df:
+        return pd.DataFrame(columns=SACCADE_COL_TITLES)
+    saccade_starts = get_saccade_positions(
+        pd.factorize(fixation_df[PARTICIPANT_FILENAME_COL_TITLE])[0],
+        pd.factorize(fixation_df[STIMULUS_COL_TITLE])[0]
+    )
+    saccade_df = pd.DataFrame({
+        col_title: fixation_df[col_title].iloc[saccade_starts].reset_index(drop=True)
+        for col_title in SACCADE_COL_TITLES[:5] if col_title in fixation_df
+    })
+    (saccade_df[TIMESTAMP_COL_TITLE],
+     saccade_df[SACCADE_DURATION_COL_TITLE],
+     saccade_df[SACCADE_AMPLITUDE_COL_TITLE],
+     saccade_df[SACCADE_VELOCITY_COL_TITLE],
+     saccade_df[SACCADE_PEAK_VELOCITY_COL_TITLE]) = get_saccade_measures(fixation_df, saccade_starts, gaze_df)
+    return saccade_df
+
+
+def build_metrics_df(fixation_df: pd.DataFrame, gaze_df: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Returns the metrics table of the specified fixation table,
+    with one row per (participant, stimulus) with fixations; the
+    saccades are derived and the metrics of every (participant,
+    stimulus) are computed at once by summing the fixations and
+    saccades of each of them, and the rows are ordered as the
+    fixation table
+
+    :param fixation_df: fixation table, ordered by participant and then by time
+    :type fixation_df: pd.DataFrame
+    :param gaze_df: data the fixations are of, or None if the peak
+        velocities of the saccades are not known
+    :type gaze_df: pd.DataFrame
+    :return: metrics table
+    :rtype: pd.DataFrame
+    """
+    if len(fixation_df.index) == 0 or STIMULUS_COL_TITLE not in fixation_df:
+        return pd.DataFrame(columns=METRIC_COL_TITLES)
+    participant_codes, participant_filenames = pd.factorize(fixation_df[PARTICIPANT_FILENAME_COL_TITLE])
+    stimulus_codes, stimuli = pd.factorize(fixation_df[STIMULUS_COL_TITLE])
+    has_stimulus = stimulus_codes >= 0
+    # codes of each (participant, stimulus), numbered
+    # in the order of their first fixation
+    group_codes, group_keys = pd.factorize(
+        participant_codes[has_stimulus].astype(np.int64) * len(stimuli) + stimulus_codes[has_stimulus]
+    )
+    group_keys = np.asarray(group_keys)
+    num_groups = group_keys.size
+    group_firsts = np.flatnonzero(has_stimulus)[np.unique(group_codes, return_index=True)[1]]
+
+    durations = fixation_df[FIXATION_DURATION_COL_TITLE].to_numpy(dtype=np.float64)[has_stimulus]
+    fixation_starts = fixation_df[TIMESTAMP_COL_TITLE].to_numpy(dtype=np.float64)[has_stimulus]
+    fixation_counts = np.bincount(group_codes, minlength=num_groups)
+    total_durations = np.bincount(group_codes, weights=durations, minlength=num_groups)
+    first_starts = np.full(num_groups, np.inf)
+    np.minimum.at(first_starts, group_codes, fixation_starts)
+    last_ends = np.full(num_groups, -np.inf)
+    np.maximum.at(last_ends, group_codes, fixation_starts + durations)
+
+    saccade_starts = get_saccade_positions(participant_codes, stimulus_codes)
+    _, saccade_durations, amplitudes, velocities, peak_velocities = \
+        get_saccade_measures(fixation_df, saccade_starts, gaze_df)
+    saccade_group_codes = np.zeros(len(fixation_df.index), dtype=np.int64)
+    saccade_group_codes[has_stimulus] = group_codes
+    saccade_group_codes = saccade_group_codes[saccade_starts]
+    has_velocity = ~np.isnan(velocities)
+    has_peak_velocity = ~np.isnan(peak_velocities)
+    saccade_counts = np.bincount(saccade_group_codes, minlength=num_groups)
+    scanpath_lengths = np.bincount(saccade_group_codes, weights=amplitudes, minlength=num_groups)
+    max_amplitudes = np.full(num_groups, np.nan)
+    max_amplitudes[saccade_counts > 0] = 0
+    np.maximum.at(max_amplitudes, saccade_group_codes, amplitudes)
+
+    metrics_df = pd.DataFrame({
+        METRIC_COL_TITLES[0]: fixation_df[PARTICIPANT_NAME_COL_TITLE].iloc[group_firsts].to_numpy()
+        if PARTICIPANT_NAME_COL_TITLE in fixation_df else np.nan,
+        METRIC_COL_TITLES[1]: np.asarray(participant_filenames)[group_keys // len(stimuli)],
+        METRIC_COL_TITLES[2]: np.asarray(stimuli)[group_keys % len(stimuli)]
+    })
+    with np.errstate(divide='ignore', invalid='ignore'):
+        metrics = [
+            fixation_counts,
+            total_durations,
+            total_durations / fixation_counts,
+            np.where(last_ends > first_starts, fixation_counts * 1000 / (last_ends - first_starts), np.nan),
+            saccade_counts,
+            np.bincount(saccade_group_codes, weights=saccade_durations, minlength=num_groups) / saccade_counts,
+            scanpath_lengths / saccade_counts,
+            max_amplitudes,
+            np.bincount(saccade_group_codes[has_velocity], weights=velocities[has_velocity],
+                        minlength=num_groups) /
+            np.bincount(saccade_group_codes[has_velocity], minlength=num_groups),
+            np.bincount(saccade_group_codes[has_peak_velocity], weights=peak_velocities[has_peak_velocity],
+                        minlength=num_groups) /
+            np.bincount(saccade_group_codes[has_peak_velocity], minlength=num_groups),
+            scanpath_lengths
+        ]
+    for col_title, metric in zip(METRIC_COL_TITLES[3:], metrics):
+        metrics_df[col_title] = metric
+    return metrics_df
@@ -2,8 +2,34 @@
 Utility to handle image-related tasks, i.e., those dealing with
 pandas DataFrame objects containing eye-tracking data
 """
+import numpy as np
 import pandas as pd
 
+from src.main.config import PARTICIPANT_FILENAME_COL_TITLE
+from src.main.config import TIMESTAMP_COL_TITLE
+from src.main.config import VALIDITY_COL_TITLE
+from src.main.config import X_FIXATION_COL_TITLE
+from src.main.config import X_GAZE_COL_TITLE
+from src.main.config import Y_FIXATION_COL_TITLE
+from src.main.config import Y_GAZE_COL_TITLE
+
+# Flag of the validity column set for the observations with a
+# timestamp, a participant and a gaze point
+GAZE_VALIDITY_FLAG = 1
+
+# Flag of the validity column set for the observations with a
+# timestamp, a participant and a fixation point
+FIXATION_VALIDITY_FLAG = 2
+
+# Columns that an observation must have a value in for
+# each flag of the validity column to be set
+VALIDITY_FLAG_COL_TITLES = {
+    GAZE_VALIDITY_FLAG: [TIMESTAMP_COL_TITLE, X_GAZE_COL_TITLE, Y_GAZE_COL_TITLE,
+                         PARTICIPANT_FILENAME_COL_TITLE],
+    FIXATION_VALIDITY_FLAG: [TIMESTAMP_COL_TITLE, X_FIXATION_COL_TITLE, Y_FIXATION_COL_TITLE,
+                             PARTICIPANT_FILENAME_COL_TITLE]
+}
+
 
 def remove_incomplete_observations(df: pd.DataFrame,
                                    col_names: list) -> pd.DataFrame:
@@ -22,3 +48,184 @@ def remove_incomplete_observations(df: pd.DataFrame,
     for col_name in col_names:
         df = df[df[col_name].notnull()]
     return df
+
+
+def get_validity_flags(df: pd.DataFrame) -> np.ndarray:
+    """
+    Returns the validity flags of each observation of the specified
+    pandas DataFrame, i.e., the bitwise OR of the flags (such as
+    GAZE_VALIDITY_FLAG) whose columns all have a value in it
+
+    :param df: target DataFrame
+    :type df: pd.DataFrame
+    :return: validity flags of each observation
+    :rtype: np.ndarray
+    """
+    validity_flags = np.zeros(len(df.index), dtype=np.uint8)
+    for validity_flag, col_names in VALIDITY_FLAG_COL_TITLES.items():
+        if any(col_name not in df for col_name in col_names):
+            continue
+        is_valid = np.logical_and.reduce([df[col_name].notnull().to_numpy() for col_name in col_names])
+        validity_flags[is_valid] |= validity_flag
+    return validity_flags
+
+
+def get_valid_positions(df: pd.DataFrame, validity_flags: int) -> np.ndarray:
+    """
+    Returns the ascending positions of the observations of the
+    specified pandas DataFrame with all the specified validity
+    flags set in its validity column
+
+    :param df: target DataFrame
+    :type df: pd.DataFrame
+    :param validity_flags: bitwise OR of the required validity flags
+    :type validity_flags: int
+    :return: positions of the valid observations
+    :rtype: np.ndarray
+    """
+    return np.flatnonzero((df[VALIDITY_COL_TITLE].to_numpy() & validity_flags) == validity_flags)
+
+
+def get_first_valid_value(values: np.ndarray):
+    """
+    Returns the first specified value that is not
+    unspecified (NaN), or None if there is none
+
+    :param values: target values
+    :type values: np.ndarray
+    :return: first specified value, or None
+    :rtype: float
+    """
+    valid_positions = np.flatnonzero(pd.notnull(values))
+    if valid_positions.size == 0:
+        return None
+    return values[valid_positions[0]].item()
+
+
+def build_partition_index(df: pd.DataFrame,
+                          col_names: list) -> dict:
+    """
+    Builds an index that maps each combination of values
+    in the specified columns of the specified pandas
+    DataFrame to the ascending positions of the observations
+    with that combination; observations with an unspecified
+    value in any of the specified columns are not indexed.
+    The combinations are ordered by their first observation.
+
+    :param df: target DataFrame
+    :type df: pd.DataFrame
+    :param col_names: target columns in target DataFrame
+    :type col_names: list
+    :return: positions of the observations of each combination
+    :rtype: dict
+    """
+    combined_codes = np.zeros(len(df.index), dtype=np.int64)
+    is_indexed = np.ones(len(df.index), dtype=bool)
+    col_uniques = []
+    for col_name in col_names:
+        codes, uniques = pd.factorize(df[col_name])
+        combined_codes = combined_codes * max(len(uniques), 1) + codes
+        is_indexed &= codes >= 0
+        col_uniques.append(np.asarray(uniques))
+
+    positions = np.flatnonzero(is_indexed)
+    order = np.argsort(combined_codes[positions], kind='stable')
+    sorted_codes = combined_codes[positions][order]
+    sorted_positions = positions[order]
+    group_starts = np.concatenate(([0], np.flatnonzero(np.diff(sorted_codes)) + 1)) \
+        if sorted_codes.size > 0 else np.empty(0, dtype=np.int64)
+    groups = np.split(sorted_positions, group_starts[1:])
+
+    partition_index = {}
+    for group in sorted(groups, key=lambda group_positions: group_positions[0]):
+        key = []
+        remaining_code = combined_codes[group[0]]
+        for uniques in reversed(col_uniques):
+            remaining_code, code = divmod(remaining_code, max(len(uniques), 1))
+            key.append(uniques[code])
+        partition_index[tuple(reversed(key))] = group
+    return partition_index
+
+
+def get_sorted_timestamps(timestamps: np.ndarray) -> np.ndarray:
+    """
+    Returns the specified timestamps of observations in recording
+    order as a sorted array that can be binary searched: each
+    timestamp is the running maximum of the timestamps so far, so
+    that an unspecified (NaN) timestamp takes that of the previous
+    observation; unspecified timestamps before the first specified
+    one are -inf
+
+    :param timestamps: timestamps of the observations, in recording order
+    :type timestamps: np.ndarray
+    :return: sorted timestamps
+    :rtype: np.ndarray
+    """
+    timestamps = np.nan_to_num(timestamps.astype(np.float64), nan=-np.inf)
+    return np.maximum.accumulate(timestamps) if timestamps.size > 0 else timestamps
+
+
+def build_partition_timestamps(partition_index: dict, timestamps: np.ndarray) -> dict:
+    """
+    Builds the sorted timestamps (see get_sorted_timestamps)
+    of the observations of each partition of the specified
+    partition index, aligned with its positions
+
+    :param partition_index: positions of the observations of each partition
+    :type partition_index: dict
+    :param timestamps: timestamps of the observations of the table
+    :type timestamps: np.ndarray
+    :return: sorted timestamps of each partition
+    :rtype: dict
+    """
+    return {key: get_sorted_timestamps(timestamps[positions]) for key, positions in partition_index.items()}
+
+
+def get_time_window_slice(sorted_timestamps: np.ndarray,
+                          time_window: tuple,
+                          onset: float = None) -> slice:
+    """
+    Returns the slice of the observations of a partition within the
+    specified time window, found by binary search of its sorted
+    timestamps; a relative time window is offset by the specified
+    onset (e.g., the first timestamp of the participant on the
+    stimulus), and if the onset is None, the partition has no
+    observation within it
+
+    :param sorted_timestamps: sorted timestamps of the observations
+    :type sorted_timestamps: np.ndarray
+    :param time_window: start and end (in milliseconds, each None if
+        unbounded, inclusive) and whether they are relative to the onset
+    :type time_window: tuple
+    :param onset: timestamp the time window is relative to
+    :type onset: float
+    :return: slice of the observations within the time window
+    :rtype: slice
+    """
+    start, end, is_relative = time_window
+    if is_relative:
+        if onset is None:
+            return slice(0, 0)
+        start = None if start is None else start + onset
+        end = None if end is None else end + onset
+    return slice(
+        0 if start is None else int(np.searchsorted(sorted_timestamps, start, side='left')),
+        sorted_timestamps.size if end is None else int(np.searchsorted(sorted_timestamps, end, side='right'))
+    )
+
+
+def get_time_range(timestamps: np.ndarray) -> tuple:
+    """
+    Returns the first and last of the specified timestamps
+    of observations in recording order, each None if no
+    timestamp is specified
+
+    :param timestamps: timestamps of the observations, in recording order
+    :type timestamps: np.ndarray
+    :return: first and last timestamps
+    :rtype: tuple
+    """
+    first_timestamp = get_first_valid_value(timestamps)
+    if first_timestamp is None:
+        return None, None
+    return first_timestamp, np.nanmax(timestamps).item()
@@ -0,0 +1,326 @@
+"""
+Utility to handle partition-store-related tasks, i.e., those dealing
+with streaming eye-tracking data files in chunks into an on-disk store
+of (stimulus, participant) partitions and reading them back on demand
+"""
+import functools
+import hashlib
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from src.main.config import FIXATION_ID_COL_TITLE
+from src.main.config import INGEST_MEMORY_BUDGET_MB
+from src.main.config import NUM_INGEST_WORKERS
+from src.main.config import RELATIVE_DATA_DIR
+from src.main.config import RELATIVE_PARTITION_STORE_DIR
+from src.main.config import STIMULUS_COL_TITLE
+from src.main.config import STIMULUS_X_DISPLACEMENT_COL_TITLE
+from src.main.config import STIMULUS_Y_DISPLACEMENT_COL_TITLE
+from src.main.config import TIMESTAMP_COL_TITLE
+from src.main.config import USE_PARALLEL_INGEST
+from src.model.utils import fixation_utils
+from src.model.utils import ingest_utils
+from src.model.utils import model_utils
+
+# Estimated number of bytes that a parsed row takes up
+# on top of its raw text while a chunk is being parsed
+PARSED_ROW_NUM_BYTES = 256
+
+# Number of bytes read from the start of a data
+# file to estimate the length of its rows
+ROW_SAMPLE_NUM_BYTES = 1 << 16
+
+FIXATION_FILENAME = 'fixations.feather'
+
+
+def get_store_key(name: str) -> str:
+    """
+    Returns the name of the store directory of the specified
+    data file path or stimulus, which is safe to use as a
+    directory name whatever characters the name contains
+
+    :param name: data file path or stimulus
+    :type name: str
+    :return: name of the store directory
+    :rtype: str
+    """
+    return hashlib.sha1(name.encode('utf-8')).hexdigest()
+
+
+def get_participant_store_dir(file_path: str,
+                              store_relative_dir: str = RELATIVE_PARTITION_STORE_DIR) -> str:
+    """
+    Returns the directory holding the partitions
+    of the specified participant data file
+
+    :param file_path: path of the participant data file
+    :type file_path: str
+    :param store_relative_dir: directory containing the partition store
+    :type store_relative_dir: str
+    :return: directory of the partitions of the data file
+    :rtype: str
+    """
+    return os.path.join(store_relative_dir, get_store_key(os.path.abspath(file_path)))
+
+
+def get_chunk_num_rows(file_path: str,
+                       num_workers: int = 1,
+                       memory_budget_mb: int = INGEST_MEMORY_BUDGET_MB) -> int:
+    """
+    Returns the number of rows of the specified data file to read
+    per chunk so that the specified number of workers streaming
+    data files at once stay within the memory budget
+
+    :param file_path: path of the data file
+    :type file_path: str
+    :param num_workers: number of workers streaming data files at once
+    :type num_workers: int
+    :param memory_budget_mb: memory budget (in MB) of all workers
+    :type memory_budget_mb: int
+    :return: number of rows per chunk
+    :rtype: int
+    """
+    with open(file_path, 'rb') as data_file:
+        sample = data_file.read(ROW_SAMPLE_NUM_BYTES)
+    row_num_bytes = len(sample) / max(sample.count(b'\n'), 1) + PARSED_ROW_NUM_BYTES
+    return max(int(memory_budget_mb * (1 << 20) / (row_num_bytes * max(num_workers, 1))), 1)
+
+
+def spill_participant_files(participant_filenames: list,
+                            use_parallel_ingest: bool = USE_PARALLEL_INGEST,
+                            num_workers: int = NUM_INGEST_WORKERS,
+                            progress_callback=None) -> list:
+    """
+    Streams the specified participant data files into the
+    partition store, concurrently in a pool of worker processes
+    or serially in this process, with chunks sized so that all
+    the workers together stay within the memory budget
+
+    :param participant_filenames: filenames of the participant data files
+    :type participant_filenames: list
+    :param use_parallel_ingest: whether to stream the data files concurrently
+    :type use_parallel_ingest: bool
+    :param num_workers: number of worker processes, or None
+        for one per available CPU
+    :type num_workers: int
+    :param progress_callback: None, or a function called with the
+        number of data files streamed so far after each data file is streamed
+    :type progress_callback: callable
+    :return: partitions of each participant, in the order of the filenames
+    :rtype: list
+    """
+    num_workers = ingest_utils.get_num_workers(participant_filenames, use_parallel_ingest, num_workers)
+    return ingest_utils.map_participant_files(
+        functools.partial(spill_participant_file, num_workers=num_workers),
+        participant_filenames,
+        use_parallel_ingest=use_parallel_ingest,
+        num_workers=num_workers,
+        progress_callback=progress_callback
+    )
+
+
+def spill_participant_file(participant_filename: str,
+                           num_workers: int = 1,
+                           data_relative_dir: str = RELATIVE_DATA_DIR,
+                           store_relative_dir: str = RELATIVE_PARTITION_STORE_DIR) -> dict:
+    """
+    Streams the specified participant data file in chunks sized
+    to the memory budget and appends the observations of each
+    stimulus in each chunk to the partition of that stimulus
+    as a Feather part file; observations without a stimulus are
+    dropped as they are never plotted. The fixation table of
+    the data file is derived while streaming and stored
+    alongside the partitions, and the first position of the
+    stimulus image (media position) and the first and last
+    timestamps (time range) of each partition are recorded
+
+    :param participant_filename: filename of the participant data file
+    :type participant_filename: str
+    :param num_workers: number of workers streaming data files at once
+    :type num_workers: int
+    :param data_relative_dir: directory containing the data files
+    :type data_relative_dir: str
+    :param store_relative_dir: directory containing the partition store
+    :type store_relative_dir: str
+    :return: number of part files, rows, media position and
+        time range of the partition of each stimulus
+    :rtype: dict
+    """
+    file_path = ingest_utils.get_participant_file_path(participant_filename, data_relative_dir)
+    participant_store_dir = get_participant_store_dir(file_path, store_relative_dir)
+    shutil.rmtree(participant_store_dir, ignore_errors=True)
+
+    partitions = {}
+    fixation_dfs = []
+    # observations of the last fixation of the previous chunk,
+    # which may continue into the next chunk
+    open_fixation_df = None
+    chunk_num_rows = get_chunk_num_rows(file_path, num_workers)
+    for chunk_df in ingest_utils.read_participant_file_chunks(participant_filename, chunk_num_rows,
+                                                              data_relative_dir):
+        if STIMULUS_COL_TITLE not in chunk_df:
+            continue
+        observations_df = fixation_utils.get_fixation_observations(chunk_df)
+        if open_fixation_df is not None:
+            observations_df = ingest_utils.concat_participant_dfs([open_fixation_df, observations_df])
+        fixation_starts = fixation_utils.get_observation_fixation_starts(observations_df)
+        if fixation_starts.size > 0:
+            fixation_dfs.append(fixation_utils.build_fixation_df(observations_df.iloc[:fixation_starts[-1]]))
+            open_fixation_df = observations_df.iloc[fixation_starts[-1]:]
+
+        stimulus_col = chunk_df[STIMULUS_COL_TITLE]
+        stimulus_codes = stimulus_col.cat.codes.to_numpy()
+        for stimulus_code in np.unique(stimulus_codes[stimulus_codes >= 0]):
+            stimulus = str(stimulus_col.cat.categories[stimulus_code])
+            partition = partitions.setdefault(stimulus, {'num_parts': 0, 'num_rows': 0, 'media_position': [None, None],
+                                                         'time_range': [None, None]})
+            partition_dir = os.path.join(participant_store_dir, get_store_key(stimulus))
+            os.makedirs(partition_dir, exist_ok=True)
+            partition_df = chunk_df[stimulus_codes == stimulus_code].reset_index(drop=True)
+            partition_df.to_feather(
+                os.path.join(partition_dir, 'part-{:05d}.feather'.format(partition['num_parts']))
+            )
+            partition['num_parts'] += 1
+            partition['num_rows'] += len(partition_df.index)
+            for axis, col_title in enumerate([STIMULUS_X_DISPLACEMENT_COL_TITLE, STIMULUS_Y_DISPLACEMENT_COL_TITLE]):
+                if partition['media_position'][axis] is None and col_title in partition_df:
+                    partition['media_position'][axis] = model_utils.get_first_valid_value(
+                        partition_df[col_title].to_numpy()
+                    )
+            first_timestamp, last_timestamp = model_utils.get_time_range(partition_df[TIMESTAMP_COL_TITLE].to_numpy())
+            if first_timestamp is not None:
+                if partition['time_range'][0] is None:
+                    partition['time_range'][0] = first_timestamp
+                partition['time_range'][1] = max(last_timestamp, partition['time_range'][1] or last_timestamp)
+
+    if open_fixation_df is not None:
+        fixation_dfs.append(fixation_utils.build_fixation_df(open_fixation_df))
+    if len(fixation_dfs) > 0:
+        fixation_df = ingest_utils.concat_participant_dfs(fixation_dfs).reset_index(drop=True)
+        fixation_df[FIXATION_ID_COL_TITLE] = np.arange(len(fixation_df.index), dtype=np.int32)
+    else:
+        fixation_df = pd.DataFrame(columns=fixation_utils.FIXATION_COL_TITLES)
+    os.makedirs(participant_store_dir, exist_ok=True)
+    fixation_df.to_feather(os.path.join(participant_store_dir, FIXATION_FILENAME))
+    return partitions
+
+
+def read_partition(file_path: str,
+                   stimulus: str,
+                   partition: dict,
+                   store_relative_dir: str = RELATIVE_PARTITION_STORE_DIR) -> pd.DataFrame:
+    """
+    Reads the partition of the specified stimulus
+    of the specified participant data file
+
+    :param file_path: path of the participant data file
+    :type file_path: str
+    :param stimulus: filename of the stimulus
+    :type stimulus: str
+    :param partition: number of part files and rows of the partition
+    :type partition: dict
+    :param store_relative_dir: directory containing the partition store
+    :type store_relative_dir: str
+    :return: observations of the stimulus by the participant
+    :rtype: pd.DataFrame
+    """
+    partition_dir = os.path.join(get_participant_store_dir(file_path, store_relative_dir),
+                                 get_store_key(stimulus))
+    part_dfs = [
+        pd.read_feather(os.path.join(partition_dir, 'part-{:05d}.feather'.format(part_num)))
+        for part_num in range(partition['num_parts'])
+    ]
+    if len(part_dfs) == 1:
+        return part_dfs[0]
+    return ingest_utils.concat_participant_dfs(part_dfs)
+
+
+def read_fixation_df(file_path: str,
+                     store_relative_dir: str = RELATIVE_PARTITION_STORE_DIR) -> pd.DataFrame:
+    """
+    Reads the fixation table of the specified participant data file
+
+    :param file_path: path of the participant data file
+    :type file_path: str
+    :param store_relative_dir: directory containing the partition store
+    :type store_relative_dir: str
+    :return: fixation table of the data file
+    :rtype: pd.DataFrame
+    """
+    return pd.read_feather(os.path.join(get_participant_store_dir(file_path, store_relative_dir),
+                                        FIXATION_FILENAME))
+
+
+def get_stored_partitions(file_path: str,
+                          signature: list,
+                          manifest: dict) -> dict:
+    """
+    Returns the partitions of the specified data file if the
+    file has not changed since it was streamed into the store;
+    otherwise, returns None
+
+    :param file_path: path of the data file
+    :type file_path: str
+    :param signature: current signature of the data file
+    :type signature: list
+    :param manifest: manifest of the partition store
+    :type manifest: dict
+    :return: number of part files, rows, media position and time
+        range of the partition of each stimulus, or None
+    :rtype: dict
+    """
+    entry = manifest['files'].get(os.path.abspath(file_path))
+    if entry is None or entry['signature'] != signature:
+        return None
+    return entry['partitions']
+
+
+def record_partitions(file_path: str,
+                      signature: list,
+                      partitions: dict,
+                      manifest: dict) -> None:
+    """
+    Records the partitions streamed from the
+    specified data file in the manifest
+
+    :param file_path: path of the data file
+    :type file_path: str
+    :param signature: signature of the data file when it was streamed
+    :type signature: list
+    :param partitions: number of part files, rows, media position
+        and time range of the partition of each stimulus
+    :type partitions: dict
+    :param manifest: manifest of the partition store
+    :type manifest: dict
+    """
+    manifest['files'][os.path.abspath(file_path)] = {
+        'signature': signature,
+        'partitions': partitions
+    }
+
+
+def prune_manifest(manifest: dict,
+                   file_paths: list,
+                   store_relative_dir: str = RELATIVE_PARTITION_STORE_DIR) -> None:
+    """
+    Removes the partitions of data files that no longer
+    exist in the directories of the specified data files
+
+    :param manifest: manifest of the partition store
+    :type manifest: dict
+    :param file_paths: paths of the data files currently available
+    :type file_paths: list
+    :param store_relative_dir: directory containing the partition store
+    :type store_relative_dir: str
+    """
+    abs_file_paths = set(os.path.abspath(file_path) for file_path in file_paths)
+    abs_data_dirs = set(os.path.dirname(abs_file_path) for abs_file_path in abs_file_paths)
+    for abs_file_path in list(manifest['files'].keys()):
+        if abs_file_path in abs_file_paths or os.path.dirname(abs_file_path) not in abs_data_dirs:
+            continue
+        manifest['files'].pop(abs_file_path)
+        shutil.rmtree(get_participant_store_dir(abs_file_path, store_relative_dir), ignore_errors=True)
+
@@ -0,0 +1,92 @@
+"""
+Utility to handle shared-memory-related tasks, i.e., those dealing with
+publishing NumPy arrays in shared memory so that worker processes can
+attach to them without copying or pickling the eye-tracking data
+"""
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+def publish_arrays(arrays: dict) -> tuple:
+    """
+    Copies each of the specified arrays into a new block of
+    shared memory and returns the descriptor of the blocks,
+    which is small enough to pass to worker processes, along
+    with the blocks themselves, which must be kept (and
+    eventually released) by the publishing process
+
+    :param arrays: one-dimensional arrays, keyed by name
+    :type arrays: dict
+    :return: descriptor of the blocks and the blocks, keyed by name
+    :rtype: tuple
+    """
+    descriptor = {}
+    shared_memory_blocks = {}
+    try:
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            # a block cannot be empty, so an empty array still takes up one byte
+            shared_memory_block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            shared_memory_blocks[name] = shared_memory_block
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shared_memory_block.buf)[:] = array
+            descriptor[name] = {
+                'shared_memory_name': shared_memory_block.name,
+                'dtype': array.dtype.str,
+                'shape': array.shape
+            }
+    except Exception:
+        release_arrays(shared_memory_blocks, unlink=True)
+        raise
+    return descriptor, shared_memory_blocks
+
+
+def attach_arrays(descriptor: dict) -> tuple:
+    """
+    Attaches to the blocks of shared memory of the specified
+    descriptor and returns read-only arrays viewing them
+    (without copying), along with the blocks, which must be
+    kept open as long as the arrays are used
+
+    :param descriptor: descriptor of the blocks, as returned by publish_arrays
+    :type descriptor: dict
+    :return: arrays and blocks, keyed by name
+    :rtype: tuple
+    """
+    arrays = {}
+    shared_memory_blocks = {}
+    for name, array_descriptor in descriptor.items():
+        shared_memory_block = shared_memory.SharedMemory(name=array_descriptor['shared_memory_name'])
+        shared_memory_blocks[name] = shared_memory_block
+        array = np.ndarray(tuple(array_descriptor['shape']),
+                           dtype=np.dtype(array_descriptor['dtype']),
+                           buffer=shared_memory_block.buf)
+        array.flags.writeable = False
+        arrays[name] = array
+    return arrays, shared_memory_blocks
+
+
+def release_arrays(shared_memory_blocks: dict, unlink: bool = False) -> None:
+    """
+    Closes the specified blocks of shared memory and, if
+    specified (which only the publishing process should do),
+    frees them; arrays viewing the blocks must not be used
+    afterwards
+
+    :param shared_memory_blocks: blocks of shared memory, keyed by name
+    :type shared_memory_blocks: dict
+    :param unlink: whether to free the blocks
+    :type unlink: bool
+    """
+    for shared_memory_block in shared_memory_blocks.values():
+        try:
+            shared_memory_block.close()
+        except BufferError:
+            # arrays viewing the block are still alive; the
+            # mapping is dropped once they are garbage collected
+            pass
+        if unlink:
+            try:
+                shared_memory_block.unlink()
+            except FileNotFoundError:
+                pass
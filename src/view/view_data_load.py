@@ -0,0 +1,67 @@
+"""
+Contains the class ViewDataLoad
+
+MODULAR INTERNAL IMPORTS ARE AT THE BOTTOM OF THE FILE. THIS IS AN
+INTENTIONAL DESIGN CHOICE. IT HELPS AVOID CIRCULAR IMPORT ISSUES.
+IT IS ALSO OKAY TO AVOID THEM IN THIS MANNER BECAUSE THIS IS A
+HIGHLY MODULAR PROGRAM.
+"""
+
+
+class ViewDataLoad(object):
+    """
+    View for the progress of loading the data
+    """
+
+    __instance = None
+
+    progress_bar = None
+
+    def __init__(self,
+                 progress_bar):
+        if ViewDataLoad.__instance is not None:
+            raise Exception("ViewDataLoad should be treated as a singleton class.")
+        else:
+            ViewDataLoad.__instance = self
+        self.progress_bar = progress_bar
+
+    @staticmethod
+    def get_instance():
+        """
+        Static method to access the singleton
+        instance for this class
+
+        :return: the singleton instance
+        :rtype: ViewDataLoad
+        """
+        if ViewDataLoad.__instance is None:
+            raise Exception("ViewDataLoad has not been instantiated and " + \
+                            "cannot be done so without proper attributes")
+        return ViewDataLoad.__instance
+
+    def start(self) -> None:
+        """
+        Shows the progress bar with no data files loaded yet
+        """
+        self.progress_bar.setMinimum(0)
+        self.progress_bar.setMaximum(0)  # busy until the number of data files is known
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+
+    def update_progress(self, num_loaded: int, num_total: int) -> None:
+        """
+        Shows the number of data files loaded so far
+
+        :param num_loaded: number of data files loaded
+        :type num_loaded: int
+        :param num_total: number of data files to load
+        :type num_total: int
+        """
+        self.progress_bar.setMaximum(num_total)
+        self.progress_bar.setValue(num_loaded)
+
+    def finish(self) -> None:
+        """
+        Hides the progress bar once the data is loaded
+        """
+        self.progress_bar.hide()
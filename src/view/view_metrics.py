@@ -0,0 +1,154 @@
+"""
+Contains the class ViewMetrics
+
+MODULAR INTERNAL IMPORTS ARE AT THE BOTTOM OF THE FILE. THIS IS AN
+INTENTIONAL DESIGN CHOICE. IT HELPS AVOID CIRCULAR IMPORT ISSUES.
+IT IS ALSO OKAY TO AVOID THEM IN THIS MANNER BECAUSE THIS IS A
+HIGHLY MODULAR PROGRAM.
+"""
+
+# External imports
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QFileDialog
+from PyQt5.QtWidgets import QPushButton
+from PyQt5.QtWidgets import QTableWidget
+from PyQt5.QtWidgets import QTabWidget
+from PyQt5.QtWidgets import QTableWidgetItem
+from PyQt5.QtWidgets import QVBoxLayout
+from PyQt5.QtWidgets import QWidget
+
+# Number of decimal places the metrics are shown with
+NUM_DIGITS_ROUND_METRIC = 2
+
+
+class ViewMetrics(QWidget):
+    """
+    View for the window showing the eye-movement metrics
+    of each participant on each stimulus and on each area
+    of interest (AOI), in a tab each, which can be
+    exported to a CSV file
+    """
+
+    __instance = None
+
+    metrics_button = None
+
+    # initialized in class
+    tabs = None
+    table = None
+    aoi_table = None
+    export_button = None
+
+    def __init__(self, metrics_button):
+        super().__init__()
+        if ViewMetrics.__instance is not None:
+            raise Exception("ViewMetrics should be treated as a singleton class.")
+        else:
+            ViewMetrics.__instance = self
+        self.metrics_button = metrics_button
+
+        self.setup()
+
+    @staticmethod
+    def get_instance():
+        """
+        Static method to access the singleton
+        instance for this class
+
+        :return: the singleton instance
+        :rtype: ViewMetrics
+        """
+        if ViewMetrics.__instance is None:
+            raise Exception("ViewMetrics has not been instantiated and " + \
+                            "cannot be done so without proper attributes")
+        return ViewMetrics.__instance
+
+    def setup(self) -> None:
+        """
+        Sets up the layout of the window: the tabs of
+        the metrics table and of the AOI metrics
+        table above the export button
+        """
+        self.resize(1200, 720)
+        self.setWindowTitle("Eye-Movement Metrics")
+        self.table = QTableWidget()
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.aoi_table = QTableWidget()
+        self.aoi_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.tabs = QTabWidget()
+        self.tabs.addTab(self.table, "Stimuli")
+        self.tabs.addTab(self.aoi_table, "AOIs")
+        self.export_button = QPushButton("Export CSV")
+        vbox = QVBoxLayout()
+        vbox.addWidget(self.tabs)
+        vbox.addWidget(self.export_button, alignment=Qt.AlignRight)
+        self.setLayout(vbox)
+
+    def init(self) -> None:
+        """
+        Fills the tables with the metrics table
+        and the AOI metrics table
+        """
+        self.fill_table(self.table, ModelMetrics.get_instance().compute())
+        self.fill_table(self.aoi_table, ModelMetrics.get_instance().compute_aoi())
+
+    @staticmethod
+    def fill_table(table: QTableWidget, metrics_df: pd.DataFrame) -> None:
+        """
+        Fills the specified table with the specified metrics table
+        :param table: table to fill
+        :type table: QTableWidget
+        :param metrics_df: metrics table
+        :type metrics_df: pd.DataFrame
+        """
+        table.setSortingEnabled(False)
+        table.clear()
+        table.setColumnCount(len(metrics_df.columns))
+        table.setRowCount(len(metrics_df.index))
+        table.setHorizontalHeaderLabels(list(metrics_df.columns))
+
+        for col_num, col_title in enumerate(metrics_df.columns):
+            values = metrics_df[col_title].to_numpy()
+            is_numeric = np.issubdtype(values.dtype, np.number)
+            for row_num, value in enumerate(values):
+                item = QTableWidgetItem()
+                if is_numeric:
+                    # set as a number so that the column sorts numerically
+                    item.setData(Qt.DisplayRole, None if np.isnan(value) else
+                                 round(float(value), NUM_DIGITS_ROUND_METRIC))
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                else:
+                    item.setText(str(value))
+                table.setItem(row_num, col_num, item)
+
+        table.setSortingEnabled(True)
+        table.resizeColumnsToContents()
+
+    def is_aoi_table_selected(self) -> bool:
+        """
+        Returns whether the tab of the AOI metrics table is selected
+
+        :return: True if the AOI metrics table is shown
+        :rtype: bool
+        """
+        return self.tabs.currentWidget() is self.aoi_table
+
+    def get_export_file_path(self) -> str:
+        """
+        Asks the user where to export the metrics
+        table shown in the selected tab
+
+        :return: path of the CSV file, or an empty string if cancelled
+        :rtype: str
+        """
+        default_filename = "aoi_metrics.csv" if self.is_aoi_table_selected() else "metrics.csv"
+        return QFileDialog.getSaveFileName(self, "Export Metrics", default_filename, "CSV Files (*.csv)")[0]
+
+    def show(self) -> None:
+        self.init()
+        super().show()
+
+
+from src.model.model_metrics import ModelMetrics
@@ -86,6 +86,34 @@ class ViewParticipantSelection(object):
             self.selection_checkbox_list.append(checkbox_widget)
         return self.selection_checkbox_list
 
+    def refresh_selection_checkboxes(self) -> list:
+        """
+        Updates the list of participants in place, keeping
+        the checkboxes (and their checked state) of the
+        participants that are still available
+
+        :return: list of selection checkboxes
+        """
+        if self.layout is None:
+            return self.update_selection_checkboxes()
+        existing_checkboxes = {checkbox.text(): checkbox for checkbox in self.selection_checkbox_list or []}
+        self.selection_checkbox_list = []
+        for index, participant in enumerate(
+                ModelParticipantSelection.get_instance().import_stimuli_filtered_participant_selection()
+        ):
+            checkbox_widget = existing_checkboxes.pop(participant, None)
+            if checkbox_widget is None:
+                checkbox_widget = QtWidgets.QCheckBox()
+                checkbox_widget.setText(participant)
+            else:
+                self.layout.removeWidget(checkbox_widget)
+            self.layout.insertWidget(index, checkbox_widget)
+            self.selection_checkbox_list.append(checkbox_widget)
+        for checkbox_widget in existing_checkboxes.values():
+            self.layout.removeWidget(checkbox_widget)
+            checkbox_widget.hide()
+        return self.selection_checkbox_list
+
     def update_selected_checkboxes(self) -> list:
         """
         Updates the checkboxes that are selected
@@ -10,8 +10,9 @@ HIGHLY MODULAR PROGRAM.
 # External imports
 import time
 
+import numpy as np
 import plotly.graph_objects as go
-from PyQt5 import QtWidgets, QtWebEngineWidgets
+from PyQt5 import QtWidgets
 
 from src.view.view_analysis_type_selection import ViewAnalysisTypeSelection
 from src.view.view_data_type_selection import ViewDataTypeSelection
@@ -40,6 +41,12 @@ class ViewPlot(object):
     run_monte_carlo_button = None
     monte_carlo_progress_bar = None
     time_left_monte_carlo = None
+    time_window_checkbox = None
+    time_window_relative_checkbox = None
+    time_window_start_input = None
+    time_window_end_input = None
+    time_window_start_slider = None
+    time_window_end_slider = None
 
     # initialized in class
     browser = None
@@ -56,6 +63,7 @@ class ViewPlot(object):
     saved_support_threshold: int = None
     saved_forward_confidence_threshold: int = None
     saved_backward_confidence_threshold: int = None
+    saved_time_window: tuple = None
 
     def __init__(self,
                  plot_button,
@@ -74,7 +82,13 @@ class ViewPlot(object):
                  num_trials_monte_carlo_input,
                  run_monte_carlo_button,
                  monte_carlo_progress_bar,
-                 time_left_monte_carlo):
+                 time_left_monte_carlo,
+                 time_window_checkbox,
+                 time_window_relative_checkbox,
+                 time_window_start_input,
+                 time_window_end_input,
+                 time_window_start_slider,
+                 time_window_end_slider):
         if ViewPlot.__instance is not None:
             raise Exception("ViewPlot should be treated as a singleton class.")
         else:
@@ -96,6 +110,12 @@ class ViewPlot(object):
         self.run_monte_carlo_button = run_monte_carlo_button
         self.monte_carlo_progress_bar = monte_carlo_progress_bar
         self.time_left_monte_carlo = time_left_monte_carlo
+        self.time_window_checkbox = time_window_checkbox
+        self.time_window_relative_checkbox = time_window_relative_checkbox
+        self.time_window_start_input = time_window_start_input
+        self.time_window_end_input = time_window_end_input
+        self.time_window_start_slider = time_window_start_slider
+        self.time_window_end_slider = time_window_end_slider
 
         self.setup()
 
@@ -120,7 +140,8 @@ class ViewPlot(object):
         needed
         """
         self.vbox = QtWidgets.QVBoxLayout(self.plot_placeholder)
-        self.browser_refresh()
+        # the browser is created on the first plot so that
+        # QtWebEngine is not loaded at startup
 
     def save_curr_plot_selections(self) -> None:
         self.saved_stimulus_selection = ViewStimulusSelection.get_instance().menu.currentText()
@@ -132,6 +153,15 @@ class ViewPlot(object):
         self.saved_support_threshold = ViewPlot.get_instance().support_input.value()
         self.saved_forward_confidence_threshold = ViewPlot.get_instance().forward_confidence_input.value()
         self.saved_backward_confidence_threshold = ViewPlot.get_instance().backward_confidence_input.value()
+        self.saved_time_window = ModelPlot.get_time_window()
+
+    def clear_saved_plot_selections(self) -> None:
+        """
+        Forgets the selections of the current plot so that
+        the next plot is recomputed, e.g., after the data changed
+        """
+        self.saved_stimulus_selection = None
+        self.saved_participant_selection = None
 
     def are_same_plot_selections(self) -> bool:
         if self.saved_stimulus_selection != ViewStimulusSelection.get_instance().menu.currentText():
@@ -146,6 +176,8 @@ class ViewPlot(object):
             return False
         if self.saved_min_samples_val != ModelPlot.get_min_samples_value():
             return False
+        if self.saved_time_window != ModelPlot.get_time_window():
+            return False
         return True
 
     def are_same_assoc_rule_threshold_selections(self) -> bool:
@@ -157,6 +189,38 @@ class ViewPlot(object):
             return False
         return True
 
+    def enable_time_window(self, is_enabled: bool) -> None:
+        """
+        Enables or disables the inputs of the time window
+        :param is_enabled: whether the inputs are enabled
+        :type is_enabled: bool
+        """
+        for widget in [self.time_window_relative_checkbox,
+                       self.time_window_start_input, self.time_window_end_input,
+                       self.time_window_start_slider, self.time_window_end_slider]:
+            widget.setEnabled(is_enabled)
+
+    def update_time_window_range(self) -> None:
+        """
+        Sets the range of the time window sliders to the time
+        range of the observations of the selected stimulus
+        (relative to each participant's first observation of
+        it if selected) and the time window to the whole range
+        """
+        first_timestamp, last_timestamp = ModelData.get_instance().get_stimulus_time_range(
+            ViewStimulusSelection.get_instance().get_selected(),
+            self.time_window_relative_checkbox.isChecked()
+        )
+        if first_timestamp is None:
+            first_timestamp, last_timestamp = 0, 0
+        first_timestamp, last_timestamp = int(np.floor(first_timestamp)), int(np.ceil(last_timestamp))
+        for slider in [self.time_window_start_slider, self.time_window_end_slider]:
+            slider.setRange(first_timestamp, last_timestamp)
+            slider.setSingleStep(max((last_timestamp - first_timestamp) // 100, 1))
+            slider.setPageStep(max((last_timestamp - first_timestamp) // 10, 1))
+        self.time_window_start_input.setValue(first_timestamp)
+        self.time_window_end_input.setValue(last_timestamp)
+
     def plot(self) -> None:
         """
         Creates a visualization based upon the given data,
@@ -185,11 +249,14 @@ class ViewPlot(object):
         self.save_curr_plot_selections()
 
     def browser_refresh(self) -> None:
-        self.vbox.removeWidget(self.browser)
+        from PyQt5 import QtWebEngineWidgets  # loads QtWebEngine, so imported on first use
+        if self.browser is not None:
+            self.vbox.removeWidget(self.browser)
         self.browser = QtWebEngineWidgets.QWebEngineView(self.plot_placeholder)
         self.vbox.insertWidget(0, self.browser)
 
 
+from src.model.model_data import ModelData
 from src.model.model_plot import ModelPlot
 from src.view.view_participant_selection import ViewParticipantSelection
 from src.view.view_stimulus_selection import ViewStimulusSelection
@@ -0,0 +1,77 @@
+"""
+Contains the class ViewReachabilityPlot
+
+MODULAR INTERNAL IMPORTS ARE AT THE BOTTOM OF THE FILE. THIS IS AN
+INTENTIONAL DESIGN CHOICE. IT HELPS AVOID CIRCULAR IMPORT ISSUES.
+IT IS ALSO OKAY TO AVOID THEM IN THIS MANNER BECAUSE THIS IS A
+HIGHLY MODULAR PROGRAM.
+"""
+
+# External imports
+from PyQt5.QtWidgets import QVBoxLayout
+from PyQt5.QtWidgets import QWidget
+
+
+class ViewReachabilityPlot(QWidget):
+    """
+    View for the window showing the OPTICS reachability
+    plot of the points of the current OPTICS cluster plot,
+    from which the eps to cluster them with can be picked
+    """
+
+    __instance = None
+
+    # initialized in class
+    browser = None
+    vbox = None
+
+    def __init__(self):
+        super().__init__()
+        if ViewReachabilityPlot.__instance is not None:
+            raise Exception("ViewReachabilityPlot should be treated as a singleton class.")
+        else:
+            ViewReachabilityPlot.__instance = self
+
+        self.setup()
+
+    @staticmethod
+    def get_instance():
+        """
+        Static method to access the singleton
+        instance for this class
+
+        :return: the singleton instance
+        :rtype: ViewReachabilityPlot
+        """
+        if ViewReachabilityPlot.__instance is None:
+            ViewReachabilityPlot()
+        return ViewReachabilityPlot.__instance
+
+    def setup(self) -> None:
+        """
+        Sets up the layout of the window, holding
+        the browser the plot is shown in
+        """
+        from PyQt5 import QtWebEngineWidgets  # loads QtWebEngine, so imported on first use
+
+        self.resize(900, 450)
+        self.setWindowTitle("OPTICS Reachability")
+        self.browser = QtWebEngineWidgets.QWebEngineView(self)
+        self.vbox = QVBoxLayout()
+        self.vbox.addWidget(self.browser)
+        self.setLayout(self.vbox)
+
+    def init(self) -> None:
+        """
+        Shows the reachability plot of the points
+        last clustered with OPTICS
+        """
+        fig = ModelPlot.get_instance().build_reachability_fig()
+        self.browser.setHtml(fig.to_html(include_plotlyjs='cdn'))
+
+    def show(self) -> None:
+        self.init()
+        super().show()
+
+
+from src.model.model_plot import ModelPlot
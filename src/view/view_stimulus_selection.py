@@ -60,5 +60,27 @@ class ViewStimulusSelection(object):
         for stimulus in ModelStimulusSelection.get_instance().update_stimuli_from_data_and_dir():
             self.menu.addItem(str(stimulus))
 
+    def refresh(self) -> bool:
+        """
+        Updates the stimulus selected menu in place with the
+        stimulus options within the current data, keeping
+        the current selection if it is still an option
+
+        :return: True if the selected stimulus changed
+        :rtype: bool
+        """
+        selected_stimulus = self.get_selected()
+        stimuli = [str(stimulus) for stimulus in
+                   ModelStimulusSelection.get_instance().update_stimuli_from_data_and_dir()]
+        self.menu.blockSignals(True)
+        for index in reversed(range(self.menu.count())):
+            if self.menu.itemText(index) not in stimuli:
+                self.menu.removeItem(index)
+        for index, stimulus in enumerate(stimuli):
+            if self.menu.itemText(index) != stimulus:
+                self.menu.insertItem(index, stimulus)
+        self.menu.blockSignals(False)
+        return self.get_selected() != selected_stimulus
+
 
 from src.model.model_stimulus_selection import ModelStimulusSelection
@@ -0,0 +1,90 @@
+"""
+Checks that grid DBSCAN agrees with sklearn's DBSCAN on the gaze
+points of each stimulus of the sample data files, and that the
+neighbor graph DBSCAN re-clusters from stays within its edge budget
+
+Run from the root of the repository with
+    python -m pytest tests
+"""
+import os
+
+import numpy as np
+import pytest
+from sklearn.cluster import DBSCAN
+
+from src.main.config import STIMULUS_COL_TITLE
+from src.main.config import X_GAZE_COL_TITLE
+from src.main.config import Y_GAZE_COL_TITLE
+from src.model.utils import cluster_utils
+from src.model.utils import ingest_utils
+
+# Directory of the sample data files, relative to the root of the repository
+SAMPLE_DATA_RELATIVE_DIR = 'data/tsv_files_sample'
+
+# eps and min_samples of the sweep grid DBSCAN is compared on
+EPS_VALUES = (5, 10, 22, 40)
+MIN_SAMPLES_VALUES = (2, 5, 10, 20)
+
+# Minimum fraction of the points given the same label as by sklearn's
+# DBSCAN over the sweep (measured: 100% of 279,920 points); a point
+# may only differ if it lies exactly eps from a core point, where the
+# squared distances of the grid and sklearn's distances round differently
+MIN_POINT_AGREEMENT = 0.999
+
+# Minimum fraction of the clusterings of the sweep that are the same as
+# sklearn's DBSCAN's (measured: 96 of 96)
+MIN_CLUSTERING_AGREEMENT = 0.95
+
+
+@pytest.fixture(scope='module')
+def stimulus_gaze_xy() -> list:
+    """
+    Returns the X and Y coordinates of the gaze
+    points of each stimulus of the sample data files
+
+    :return: gaze points of each stimulus
+    :rtype: list
+    """
+    sample_df = ingest_utils.concat_participant_dfs([
+        ingest_utils.read_participant_file(participant_filename, SAMPLE_DATA_RELATIVE_DIR)
+        for participant_filename in sorted(os.listdir(SAMPLE_DATA_RELATIVE_DIR))
+        if participant_filename.endswith('.tsv')
+    ])
+    return [stimulus_df[[X_GAZE_COL_TITLE, Y_GAZE_COL_TITLE]].dropna().to_numpy(dtype=np.float64)
+            for _, stimulus_df in sample_df.groupby(STIMULUS_COL_TITLE, observed=True)]
+
+
+def test_grid_dbscan_agrees_with_dbscan(stimulus_gaze_xy: list) -> None:
+    num_same_points, num_points_compared, num_same_clusterings, num_clusterings = 0, 0, 0, 0
+    for xy in stimulus_gaze_xy:
+        for eps in EPS_VALUES:
+            for min_samples in MIN_SAMPLES_VALUES:
+                labels = cluster_utils.get_grid_dbscan_labels(xy, eps, min_samples)
+                reference_labels = DBSCAN(eps=eps, min_samples=min_samples).fit(xy).labels_
+                num_same_points += np.count_nonzero(labels == reference_labels)
+                num_points_compared += labels.size
+                num_same_clusterings += np.array_equal(labels, reference_labels)
+                num_clusterings += 1
+    assert num_points_compared > 0
+    assert num_same_points / num_points_compared >= MIN_POINT_AGREEMENT
+    assert num_same_clusterings / num_clusterings >= MIN_CLUSTERING_AGREEMENT
+
+
+def test_weighted_grid_dbscan_agrees_with_dbscan(stimulus_gaze_xy: list) -> None:
+    # the duplicate gaze points collapsed into weighted points (see
+    # cluster_utils.collapse_duplicate_points) cluster as all of the points
+    for xy in stimulus_gaze_xy:
+        unique_xy, unique_weights, point_codes = cluster_utils.collapse_duplicate_points(xy)
+        labels = cluster_utils.get_grid_dbscan_labels(unique_xy, 22, 10, unique_weights)[point_codes]
+        reference_labels = DBSCAN(eps=22, min_samples=10).fit(xy).labels_
+        assert np.count_nonzero(labels == reference_labels) / labels.size >= MIN_POINT_AGREEMENT
+
+
+def test_neighbor_graph_radius_is_capped(monkeypatch) -> None:
+    monkeypatch.setattr(cluster_utils, 'MAX_NEIGHBOR_GRAPH_EDGES', 200000)
+    xy = np.random.default_rng(0).uniform(0, 1000, (10000, 2))
+    radius = cluster_utils.get_neighbor_graph_radius(xy, 5, 999999)
+    assert 5 <= radius < 999999
+    assert cluster_utils.build_neighbor_graph(xy, radius)['indices'].size <= 1.1 * 200000
+    assert cluster_utils.get_neighbor_graph_radius(xy, 5, 8) == 8
+    assert cluster_utils.get_neighbor_graph_radius(xy, 100, 999999) is None
@@ -0,0 +1,123 @@
+"""
+Checks that every kernel of kernel_utils, compiled and uncompiled,
+returns the same results as its fallback on seeded random inputs
+
+Run from the root of the repository with
+    python -m pytest tests
+"""
+import numpy as np
+import pytest
+
+from src.model.utils import cluster_utils
+from src.model.utils import kernel_utils
+
+SEEDS = [0, 1, 2]
+
+
+def make_label_sequences(rng: np.random.Generator, num_labels: int = 12) -> tuple:
+    """
+    Returns random labels (noise included) of sequences of random
+    lengths, concatenated, and the position of the first label
+    and the group of each label
+
+    :param rng: random generator
+    :type rng: np.random.Generator
+    :param num_labels: number of labels
+    :type num_labels: int
+    :return: labels, sequence starts, group codes and number of labels
+    :rtype: tuple
+    """
+    sequence_lengths = rng.integers(1, 30, 25)
+    sequence_starts = np.concatenate(([0], np.cumsum(sequence_lengths)[:-1])).astype(np.int64)
+    labels = rng.integers(-1, num_labels, int(sequence_lengths.sum()), dtype=np.int64)
+    group_codes = np.repeat(np.arange(sequence_lengths.size, dtype=np.int64), sequence_lengths)
+    return labels, sequence_starts, group_codes, num_labels
+
+
+def make_points(rng: np.random.Generator) -> tuple:
+    """
+    Returns random points in a few blobs and uniform noise, some
+    of them duplicated, and a random integer weight of each point
+
+    :param rng: random generator
+    :type rng: np.random.Generator
+    :return: X and Y coordinates of each point and its weight
+    :rtype: tuple
+    """
+    centers = rng.uniform(0, 1000, (6, 2))
+    xy = np.concatenate([center + rng.normal(0, 25, (150, 2)) for center in centers] +
+                        [rng.uniform(0, 1000, (200, 2))])
+    xy = np.concatenate((xy, xy[rng.integers(0, xy.shape[0], 100)]))
+    return xy, rng.integers(1, 4, xy.shape[0]).astype(np.float64)
+
+
+def make_kernel_args(name: str, seed: int) -> tuple:
+    """
+    Returns seeded random arguments of the specified kernel
+
+    :param name: name of the kernel
+    :type name: str
+    :param seed: seed of the random generator
+    :type seed: int
+    :return: arguments of the kernel
+    :rtype: tuple
+    """
+    rng = np.random.default_rng(seed)
+    if name in (kernel_utils.COLLAPSE_KERNEL, kernel_utils.PAIR_COUNT_KERNEL, kernel_utils.EXCEEDANCE_KERNEL):
+        labels, sequence_starts, group_codes, num_labels = make_label_sequences(rng)
+        if name == kernel_utils.COLLAPSE_KERNEL:
+            return labels, group_codes
+        if name == kernel_utils.PAIR_COUNT_KERNEL:
+            return labels, sequence_starts, num_labels
+        pair_counts = kernel_utils.count_ordered_pairs_loop(labels, sequence_starts, num_labels)[0]
+        return rng.integers(-1, num_labels, (200, labels.size), dtype=np.int64), sequence_starts, pair_counts
+    xy, weights = make_points(rng)
+    eps, min_samples = 20.0, 8
+    if name == kernel_utils.DBSCAN_KERNEL:
+        neighbor_graph = cluster_utils.build_neighbor_graph(xy, 2 * eps)
+        return neighbor_graph['indptr'], neighbor_graph['indices'], neighbor_graph['distances'], \
+            weights, eps, min_samples
+    # the grid of cells of get_grid_dbscan_labels
+    cell_coords = np.floor((xy - xy.min(axis=0)) / (eps / np.sqrt(2))).astype(np.int64)
+    num_cell_cols = int(cell_coords[:, 1].max()) + 1
+    point_cell_keys = cell_coords[:, 0] * num_cell_cols + cell_coords[:, 1]
+    order = np.argsort(point_cell_keys, kind='stable').astype(np.int64)
+    cell_keys, cell_starts = np.unique(point_cell_keys[order], return_index=True)
+    return np.ascontiguousarray(xy[:, 0]), np.ascontiguousarray(xy[:, 1]), weights, order, \
+        cell_keys, np.append(cell_starts, xy.shape[0]).astype(np.int64), num_cell_cols, eps, min_samples
+
+
+def assert_same_results(result, expected_result) -> None:
+    """
+    Asserts that the specified results of two kernels, an
+    array or a tuple of arrays, are equal
+
+    :param result: result of a kernel
+    :param expected_result: expected result of the kernel
+    """
+    if not isinstance(expected_result, tuple):
+        result, expected_result = (result,), (expected_result,)
+    assert len(result) == len(expected_result)
+    for array, expected_array in zip(result, expected_result):
+        np.testing.assert_array_equal(array, expected_array)
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+@pytest.mark.parametrize('name', list(kernel_utils.KERNEL_LOOPS))
+def test_loop_matches_fallback(name: str, seed: int) -> None:
+    args = make_kernel_args(name, seed)
+    assert_same_results(kernel_utils.KERNEL_LOOPS[name](*args), kernel_utils.KERNEL_FALLBACKS[name](*args))
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+@pytest.mark.parametrize('name', list(kernel_utils.KERNEL_LOOPS))
+def test_kernel_matches_fallback(name: str, seed: int) -> None:
+    args = make_kernel_args(name, seed)
+    assert_same_results(kernel_utils.get_kernel(name)(*args), kernel_utils.KERNEL_FALLBACKS[name](*args))
+
+
+def test_dbscan_kernel_clusters_the_points() -> None:
+    # guards against the parity tests passing on inputs DBSCAN finds no clusters in
+    labels = kernel_utils.get_kernel(kernel_utils.DBSCAN_KERNEL)(*make_kernel_args(kernel_utils.DBSCAN_KERNEL, 0))
+    assert labels.max() >= 5
+    assert np.any(labels == -1)
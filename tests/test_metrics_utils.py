@@ -0,0 +1,88 @@
+"""
+Checks the peak velocities of the saccades derived from the
+fixation table against the gaze points between the fixations
+
+Run from the root of the repository with
+    python -m pytest tests
+"""
+import numpy as np
+import pandas as pd
+
+from src.main.config import FIXATION_DURATION_COL_TITLE
+from src.main.config import PARTICIPANT_FILENAME_COL_TITLE
+from src.main.config import STIMULUS_COL_TITLE
+from src.main.config import TIMESTAMP_COL_TITLE
+from src.main.config import VALIDITY_COL_TITLE
+from src.main.config import X_FIXATION_COL_TITLE
+from src.main.config import X_GAZE_COL_TITLE
+from src.main.config import Y_FIXATION_COL_TITLE
+from src.main.config import Y_GAZE_COL_TITLE
+from src.model.utils import metrics_utils
+from src.model.utils import model_utils
+
+
+def build_gaze_df(participant_gaze_x_coords: dict) -> pd.DataFrame:
+    """
+    Returns the data of the specified participants, each with a gaze
+    point every 10 ms at the specified X coordinates (NaN if missing)
+
+    :param participant_gaze_x_coords: X coordinates of the gaze points of each participant
+    :type participant_gaze_x_coords: dict
+    :return: data of the participants
+    :rtype: pd.DataFrame
+    """
+    gaze_df = pd.concat([pd.DataFrame({
+        PARTICIPANT_FILENAME_COL_TITLE: participant_filename,
+        STIMULUS_COL_TITLE: 'stimulus',
+        TIMESTAMP_COL_TITLE: np.arange(len(x_coords)) * 10.0,
+        X_GAZE_COL_TITLE: np.asarray(x_coords, dtype=np.float64),
+        Y_GAZE_COL_TITLE: 0.0
+    }) for participant_filename, x_coords in participant_gaze_x_coords.items()], ignore_index=True)
+    gaze_df[VALIDITY_COL_TITLE] = model_utils.get_validity_flags(gaze_df)
+    return gaze_df
+
+
+def build_fixation_df(participant_fixations: dict) -> pd.DataFrame:
+    """
+    Returns the fixation table of the specified participants,
+    each fixation given as its start timestamp, duration
+    and X coordinate
+
+    :param participant_fixations: fixations of each participant
+    :type participant_fixations: dict
+    :return: fixation table
+    :rtype: pd.DataFrame
+    """
+    return pd.DataFrame([{
+        PARTICIPANT_FILENAME_COL_TITLE: participant_filename,
+        STIMULUS_COL_TITLE: 'stimulus',
+        TIMESTAMP_COL_TITLE: float(start),
+        FIXATION_DURATION_COL_TITLE: float(duration),
+        X_FIXATION_COL_TITLE: float(x_coord),
+        Y_FIXATION_COL_TITLE: 0.0
+    } for participant_filename, fixations in participant_fixations.items()
+        for start, duration, x_coord in fixations])
+
+
+def test_peak_saccade_velocity_is_fastest_step_between_fixations() -> None:
+    # a's saccade steps 10, 50 (the peak, 5 px/ms) and 20 px; b's
+    # saccade has a missing gaze point and steps 30 px over 20 ms
+    # and 40 px over 10 ms (the peak, 4 px/ms)
+    gaze_df = build_gaze_df({
+        'a': [0, 0, 0, 10, 60, 80, 80, 80],
+        'b': [0, 0, np.nan, 30, 70, 70]
+    })
+    fixation_df = build_fixation_df({
+        'a': [(0, 20, 0), (50, 20, 80)],
+        'b': [(0, 10, 0), (40, 10, 70)]
+    })
+    saccade_df = metrics_utils.build_saccade_df(fixation_df, gaze_df)
+    np.testing.assert_allclose(saccade_df[metrics_utils.SACCADE_PEAK_VELOCITY_COL_TITLE], [5, 4])
+    np.testing.assert_allclose(saccade_df[metrics_utils.SACCADE_VELOCITY_COL_TITLE], [80 / 30, 70 / 30])
+    metrics_df = metrics_utils.build_metrics_df(fixation_df, gaze_df)
+    np.testing.assert_allclose(metrics_df['Mean Peak Saccade Velocity (px/ms)'], [5, 4])
+
+
+def test_peak_saccade_velocity_is_nan_without_gaze_points() -> None:
+    fixation_df = build_fixation_df({'a': [(0, 20, 0), (50, 20, 80)]})
+    assert np.isnan(metrics_utils.build_saccade_df(fixation_df)[metrics_utils.SACCADE_PEAK_VELOCITY_COL_TITLE]).all()